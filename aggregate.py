@@ -0,0 +1,242 @@
+"""
+# @ Description: Batch and streaming day/job totals for the phase sheet in integer quarter hours
+"""
+
+import datetime
+import decimal
+from collections import defaultdict
+from typing import Sequence
+
+import workTime
+from helper_functions import in_report_window
+from job_catalog import Job, get_catalog
+
+QUARTER_SECONDS = 900  # 15 min
+HALF_QUARTER_SECONDS = 450
+MAX_ST_QUARTERS = 32  # 8 hours of standard time a day
+
+DAY_COLUMNS: tuple[tuple[str, str], ...] = (
+    ("SAT ST", "sat ot"),
+    ("SUN ST", "sun ot"),
+    ("MON ST", "mon ot"),
+    ("TUE ST", "tue ot"),
+    ("WED ST", "wed ot"),
+    ("THU ST", "thu ot"),
+    ("FRI ST", "fri ot"),
+)
+# datetime.date.weekday() -> index into DAY_COLUMNS
+WEEKDAY_TO_COLUMN: tuple[int, ...] = (2, 3, 4, 5, 6, 0, 1)
+
+# quarter hours -> normalized Decimal hours, shared by every line
+QUARTER_HOURS: dict[int, decimal.Decimal] = {}
+
+
+def seconds_to_quarters(seconds: int) -> int:
+    """
+    Round a duration to the closest quarter hour, a remainder of exactly 7.5 min rounds down.
+
+    Same rule as the original Decimal code in process_line:
+    fraction of a quarter > 0.5 moves up, <= 0.5 drops down.
+
+    Args:
+        seconds (int): Duration in whole seconds.
+
+    Returns:
+        int: Number of quarter hours.
+
+    Example:
+        >>> seconds_to_quarters(450)  # 7m30s
+        0
+        >>> seconds_to_quarters(451)
+        1
+    """
+    return (seconds + HALF_QUARTER_SECONDS - 1) // QUARTER_SECONDS
+
+
+def quarters_to_hours(quarters: int) -> decimal.Decimal:
+    """
+    Convert quarter hours to normalized Decimal hours, the only place Decimals are made.
+
+    Args:
+        quarters (int): Number of quarter hours.
+
+    Returns:
+        decimal.Decimal: Hours, e.g. 30 -> Decimal("7.5"), 32 -> Decimal("8").
+    """
+    hours: decimal.Decimal | None = QUARTER_HOURS.get(quarters)
+    if hours is None:
+        hours = (decimal.Decimal(value=quarters) / decimal.Decimal(value=4)).normalize()
+        QUARTER_HOURS[quarters] = hours
+    return hours
+
+
+def aggregate_lines(work_list: Sequence[workTime.WorkTime]) -> list[dict[str, int | str | decimal.Decimal]]:
+    """
+    Compute the phase sheet lines of all jobs in one batch.
+
+    The worked seconds of every phase code are summed per date, rounded and
+    split into standard/over time in integer quarter hours, only the final per
+    row values are turned into Decimal hours, see merge_lines.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs.
+
+    Returns:
+        list[dict[str, int | str | decimal.Decimal]]: One process_line style dict per phase code, in order of first appearance.
+    """
+    aggregator: LineAggregator = LineAggregator()
+    for work in work_list:
+        job: int = aggregator.add_job(name=work.name)
+        for block in work.work_blocks:
+            aggregator.add_block(job=job, block=block)
+    return aggregator.lines()
+
+
+def process_line(work: workTime.WorkTime) -> dict[str, int | str | decimal.Decimal]:
+    """
+    Phase sheet line of a single job, see aggregate_lines for the batch version.
+
+    Args:
+        work (workTime.WorkTime): The job to total.
+
+    Returns:
+        dict[str, int | str | decimal.Decimal]: description, eqip. no., phase code and the ST/OT hours per day and in total.
+    """
+    return aggregate_lines(work_list=[work])[0]
+
+
+def merge_lines(
+    names: Sequence[str], day_seconds: Sequence[dict[datetime.date, int]]
+) -> list[dict[str, int | str | decimal.Decimal]]:
+    """
+    Hash the worked seconds of every export into one row per phase code and build the lines.
+
+    The seconds of a row are summed per date first, only then is each date
+    rounded to quarter hours and split at 8 hours, so two 6 hour exports of
+    the same phase code on one day give 8 ST and 4 OT. A day column holds the
+    latest date of its week day, the totals count every date. Exports without
+    a phase code keep a row of their own per header.
+
+    Args:
+        names (Sequence[str]): WorkTime.name of every export.
+        day_seconds (Sequence[dict[datetime.date, int]]): Worked seconds per date of every export, see export_day_seconds.
+
+    Returns:
+        list[dict[str, int | str | decimal.Decimal]]: One line per phase code, in order of first appearance.
+    """
+    catalog = get_catalog()
+    rows: dict[str, int] = {}  # phase code (or header) -> row
+    jobs: list[Job] = []
+    row_seconds: list[defaultdict[datetime.date, int]] = []
+    for name, seconds in zip(names, day_seconds):
+        job: Job = catalog.job(name=name)
+        key: str = job.phase_code or name
+        row: int | None = rows.get(key)
+        if row is None:
+            row = rows[key] = len(jobs)
+            jobs.append(job)
+            row_seconds.append(defaultdict(int))
+        merged: defaultdict[datetime.date, int] = row_seconds[row]
+        for day, day_total in seconds.items():
+            merged[day] += day_total
+
+    lines: list[dict[str, int | str | decimal.Decimal]] = []
+    for job, seconds in zip(jobs, row_seconds):
+        day_st: list[int] = [0] * len(DAY_COLUMNS)
+        day_ot: list[int] = [0] * len(DAY_COLUMNS)
+        total_st: int = 0
+        total_ot: int = 0
+        # date order, a later date of the same week day overwrites the column
+        for day in sorted(seconds):
+            q: int = seconds_to_quarters(seconds=seconds[day])
+            st: int = min(q, MAX_ST_QUARTERS)
+            column: int = WEEKDAY_TO_COLUMN[day.weekday()]
+            day_st[column] = st
+            day_ot[column] = q - st
+            total_st += st
+            total_ot += q - st
+        lines.append(build_line(job=job, day_st=day_st, day_ot=day_ot, total_st=total_st, total_ot=total_ot))
+    return lines
+
+
+def build_line(
+    job: Job, day_st: Sequence[int], day_ot: Sequence[int], total_st: int, total_ot: int
+) -> dict[str, int | str | decimal.Decimal]:
+    """
+    Turn the quarter hour totals of a phase code into its process_line style dict.
+
+    Args:
+        job (Job): Catalog entry of the row.
+        day_st (Sequence[int]): Standard time quarters per DAY_COLUMNS entry.
+        day_ot (Sequence[int]): Over time quarters per DAY_COLUMNS entry.
+        total_st (int): Standard time quarters of the week.
+        total_ot (int): Over time quarters of the week.
+
+    Returns:
+        dict[str, int | str | decimal.Decimal]: The phase sheet line.
+    """
+    line: dict[str, int | str | decimal.Decimal] = {
+        "description": job.description,
+        "eqip. no.": job.eqip_no,
+        "phase code": job.phase_code,
+    }
+    for (standard_word, overtime_word), st, ot in zip(DAY_COLUMNS, day_st, day_ot):
+        line[standard_word] = quarters_to_hours(quarters=st)
+        line[overtime_word] = quarters_to_hours(quarters=ot)
+    line["TOT ST"] = quarters_to_hours(quarters=total_st)
+    line["tot ot"] = quarters_to_hours(quarters=total_ot)
+    return line
+
+
+def export_day_seconds(work: workTime.WorkTime) -> dict[datetime.date, int]:
+    """
+    Worked seconds per date of one export, every block counts.
+
+    Callers keep these between runs (watch.FolderWatcher), so the report window
+    is left to them to apply when merging.
+
+    Args:
+        work (workTime.WorkTime): The parsed export.
+
+    Returns:
+        dict[datetime.date, int]: Date -> seconds from the "Total:" lines, to be merged with merge_lines.
+    """
+    seconds: defaultdict[datetime.date, int] = defaultdict(int)
+    for block in work.work_blocks:
+        seconds[block.day] += block.final_line.seconds
+    return dict(seconds)
+
+
+class LineAggregator:
+    """
+    Phase sheet totals fed one WorkBlock at a time, for the batch and the streaming pipeline.
+
+    Only the worked seconds per date of each job are kept, so memory grows
+    with the number of days, not with the number of blocks or clock lines.
+    """
+    __slots__ = ("names", "day_seconds")
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.day_seconds: list[defaultdict[datetime.date, int]] = []
+
+    def add_job(self, name: str) -> int:
+        """
+        Start a new job row.
+
+        Args:
+            name (str): WorkTime.name of the job.
+
+        Returns:
+            int: The job number to pass to add_block.
+        """
+        self.names.append(name)
+        self.day_seconds.append(defaultdict(int))
+        return len(self.names) - 1
+
+    def add_block(self, job: int, block: workTime.WorkBlock) -> None:
+        if in_report_window(day=block.day):
+            self.day_seconds[job][block.day] += block.final_line.seconds
+
+    def lines(self) -> list[dict[str, int | str | decimal.Decimal]]:
+        return merge_lines(names=self.names, day_seconds=self.day_seconds)
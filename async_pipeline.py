@@ -0,0 +1,159 @@
+"""
+# @ Description: asyncio pipeline, reads, parsing and rendering/writing of the exports overlap
+"""
+
+import asyncio
+import datetime
+import os
+from concurrent.futures import Executor
+
+import instrument
+import workTime
+from helper_functions import parse_csv_bytes
+from parse_cache import ParseCache
+from phase_code_process import process_work_times
+from run_settings import process_pool
+from table_process import proc_table
+from timesheet_index import TimesheetIndex
+
+READ_CONCURRENCY = 16  # files read at the same time, bounds open files and bytes held before parsing
+
+
+def read_bytes(csv_file: str) -> bytes:
+    with open(file=csv_file, mode="rb") as file:
+        return file.read()
+
+
+def lookup(cache: ParseCache, csv_file: str, content: bytes) -> tuple[str, workTime.WorkTime | None]:
+    key: str = cache.key(csv_file=csv_file, content=content)
+    return key, cache.load(key=key)
+
+
+def parse_export(csv_file: str, content: bytes, cache: ParseCache | None) -> workTime.WorkTime:
+    """
+    Cache lookup, parse on a miss and cache store of one export, all in the calling worker thread.
+
+    Args:
+        csv_file (str): Path to the csv export.
+        content (bytes): The bytes already read.
+        cache (ParseCache | None): Parse cache.
+
+    Returns:
+        workTime.WorkTime: The parsed export.
+    """
+    if cache is None:
+        return parse_csv_bytes(content)
+    key, cached = lookup(cache=cache, csv_file=csv_file, content=content)
+    if cached is not None:
+        return cached
+    work: workTime.WorkTime = parse_csv_bytes(content)
+    cache.store(key=key, work=work)
+    return work
+
+
+async def load_export(
+    csv_file: str, reads: asyncio.Semaphore, executor: Executor | None, cache: ParseCache | None
+) -> workTime.WorkTime:
+    """
+    Read one export in a thread, then parse it as soon as the read is done.
+
+    Hashing, unpickling and pickling for the cache never run on the event loop:
+    without an executor they share the worker thread of the parse, with one
+    they run in threads around the parse in the executor.
+
+    Args:
+        csv_file (str): Path to the csv export.
+        reads (asyncio.Semaphore): Limits the reads in flight.
+        executor (Executor | None): Where parsing runs, None for the default thread pool.
+        cache (ParseCache | None): Parse cache, checked with the bytes already read.
+
+    Returns:
+        workTime.WorkTime: The parsed export.
+    """
+    async with reads:
+        content: bytes = await asyncio.to_thread(read_bytes, csv_file)
+
+    if executor is None:
+        return await asyncio.to_thread(parse_export, csv_file, content, cache)
+
+    key: str = ""
+    if cache is not None:
+        key, cached = await asyncio.to_thread(lookup, cache, csv_file, content)
+        if cached is not None:
+            return cached
+    work: workTime.WorkTime = await asyncio.get_running_loop().run_in_executor(executor, parse_csv_bytes, content)
+    if cache is not None:
+        await asyncio.to_thread(cache.store, key, work)
+    return work
+
+
+async def process_exports(
+    csv_files: list[str],
+    workers: int = 1,
+    cache: ParseCache | None = None,
+    paginate: bool = False,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+) -> str:
+    """
+    Read, parse and render the csv exports with every stage overlapping the others.
+
+    Files are read concurrently and each one goes to the parse executor as soon
+    as its bytes are in, so reading the next files overlaps parsing the
+    previous ones. The phase sheet and the time tables are then rendered in two
+    threads, each writing its exports while the other one is still rendering.
+
+    Args:
+        csv_files (list[str]): Paths of the csv exports.
+        workers (int, optional): Parse processes, 0 for one per cpu. Defaults to 1, parse in threads.
+        cache (ParseCache | None, optional): Parse cache. Defaults to None.
+        paginate (bool, optional): Split the phase sheet into 23 row pages. Defaults to False.
+        since (datetime.date, optional): First day to render. Defaults to no limit.
+        until (datetime.date, optional): Last day to render. Defaults to no limit.
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    executor: Executor | None = process_pool(max_workers=workers) if workers > 1 else None
+    reads: asyncio.Semaphore = asyncio.Semaphore(READ_CONCURRENCY)
+    try:
+        with instrument.stage("read + parse"):
+            work_times: list[workTime.WorkTime] = await asyncio.gather(
+                *(load_export(csv_file=csv_file, reads=reads, executor=executor, cache=cache) for csv_file in csv_files)
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if since != datetime.date.min or until != datetime.date.max:
+        with instrument.stage("index"):
+            work_times = TimesheetIndex(work_list=work_times).work_times(start=since, end=until)
+
+    frozen_work_times: tuple[workTime.WorkTime, ...] = workTime.freeze(work_list=work_times)
+    with instrument.stage("render"):
+        phase_sheet, _ = await asyncio.gather(
+            asyncio.to_thread(process_work_times, frozen_work_times, paginate),
+            asyncio.to_thread(proc_table, frozen_work_times),
+        )
+    return phase_sheet
+
+
+def run_pipeline(
+    csv_files: list[str],
+    workers: int = 1,
+    cache: ParseCache | None = None,
+    paginate: bool = False,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+) -> str:
+    """
+    Blocking entry point for process_exports.
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    return asyncio.run(process_exports(
+        csv_files=csv_files, workers=workers, cache=cache, paginate=paginate, since=since, until=until
+    ))
@@ -0,0 +1,266 @@
+"""
+# @ Description: Compact columnar backing store for the workTime model
+"""
+
+import datetime
+import decimal
+from array import array
+from typing import Iterable
+
+import workTime
+from workTime import cents_to_money, seconds_to_time
+
+# one entry per clock line:
+#   start / end   int32 seconds since midnight ("i")
+#   total         int64 seconds ("q")
+#   cents         int64 amount in cents ("q")
+#   comment       int32 index into ColumnarStore.comments ("i")
+# one entry per work block:
+#   day           int32 date ordinal ("i")
+#   first_line    int32 index of the first clock line of the block ("i")
+#   line_count    int32 number of clock lines in the block ("i")
+#   total         int64 seconds of the "Total:" line ("q")
+#   cents         int64 amount in cents of the "Total:" line ("q")
+# one entry per work time:
+#   first_block / block_count   int32 range into the block columns ("i")
+#
+# The arrays expose the buffer protocol, numpy.frombuffer(store.line_start, dtype=numpy.int32)
+# gives a zero copy numpy view when numpy is around.
+
+
+class ColumnarStore:
+    """
+    All clock lines, work blocks and work times of a run packed into typed arrays.
+
+    A ClockLine costs about 30 bytes of columns instead of five Python objects.
+    The attribute API of workTime is kept through the *View classes below,
+    which only hold the store and a row number and decode values on access.
+    """
+    __slots__ = (
+        "line_start", "line_end", "line_total", "line_cents", "line_comment",
+        "block_day", "block_first_line", "block_line_count", "block_total", "block_cents", "block_final_line",
+        "work_name", "work_first_block", "work_block_count",
+        "comments", "comment_ids",
+    )
+
+    def __init__(self) -> None:
+        self.line_start: array[int] = array("i")
+        self.line_end: array[int] = array("i")
+        self.line_total: array[int] = array("q")
+        self.line_cents: array[int] = array("q")
+        self.line_comment: array[int] = array("i")
+
+        self.block_day: array[int] = array("i")
+        self.block_first_line: array[int] = array("i")
+        self.block_line_count: array[int] = array("i")
+        self.block_total: array[int] = array("q")
+        self.block_cents: array[int] = array("q")
+        self.block_final_line: list[str] = []
+
+        self.work_name: list[str] = []
+        self.work_first_block: array[int] = array("i")
+        self.work_block_count: array[int] = array("i")
+
+        # shared comment pool, most lines have "" or one of a handful of notes
+        self.comments: list[str] = []
+        self.comment_ids: dict[str, int] = {}
+
+    def intern_comment(self, comment: str) -> int:
+        comment_id: int | None = self.comment_ids.get(comment)
+        if comment_id is None:
+            comment_id = len(self.comments)
+            self.comments.append(comment)
+            self.comment_ids[comment] = comment_id
+        return comment_id
+
+    def add_work_time(self, work: workTime.WorkTime) -> int:
+        """
+        Append a WorkTime to the columns.
+
+        Args:
+            work (workTime.WorkTime): The work time to pack.
+
+        Returns:
+            int: Row number of the work time in the store.
+        """
+        work_index: int = len(self.work_name)
+        self.work_name.append(work.name)
+        self.work_first_block.append(len(self.block_day))
+        self.work_block_count.append(len(work.work_blocks))
+        for block in work.work_blocks:
+            self.block_day.append(block.day.toordinal())
+            self.block_first_line.append(len(self.line_start))
+            self.block_line_count.append(len(block.clock_times))
+            self.block_total.append(block.final_line.seconds)
+            self.block_cents.append(block.final_line.cents)
+            self.block_final_line.append(block.final_line.line)
+            for clock in block.clock_times:
+                self.line_start.append(clock.start)
+                self.line_end.append(clock.end)
+                self.line_total.append(clock.seconds)
+                self.line_cents.append(clock.cents)
+                self.line_comment.append(self.intern_comment(comment=clock.comment))
+        return work_index
+
+    @classmethod
+    def from_work_times(cls, work_list: Iterable[workTime.WorkTime]) -> "ColumnarStore":
+        store: ColumnarStore = cls()
+        for work in work_list:
+            store.add_work_time(work=work)
+        return store
+
+    def work_times(self) -> tuple["WorkTimeView", ...]:
+        """
+        Views with the workTime.WorkTime attribute API over every packed work time.
+
+        Returns:
+            tuple[WorkTimeView, ...]: One read-only view per work time, in insertion order.
+        """
+        return tuple(WorkTimeView(self, index) for index in range(len(self.work_name)))
+
+
+class ClockLineView:
+    """Read-only workTime.ClockLine over one row of a ColumnarStore."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ColumnarStore, index: int) -> None:
+        self._store: ColumnarStore = store
+        self._index: int = index
+
+    @property
+    def start(self) -> int:
+        return self._store.line_start[self._index]
+
+    @property
+    def end(self) -> int:
+        return self._store.line_end[self._index]
+
+    @property
+    def seconds(self) -> int:
+        return self._store.line_total[self._index]
+
+    @property
+    def cents(self) -> int:
+        return self._store.line_cents[self._index]
+
+    @property
+    def start_time(self) -> datetime.time:
+        return seconds_to_time(seconds=self._store.line_start[self._index])
+
+    @property
+    def end_time(self) -> datetime.time:
+        return seconds_to_time(seconds=self._store.line_end[self._index])
+
+    @property
+    def total_time(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self._store.line_total[self._index])
+
+    @property
+    def money(self) -> decimal.Decimal:
+        return cents_to_money(cents=self._store.line_cents[self._index])
+
+    @property
+    def comment(self) -> str:
+        return self._store.comments[self._store.line_comment[self._index]]
+
+    def __str__(self) -> str:
+        return str(self.start_time) + " " + str(self.end_time) + " " + str(self.total_time)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class FinalLineView:
+    """Read-only workTime.FinalLine over one block row of a ColumnarStore."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ColumnarStore, index: int) -> None:
+        self._store: ColumnarStore = store
+        self._index: int = index
+
+    @property
+    def line(self) -> str:
+        return self._store.block_final_line[self._index]
+
+    @property
+    def seconds(self) -> int:
+        return self._store.block_total[self._index]
+
+    @property
+    def cents(self) -> int:
+        return self._store.block_cents[self._index]
+
+    @property
+    def total_time(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self._store.block_total[self._index])
+
+    @property
+    def total_money(self) -> decimal.Decimal:
+        return cents_to_money(cents=self._store.block_cents[self._index])
+
+    def __str__(self) -> str:
+        return str(self.line)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class WorkBlockView:
+    """Read-only workTime.WorkBlock over one block row of a ColumnarStore."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ColumnarStore, index: int) -> None:
+        self._store: ColumnarStore = store
+        self._index: int = index
+
+    @property
+    def day(self) -> datetime.date:
+        return datetime.date.fromordinal(self._store.block_day[self._index])
+
+    @property
+    def clock_times(self) -> tuple[ClockLineView, ...]:
+        first: int = self._store.block_first_line[self._index]
+        count: int = self._store.block_line_count[self._index]
+        return tuple(ClockLineView(self._store, line) for line in range(first, first + count))
+
+    @property
+    def final_line(self) -> FinalLineView:
+        return FinalLineView(self._store, self._index)
+
+    def __str__(self) -> str:
+        block: str = str(self.day) + "\n"
+        for i in self.clock_times:
+            block += str(i) + "\n"
+        block += str(self.final_line)
+        return block
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+class WorkTimeView:
+    """Read-only workTime.WorkTime over one work row of a ColumnarStore."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: ColumnarStore, index: int) -> None:
+        self._store: ColumnarStore = store
+        self._index: int = index
+
+    @property
+    def name(self) -> str:
+        return self._store.work_name[self._index]
+
+    @property
+    def work_blocks(self) -> tuple[WorkBlockView, ...]:
+        first: int = self._store.work_first_block[self._index]
+        count: int = self._store.work_block_count[self._index]
+        return tuple(WorkBlockView(self._store, block) for block in range(first, first + count))
+
+    def __str__(self) -> str:
+        work: str = str(self.name) + "\n"
+        for i in self.work_blocks:
+            work += str(i) + "\n"
+        return work
+
+    def __repr__(self) -> str:
+        return str(self)
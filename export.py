@@ -0,0 +1,78 @@
+"""
+# @ Description: Writes the markdown exports, skipping files whose content did not change
+"""
+
+import os
+import threading
+
+from instrument import stage
+
+EXPORT_FOLDER = r"./envHidden/export"
+
+# file name -> (content, size, mtime_ns) last written or read back, so unchanged exports are not rewritten;
+# the memo only counts while the file on disk still has that size and mtime
+_last_content: dict[str, tuple[str, int, int]] = {}
+_lock = threading.Lock()
+
+# file names written since the last clear_changed(), in write order
+changed_exports: list[str] = []
+
+
+def write_export(file_name: str, md: str) -> bool:
+    """
+    Write a markdown export to EXPORT_FOLDER unless it already holds the same content.
+
+    The content of the last write is remembered together with the size and
+    mtime of the file; a file deleted or edited since is read back or written
+    again instead of trusting the memo.
+
+    Args:
+        file_name (str): File name inside the export folder, e.g. "phase_sheet.md".
+        md (str): The markdown to write.
+
+    Returns:
+        bool: True when the file was written, False when it was already up to date.
+    """
+    md_file: str = os.path.normpath(os.path.join(EXPORT_FOLDER, file_name))
+    with _lock, stage("export.write"):
+        previous: str | None = None
+        try:
+            stat: os.stat_result | None = os.stat(md_file)
+        except FileNotFoundError:
+            stat = None
+        if stat is not None:
+            memo: tuple[str, int, int] | None = _last_content.get(md_file)
+            if memo is not None and memo[1:] == (stat.st_size, stat.st_mtime_ns):
+                previous = memo[0]
+            else:
+                with open(file=md_file, mode="r", encoding="utf-8") as f:
+                    previous = f.read()
+        if stat is not None and previous == md:
+            _last_content[md_file] = (md, stat.st_size, stat.st_mtime_ns)
+            return False
+
+        with open(file=md_file, mode="w", encoding="utf-8") as f:
+            f.write(md)
+        stat = os.stat(md_file)
+        _last_content[md_file] = (md, stat.st_size, stat.st_mtime_ns)
+        changed_exports.append(file_name)
+        return True
+
+
+def forget_written() -> None:
+    """Drop the memo of written exports, the next write_export of each file compares with the disk again."""
+    with _lock:
+        _last_content.clear()
+
+
+def clear_changed() -> list[str]:
+    """
+    Get and reset the list of exports written since the last call.
+
+    Returns:
+        list[str]: File names of the exports that changed.
+    """
+    with _lock:
+        changed: list[str] = changed_exports.copy()
+        changed_exports.clear()
+        return changed
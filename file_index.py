@@ -0,0 +1,246 @@
+"""
+# @ Description: Sidecar index of the dates in every csv export, prunes the files and blocks outside a date range
+"""
+
+import bisect
+import datetime
+import json
+import mmap
+import os
+
+import workTime
+from ingest import ingest_csv_files
+from job_catalog import parse_header
+from mmap_scan import iter_block_spans, read_header, scan_csv_file
+from parse_cache import ParseCache
+
+FILE_INDEX = r"envHidden/cache/file_index.json"
+# bumped whenever the entry layout changes, older files are then rebuilt
+INDEX_VERSION = 1
+
+# file_index.json:
+# {
+#     "version": 1,
+#     "files": {
+#         "/abs/path/export.csv": {
+#             "size": 1234, "mtime_ns": 1741000000000000000,
+#             "name": "10.010.0023 Automation Engineer - Overhead  total amount: ...", "phase code": "10.010.0023",
+#             "days": [738947, 738948], "offsets": [93, 301]
+#         }
+#     }
+# }
+
+
+class FileEntry:
+    """
+    The dates of one csv export, read by a byte scan of its date header lines.
+
+    days and offsets are parallel, one item per complete block in file order:
+    the date as a proleptic ordinal and the byte offset of the line break
+    before its date header.
+    """
+    __slots__ = ("size", "mtime_ns", "name", "phase_code", "days", "offsets", "first", "last", "ascending")
+
+    def __init__(self, size: int, mtime_ns: int, name: str, phase_code: str, days: list[int], offsets: list[int]) -> None:
+        self.size: int = size
+        self.mtime_ns: int = mtime_ns
+        self.name: str = name
+        self.phase_code: str = phase_code
+        self.days: list[int] = days
+        self.offsets: list[int] = offsets
+        self.first: int = min(days, default=0)
+        self.last: int = max(days, default=0)
+        self.ascending: bool = all(a <= b for a, b in zip(days, days[1:]))
+
+    def overlaps(self, since: datetime.date, until: datetime.date) -> bool:
+        return bool(self.days) and self.first <= until.toordinal() and self.last >= since.toordinal()
+
+    def covered_by(self, since: datetime.date, until: datetime.date) -> bool:
+        return since.toordinal() <= self.first and self.last <= until.toordinal()
+
+    def span(self, since: datetime.date, until: datetime.date) -> tuple[int, int | None]:
+        """
+        Byte range holding the blocks between since and until.
+
+        Args:
+            since (datetime.date): First day.
+            until (datetime.date): Last day.
+
+        Returns:
+            tuple[int, int | None]: (start, stop) for mmap_scan.scan_csv_file, the whole file
+                when the blocks are not in date order.
+        """
+        if not self.ascending:
+            return 0, None
+        low: int = bisect.bisect_left(self.days, since.toordinal())
+        high: int = bisect.bisect_right(self.days, until.toordinal())
+        start: int = self.offsets[low] if low < len(self.offsets) else self.size
+        stop: int | None = self.offsets[high] if high < len(self.offsets) else None
+        return start, stop
+
+    def to_json(self) -> dict[str, int | str | list[int]]:
+        return {
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "name": self.name,
+            "phase code": self.phase_code,
+            "days": self.days,
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_json(cls, entry: dict) -> "FileEntry":
+        return cls(
+            size=int(entry["size"]),
+            mtime_ns=int(entry["mtime_ns"]),
+            name=str(entry["name"]),
+            phase_code=str(entry["phase code"]),
+            days=[int(day) for day in entry["days"]],
+            offsets=[int(offset) for offset in entry["offsets"]],
+        )
+
+
+def index_csv_file(csv_file: str) -> FileEntry:
+    """
+    Read the header line and the date header lines of a csv export, nothing else is decoded.
+
+    Args:
+        csv_file (str): Path to the csv export.
+
+    Returns:
+        FileEntry: The dates and block offsets of the file.
+    """
+    days: list[int] = []
+    offsets: list[int] = []
+    name: str = ""
+    with open(file=csv_file, mode="rb") as file:
+        stat: os.stat_result = os.fstat(file.fileno())
+        if stat.st_size > 0:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                name = read_header(mapped=mapped)
+                for day, header_at, _ in iter_block_spans(mapped=mapped, position=max(0, mapped.find(b"\n"))):
+                    days.append(day.toordinal())
+                    offsets.append(header_at)
+    return FileEntry(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        name=name,
+        phase_code=parse_header(name=name)[0],
+        days=days,
+        offsets=offsets,
+    )
+
+
+class FileIndex:
+    """
+    FileEntry of every csv export, kept in FILE_INDEX between runs.
+
+    An entry is reused while the size and mtime of its file are unchanged,
+    otherwise the file is scanned again.
+    """
+
+    def __init__(self, index_file: str = FILE_INDEX) -> None:
+        self.index_file: str = os.path.normpath(index_file)
+        self.entries: dict[str, FileEntry] = {}
+        self.changed: bool = False
+        self.scanned: int = 0
+
+    @classmethod
+    def load(cls, index_file: str = FILE_INDEX) -> "FileIndex":
+        """
+        Read the sidecar index, a missing, unreadable or outdated file gives an empty index.
+
+        Args:
+            index_file (str, optional): Path of the index. Defaults to FILE_INDEX.
+
+        Returns:
+            FileIndex: The index.
+        """
+        file_index: FileIndex = cls(index_file=index_file)
+        try:
+            with open(file=file_index.index_file, mode="r", encoding="utf-8") as f:
+                config = json.load(f)
+            if config.get("version") == INDEX_VERSION:
+                file_index.entries = {path: FileEntry.from_json(entry=entry) for path, entry in config["files"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            file_index.entries = {}
+        return file_index
+
+    def save(self) -> None:
+        """Write the index when an entry was added or replaced since it was loaded."""
+        if not self.changed:
+            return
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        temp: str = self.index_file + ".tmp"
+        with open(file=temp, mode="w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": {path: entry.to_json() for path, entry in self.entries.items()}}, f)
+        os.replace(temp, self.index_file)
+        self.changed = False
+
+    def entry(self, csv_file: str) -> FileEntry:
+        """
+        The entry of a csv export, scanning the file when it is new or changed.
+
+        Args:
+            csv_file (str): Path to the csv export.
+
+        Returns:
+            FileEntry: The up to date entry.
+        """
+        path: str = os.path.abspath(csv_file)
+        stat: os.stat_result = os.stat(path)
+        known: FileEntry | None = self.entries.get(path)
+        if known is not None and known.size == stat.st_size and known.mtime_ns == stat.st_mtime_ns:
+            return known
+        entry: FileEntry = index_csv_file(csv_file=path)
+        self.entries[path] = entry
+        self.changed = True
+        self.scanned += 1
+        return entry
+
+
+def read_range(
+    csv_files: list[str],
+    since: datetime.date,
+    until: datetime.date,
+    file_index: FileIndex,
+    workers: int = 1,
+    cache: ParseCache | None = None,
+) -> list[workTime.WorkTime]:
+    """
+    Read the blocks between since and until, touching as little of each file as its entry allows.
+
+    Files with no block in the range are not opened, they give a WorkTime with
+    the header and no blocks so every job keeps its phase sheet row. Files
+    entirely inside the range are parsed (and cached) whole. The others are
+    scanned by mmap_scan.scan_csv_file from the first block of the range.
+
+    Args:
+        csv_files (list[str]): Paths of the csv exports.
+        since (datetime.date): First day to keep.
+        until (datetime.date): Last day to keep.
+        file_index (FileIndex): Sidecar index, updated for new or changed files.
+        workers (int, optional): See ingest_csv_files. Defaults to 1.
+        cache (ParseCache | None, optional): Parse cache for the files parsed whole. Defaults to None.
+
+    Returns:
+        list[workTime.WorkTime]: One WorkTime per file, in the same order as csv_files.
+    """
+    work_times: list[workTime.WorkTime | None] = [None] * len(csv_files)
+    whole: list[int] = []
+    for position, csv_file in enumerate(csv_files):
+        entry: FileEntry = file_index.entry(csv_file=csv_file)
+        if not entry.overlaps(since=since, until=until):
+            pruned: workTime.WorkTime = workTime.WorkTime()
+            pruned.name = entry.name
+            work_times[position] = pruned
+        elif entry.covered_by(since=since, until=until):
+            whole.append(position)
+        else:
+            start, stop = entry.span(since=since, until=until)
+            work_times[position] = scan_csv_file(csv_file=csv_file, since=since, until=until, start=start, stop=stop)
+
+    parsed: list[workTime.WorkTime] = ingest_csv_files(csv_files=[csv_files[i] for i in whole], workers=workers, cache=cache)
+    for position, work in zip(whole, parsed):
+        work_times[position] = work
+    return work_times  # type: ignore[return-value]
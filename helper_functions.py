@@ -2,13 +2,22 @@
 import csv
 import datetime
 import decimal
+import io
 import re
 import string
+from typing import Iterator, TextIO
 
 import workTime
+from parse_cache import ParseCache
+from parse_engine import parse_rows, stream_rows
 
 DAYS_AGO = False
 
+# the "today" of the run, fixed on first use so every date filter of a run agrees, see set_as_of()
+AS_OF: datetime.date | None = None
+
+WEEK_DAY_NAMES: tuple[str, ...] = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
 def is_minutes_apart(time1: datetime.time, time2: datetime.time, minutes:int = 30) -> bool:
     """
     Checks if the difference between two datetime.time objects is exactly 30 minutes.
@@ -120,24 +129,76 @@ def timedelta_to_decimal_hours(tdelta: datetime.timedelta) -> decimal.Decimal:
         >>> timedelta_to_decimal_hours(td)
         Decimal('5.500000')
     """
-    # Get total seconds from timedelta and convert to decimal hours
-    total_seconds = decimal.Decimal(value=tdelta.total_seconds())
-    return total_seconds / decimal.Decimal(value=3600)  # 3600 seconds in an hour
+    # whole microseconds, no float in between
+    microseconds: int = tdelta // datetime.timedelta(microseconds=1)
+    return decimal.Decimal(value=microseconds) / decimal.Decimal(value=3_600_000_000)  # microseconds in an hour
+
+
+def set_as_of(day: datetime.date | None) -> None:
+    """
+    Fix the date the run treats as today, None goes back to the clock on next use.
+
+    Args:
+        day (datetime.date | None): The as-of date.
+    """
+    global AS_OF
+    AS_OF = day
+
+
+def as_of() -> datetime.date:
+    """
+    The date the run treats as today, read from the clock once and then kept.
+
+    Returns:
+        datetime.date: The as-of date.
+    """
+    global AS_OF
+    if AS_OF is None:
+        AS_OF = datetime.date.today()
+    return AS_OF
 
 
 def days_ago(days: int = 5) -> datetime.date:
     """
-    Get the datetime object representing the start of the day (00:00:00)
-    for the date that is a given number of days ago.
+    Get the date that is a given number of days before the as-of date of the run.
+
+    Args:
+        days (int, optional): The number of days to go back from as_of(). Defaults to 5.
+
+    Returns:
+        date: The calculated date.
+    """
+    return as_of() - datetime.timedelta(days=days)
+
+
+def in_report_window(day: datetime.date) -> bool:
+    """
+    Check a block date against the DAYS_AGO filter, the one place the filter direction is decided.
+
+    Args:
+        day (datetime.date): Date of a work block.
+
+    Returns:
+        bool: True when DAYS_AGO is off, or the day is within the last 7 days.
+    """
+    return not DAYS_AGO or day >= days_ago(7)
+
+
+def week_start(day: datetime.date) -> datetime.date:
+    """
+    Get the Saturday that starts the pay week of a date.
 
     Args:
-        days (int, optional): The number of days to go back from today. Defaults to 5.
+        day (datetime.date): Any date.
 
     Returns:
-        date: A date object set to 00:00:00 of the calculated date.
+        datetime.date: The Saturday on or before the date.
+
+    Example:
+        >>> week_start(datetime.date(2025, 3, 3))  # Monday
+        datetime.date(2025, 3, 1)
     """
-    target_date: datetime.datetime = datetime.datetime.now() - datetime.timedelta(days=days)
-    return target_date.date()
+    return day - datetime.timedelta(days=(day.weekday() + 2) % 7)
 
 
 def get_week_day(date_obj: datetime.datetime | datetime.date) -> str:
@@ -150,9 +211,7 @@ def get_week_day(date_obj: datetime.datetime | datetime.date) -> str:
     Returns:
         str: The name of the day of the week (e.g., "Monday", "Tuesday").
     """
-    day_names: list[str] = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    day_of_week_name: str = day_names[date_obj.weekday()]
-    return day_of_week_name
+    return WEEK_DAY_NAMES[date_obj.weekday()]
 
 
 def is_valid_date(date_str: str) -> bool:
@@ -228,60 +287,72 @@ def remove_phase_code(input_string) -> str:
     return result
 
 
-def process_csv_file(csv_file: str) -> workTime.WorkTime:
+def process_csv_file(csv_file: str, cache: ParseCache | None = None) -> workTime.WorkTime:
+    """
+    Parse a WorkTime csv export into a WorkTime object.
+
+    Args:
+        csv_file (str): Path to the csv export.
+        cache (ParseCache | None, optional): Parse cache checked before parsing and filled after. Defaults to None.
+
+    Returns:
+        workTime.WorkTime: The job name and all of its work blocks.
+    """
+    key: str = ""
+    if cache is not None:
+        key = cache.key(csv_file=csv_file)
+        cached: workTime.WorkTime | None = cache.load(key=key)
+        if cached is not None:
+            return cached
 
-    work_time: workTime.WorkTime = workTime.WorkTime()
-    not_in_block: bool = True
     with open(file=csv_file, mode='r', encoding='utf-8') as file:
         csv_reader = csv.reader(file)
-        work_block: workTime.WorkBlock = workTime.WorkBlock()
-        for index, row in enumerate(csv_reader):
-            # first row
-            if index == 0:
-                work_time.name = row[0]
-                continue
-
-            # indication of the start of a block
-            # ["","","Feb 5, 2025"]
-            if row and not_in_block and is_valid_date(date_str=row[-1]):
-                not_in_block = False
-                work_block = workTime.WorkBlock()
-                parsed_date: datetime.datetime = parse_date(date_str=row[-1])
-                work_block.day = parsed_date.date()
-                continue
-
-            # in a block
-            if not not_in_block:
-                # misc row in a block
-                if row[0] == r"Start":
-                    continue
-                # indication of the end of a block
-                if row[0].startswith(r"Total:"):
-                    work_block.final_line.line = row[0]  # "Total:     08:00:00               $498.00"
-                    split: list[str] = work_block.final_line.line.split()  # ["Total:","08:00:00","$498.00"]
-
-                    time: list[str] = split[1].split(":")  # ["08","00","00"]
-                    hour: int = int(time[0])
-                    minute: int = int(time[1])
-                    second: int = int(time[2])
-                    work_block.final_line.total_time = datetime.timedelta(hours=hour, minutes=minute, seconds=second)  # 08:00:00
-
-                    work_block.final_line.total_money = decimal.Decimal(value=split[2][1:])  # 498.00
-
-                    work_time.work_blocks.append(work_block)
-                    not_in_block = True
-                    continue
-
-                # row of a block
-                # ["8:00:00 AM","12:00:00 PM","04:00:00","$249.00","comment"]
-                line: workTime.ClockLine = workTime.ClockLine()
-                line.start_time = parse_am_pm_time(time_str=row[0])  # "8:00:00 AM"
-                line.end_time = parse_am_pm_time(time_str=row[1])  # "12:00:00 PM"
-                line.total_time = time_string_to_timedelta(time_str=row[2])  # "04:00:00"
-                line.money = decimal.Decimal(value=row[3][1:])  # 249.00
-                line.comment = row[4]
-                work_block.clock_times.append(line)
-    return work_time
+        work: workTime.WorkTime = parse_rows(rows=csv_reader)
+
+    if cache is not None:
+        cache.store(key=key, work=work)
+    return work
+
+
+def parse_csv_bytes(content: bytes) -> workTime.WorkTime:
+    """
+    Parse the raw bytes of a WorkTime csv export, same result as process_csv_file on the file.
+
+    Args:
+        content (bytes): The file content.
+
+    Returns:
+        workTime.WorkTime: The job name and all of its work blocks.
+    """
+    # newline=None translates \r\n like open() in text mode does
+    text = io.StringIO(content.decode(encoding="utf-8"), newline=None)
+    return parse_rows(rows=csv.reader(text))
+
+
+def stream_csv_file(csv_file: str) -> tuple[str, Iterator[workTime.WorkBlock]]:
+    """
+    Open a WorkTime csv export and stream its blocks instead of building the whole WorkTime.
+
+    The file stays open until the block generator is exhausted or closed.
+
+    Args:
+        csv_file (str): Path to the csv export.
+
+    Returns:
+        tuple[str, Iterator[workTime.WorkBlock]]: The job name and its work blocks, one at a time.
+    """
+    file = open(file=csv_file, mode='r', encoding='utf-8')
+    try:
+        name, blocks = stream_rows(rows=csv.reader(file))
+    except BaseException:
+        file.close()
+        raise
+    return name, _closing_blocks(file=file, blocks=blocks)
+
+
+def _closing_blocks(file: TextIO, blocks: Iterator[workTime.WorkBlock]) -> Iterator[workTime.WorkBlock]:
+    with file:
+        yield from blocks
 
 
 def clean_name(name: str) -> str:
@@ -301,59 +372,3 @@ def clean_name(name: str) -> str:
 
     return " ".join(first_three)
 
-
-def process_line(work: workTime.WorkTime) -> dict[str, int | str | decimal.Decimal]:
-    dec_default = "0"
-    line: dict[str, int | str | decimal.Decimal] = {
-        "description": clean_name(name=remove_phase_code(input_string=work.name)),
-        "eqip. no.": "56.1077",
-        "phase code": get_phase_code(work.name),
-        "SAT ST": decimal.Decimal(value=dec_default), "sat ot": decimal.Decimal(value=dec_default),
-        "SUN ST": decimal.Decimal(value=dec_default), "sun ot": decimal.Decimal(value=dec_default),
-        "MON ST": decimal.Decimal(value=dec_default), "mon ot": decimal.Decimal(value=dec_default),
-        "TUE ST": decimal.Decimal(value=dec_default), "tue ot": decimal.Decimal(value=dec_default),
-        "WED ST": decimal.Decimal(value=dec_default), "wed ot": decimal.Decimal(value=dec_default),
-        "THU ST": decimal.Decimal(value=dec_default), "thu ot": decimal.Decimal(value=dec_default),
-        "FRI ST": decimal.Decimal(value=dec_default), "fri ot": decimal.Decimal(value=dec_default),
-        "TOT ST": decimal.Decimal(value=dec_default), "tot ot": decimal.Decimal(value=dec_default),
-    }
-    to_st = decimal.Decimal(value='0')  # total standard time
-    to_ot = decimal.Decimal(value='0')  # total over time
-    for block in work.work_blocks:
-        if DAYS_AGO:
-            if block.day < days_ago(7):
-                continue
-        week_day: str = get_week_day(date_obj=block.day)
-        mx_hrs = decimal.Decimal("8")  # max standard hours
-        standard_word: str = week_day.upper()[:3]  # short capital week day (standard time) "MON"
-        overtime_word: str = standard_word.lower()  # short lower week day "mon"
-        standard_word += " ST"  # "MON ST"
-        overtime_word += " ot"  # "mon ot"
-        st: decimal.Decimal = timedelta_to_decimal_hours(tdelta=block.final_line.total_time)  # standard time
-
-        # process to closest 15 min (25% of 60 mins)
-        fractional: decimal.Decimal = st % decimal.Decimal(value='1')  # 00 . XX
-        percent: decimal.Decimal = (fractional % decimal.Decimal(value='0.25')) / decimal.Decimal(value='0.25')  # to next 25%
-        if percent != decimal.Decimal(value="0.0"):
-            if percent > decimal.Decimal(value="0.5"):
-                # move to next 25
-                to_move: decimal.Decimal = decimal.Decimal(value='1') - percent
-                st += (to_move * decimal.Decimal(value='0.25'))
-            else:
-                # drop to last 25
-                st -= (percent * decimal.Decimal(value='0.25'))
-
-        st = st.normalize()
-        ot: decimal.Decimal = decimal.Decimal(value="0")  # overtime
-        if st > mx_hrs:
-            ot = st - mx_hrs
-            st = mx_hrs
-        ot = ot.normalize()
-
-        line[standard_word] = st
-        to_st += st
-        line[overtime_word] = ot
-        to_ot += ot
-    line["TOT ST"] = to_st.normalize()
-    line["tot ot"] = to_ot.normalize()
-    return line
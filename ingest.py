@@ -0,0 +1,74 @@
+"""
+# @ Description: Loads the WorkTime csv exports, optionally across a process pool
+"""
+
+import os
+
+import workTime
+from helper_functions import process_csv_file
+from parse_cache import ParseCache
+from run_settings import process_pool
+
+TO_PROCESS_FOLDER = r"envHidden/data/to_process"
+
+
+def list_csv_files(folder_path: str = TO_PROCESS_FOLDER) -> list[str]:
+    """
+    List the csv exports of a folder as absolute paths.
+
+    Args:
+        folder_path (str, optional): Folder to scan. Defaults to TO_PROCESS_FOLDER.
+
+    Returns:
+        list[str]: Sorted absolute paths, so every run sees the files in the same order.
+    """
+    csv_files: list[str] = []
+    for f in os.listdir(folder_path):
+        if f.endswith(".csv"):
+            path: str = os.path.normpath(os.path.join(folder_path, f))
+            path = os.path.abspath(path)
+            csv_files.append(path)
+    csv_files.sort()
+    return csv_files
+
+
+def ingest_csv_files(csv_files: list[str], workers: int = 1, cache: ParseCache | None = None) -> list[workTime.WorkTime]:
+    """
+    Parse csv exports, spreading the files across a process pool when workers > 1.
+
+    Args:
+        csv_files (list[str]): Paths of the csv exports.
+        workers (int, optional): Number of worker processes, 0 uses one per cpu. Defaults to 1 (serial).
+        cache (ParseCache | None, optional): Parse cache, only the files missing from it are parsed. Defaults to None.
+
+    Returns:
+        list[workTime.WorkTime]: One WorkTime per file, in the same order as csv_files.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return [process_csv_file(csv_file, cache) for csv_file in csv_files]
+
+    # the cache is checked here so the hit/miss counts stay in this process
+    work_times: list[workTime.WorkTime | None] = [None] * len(csv_files)
+    keys: list[str] = [""] * len(csv_files)
+    to_parse: list[int] = []
+    for index, csv_file in enumerate(csv_files):
+        if cache is not None:
+            keys[index] = cache.key(csv_file=csv_file)
+            work_times[index] = cache.load(key=keys[index])
+        if work_times[index] is None:
+            to_parse.append(index)
+
+    if to_parse:
+        workers = min(workers, len(to_parse))
+        # map() yields in submission order no matter which worker finishes first
+        with process_pool(max_workers=workers) as executor:
+            chunk_size: int = max(1, len(to_parse) // (workers * 4))
+            parsed = executor.map(process_csv_file, [csv_files[i] for i in to_parse], chunksize=chunk_size)
+            for index, work in zip(to_parse, parsed):
+                work_times[index] = work
+                if cache is not None:
+                    cache.store(key=keys[index], work=work)
+
+    return work_times  # type: ignore[return-value]
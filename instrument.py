@@ -0,0 +1,111 @@
+"""
+# @ Description: Stage timers and counters, switched off unless a run asks for them
+"""
+
+import contextlib
+import json
+import threading
+import time
+from collections import defaultdict
+from types import TracebackType
+from typing import ContextManager
+
+ENABLED = False
+
+_lock = threading.Lock()
+_seconds: defaultdict[str, float] = defaultdict(float)
+_calls: defaultdict[str, int] = defaultdict(int)
+_counters: defaultdict[str, int] = defaultdict(int)
+
+# handed out while disabled, so a stage costs one call and one flag check
+_NULL_STAGE: ContextManager[None] = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.start: float = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        elapsed: float = time.perf_counter() - self.start
+        with _lock:
+            _seconds[self.name] += elapsed
+            _calls[self.name] += 1
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+
+def reset() -> None:
+    with _lock:
+        _seconds.clear()
+        _calls.clear()
+        _counters.clear()
+
+
+def stage(name: str) -> ContextManager[None]:
+    """
+    Time a block of code under a stage name, a no-op unless enable() was called.
+
+    Args:
+        name (str): Stage name, e.g. "parse" or "phase_sheet.render".
+
+    Returns:
+        ContextManager[None]: Use with "with".
+
+    Example:
+        >>> with stage("parse"):
+        ...     work_times = ingest_csv_files(csv_files)
+    """
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add to a counter, a no-op unless enable() was called.
+
+    Args:
+        name (str): Counter name, e.g. "files".
+        amount (int, optional): Amount to add. Defaults to 1.
+    """
+    if ENABLED:
+        with _lock:
+            _counters[name] += amount
+
+
+def summary() -> dict[str, dict[str, dict[str, float | int] | int]]:
+    """
+    Collected stage timings and counters.
+
+    Returns:
+        dict: {"stages": {name: {"seconds", "calls"}}, "counters": {name: value}}.
+    """
+    with _lock:
+        return {
+            "stages": {name: {"seconds": _seconds[name], "calls": _calls[name]} for name in _seconds},
+            "counters": dict(_counters),
+        }
+
+
+def print_summary() -> None:
+    report = summary()
+    for name, timing in report["stages"].items():
+        print(f"{name:<28} {timing['seconds'] * 1000:10.2f} ms  ({timing['calls']} calls)")  # type: ignore[index]
+    for name, value in report["counters"].items():
+        print(f"{name:<28} {value:10,}")
+
+
+def write_summary(json_file: str) -> None:
+    with open(file=json_file, mode="w", encoding="utf-8") as f:
+        json.dump(summary(), f, indent=2)
@@ -0,0 +1,193 @@
+"""
+# @ Description: Per day punch intervals for the time table, merged across jobs in one sort
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Sequence
+
+import workTime
+from helper_functions import in_report_window
+
+DAY_SECONDS = 24 * 3600
+LUNCH_GAP_SECONDS = 30 * 60  # a gap of 30 min or more between punches is a lunch
+OT_SECONDS = 10 * 3600  # past 10 worked hours the 10hr+ OT part of the form is used
+
+# time table rows filled from a day
+TIME_IN = "Time In"
+AM_BREAK = "AM Rest Break ( yes)"
+LUNCH_OUT = "Lunch Out"
+LUNCH_IN = "Lunch In"
+PM_BREAK = "PM Rest Break (yes)"
+TIME_OUT = "Time Out"
+LUNCH_OUT_2 = "2nd Lunch Out"
+LUNCH_IN_2 = "2nd Lunch In"
+PM_BREAK_2 = "2nd PM Rest Break (yes)"
+TIME_OUT_10 = "Time Out (10hr)"
+
+
+def seconds_to_12_string(seconds: int) -> str:
+    """
+    Format seconds since midnight like helper_functions.time_to_12_string.
+
+    Args:
+        seconds (int): Seconds since midnight, values past midnight wrap around.
+
+    Returns:
+        str: The time in "HH:MM AM/PM" format.
+
+    Example:
+        >>> seconds_to_12_string(14 * 3600 + 30 * 60)
+        '02:30 PM'
+    """
+    minutes: int = seconds % DAY_SECONDS // 60
+    hour: int = minutes // 60
+    return f"{hour % 12 or 12:02d}:{minutes % 60:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+class DayTimeline:
+    """
+    All punches of one calendar date across every job.
+
+    punches: distinct punch times in order, for the dynamic table.
+    worked: the clock line intervals coalesced wherever they overlap or touch.
+    Both come out of a single sort of the start/end events.
+    """
+    __slots__ = ("punches", "worked")
+
+    def __init__(self, intervals: list[tuple[int, int]]) -> None:
+        # (time, 0) starts sort before (time, 1) ends, so touching intervals coalesce
+        events: list[tuple[int, int]] = [(start, 0) for start, _ in intervals] + [(end, 1) for _, end in intervals]
+        events.sort()
+
+        self.punches: list[int] = []
+        self.worked: list[tuple[int, int]] = []
+        depth: int = 0
+        opened: int = 0
+        for moment, kind in events:
+            if not self.punches or self.punches[-1] != moment:
+                self.punches.append(moment)
+            if kind == 0:
+                if depth == 0:
+                    opened = moment
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    self.worked.append((opened, moment))
+
+    def worked_seconds(self) -> int:
+        return sum(end - start for start, end in self.worked)
+
+    def form(self) -> dict[str, str]:
+        """
+        Fill the time table column of the day.
+
+        The first gap of 30 min or more is lunch. When more than 10 hours are
+        worked, "Time Out" is the moment the 10th hour is reached, the first
+        30 min gap after it is the 2nd lunch and "Time Out (10hr)" is the last punch.
+
+        Returns:
+            dict[str, str]: Time table row -> value, rows without a value are left out.
+        """
+        if not self.worked:
+            return {}
+        column: dict[str, str] = {TIME_IN: seconds_to_12_string(self.worked[0][0]), AM_BREAK: "yes"}
+
+        # the point where the regular day ends, 10 worked hours or the last punch
+        ot_start: int | None = None
+        worked: int = 0
+        for start, end in self.worked:
+            if worked + end - start > OT_SECONDS:
+                ot_start = start + OT_SECONDS - worked
+                break
+            worked += end - start
+        regular_end: int = self.worked[-1][1] if ot_start is None else ot_start
+
+        gaps: list[tuple[int, int]] = [
+            (end, next_start) for (_, end), (next_start, _) in zip(self.worked, self.worked[1:])
+            if next_start - end >= LUNCH_GAP_SECONDS
+        ]
+        lunch: tuple[int, int] | None = next((gap for gap in gaps if gap[0] < regular_end), None)
+        if lunch is not None:
+            column[LUNCH_OUT] = seconds_to_12_string(lunch[0])
+            column[LUNCH_IN] = seconds_to_12_string(lunch[1])
+            column[PM_BREAK] = "yes"
+        column[TIME_OUT] = seconds_to_12_string(regular_end)
+
+        if ot_start is not None:
+            second_lunch: tuple[int, int] | None = next((gap for gap in gaps if gap[0] >= ot_start), None)
+            if second_lunch is not None:
+                column[LUNCH_OUT_2] = seconds_to_12_string(second_lunch[0])
+                column[LUNCH_IN_2] = seconds_to_12_string(second_lunch[1])
+            column[PM_BREAK_2] = "yes"
+            column[TIME_OUT_10] = seconds_to_12_string(self.worked[-1][1])
+        return column
+
+
+def add_block(days: dict[datetime.date, list[tuple[int, int]]], block: workTime.WorkBlock) -> None:
+    """
+    Add the clock lines of a block to the per date intervals.
+
+    Args:
+        days (dict[datetime.date, list[tuple[int, int]]]): Date -> (start, end) seconds since midnight.
+        block (workTime.WorkBlock): The block to add.
+    """
+    intervals: list[tuple[int, int]] = days[block.day]
+    for clock in block.clock_times:
+        start: int = clock.start
+        end: int = clock.end
+        if end < start:  # worked past midnight
+            end += DAY_SECONDS
+        intervals.append((start, end))
+
+
+def collect_days(work_list: Sequence[workTime.WorkTime]) -> dict[datetime.date, DayTimeline]:
+    """
+    Build the timeline of every date with punches, across all jobs.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+
+    Returns:
+        dict[datetime.date, DayTimeline]: Date -> timeline, in date order.
+    """
+    days: defaultdict[datetime.date, list[tuple[int, int]]] = defaultdict(list)
+    for work in work_list:
+        for block in work.work_blocks:
+            if in_report_window(day=block.day):
+                add_block(days=days, block=block)
+    return {day: DayTimeline(intervals=days[day]) for day in sorted(days)}
+
+
+class TimelineAggregator:
+    """
+    Time table timelines fed one WorkBlock at a time, for the streaming pipeline.
+
+    The time table shows the latest date of each week day, so only the
+    intervals of those (at most 7) dates are kept, whatever order the blocks come in.
+    """
+    __slots__ = ("latest", "intervals")
+
+    def __init__(self) -> None:
+        self.latest: dict[int, datetime.date] = {}  # week day -> latest date seen
+        self.intervals: defaultdict[datetime.date, list[tuple[int, int]]] = defaultdict(list)
+
+    def add_block(self, block: workTime.WorkBlock) -> None:
+        if not in_report_window(day=block.day):
+            return
+        weekday: int = block.day.weekday()
+        latest: datetime.date | None = self.latest.get(weekday)
+        if latest is not None and latest > block.day:
+            return
+        if latest is not None and latest < block.day:
+            del self.intervals[latest]
+        self.latest[weekday] = block.day
+        add_block(days=self.intervals, block=block)
+
+    def days(self) -> dict[datetime.date, DayTimeline]:
+        """
+        Returns:
+            dict[datetime.date, DayTimeline]: Date -> timeline of the kept dates, in date order.
+        """
+        return {day: DayTimeline(intervals=self.intervals[day]) for day in sorted(self.intervals)}
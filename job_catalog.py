@@ -0,0 +1,191 @@
+"""
+# @ Description: Job catalog indexed by phase code, description and equipment number of every phase sheet row
+"""
+
+import functools
+import json
+import os
+import re
+
+from helper_functions import clean_name
+
+CATALOG_FILE = r"envHidden/config/jobs.json"
+DEFAULT_EQIP_NO = "56.1077"
+
+PHASE_CODE_PATTERN: re.Pattern[str] = re.compile(pattern=r"\d{2}\.\d{3}\.\d{4}")
+
+# jobs.json, every key is optional:
+# {
+#     "default eqip. no.": "56.1077",
+#     "jobs": {
+#         "10.010.0023": {"description": "Automation Engineer Overhead", "eqip. no.": "56.1077"},
+#         "20.120.0101": {"description": "Panel Build"}
+#     }
+# }
+
+
+class Job:
+    __slots__ = ("phase_code", "description", "eqip_no")
+
+    def __init__(self, phase_code: str, description: str, eqip_no: str) -> None:
+        self.phase_code: str = phase_code
+        self.description: str = description
+        self.eqip_no: str = eqip_no
+
+    def __repr__(self) -> str:
+        return f"Job({self.phase_code!r}, {self.description!r}, {self.eqip_no!r})"
+
+
+@functools.lru_cache(maxsize=None)
+def parse_header(name: str) -> tuple[str, str]:
+    """
+    Split a WorkTime header into its phase code and cleaned description, memoized per header.
+
+    One regex search gives the same result as get_phase_code, remove_phase_code and clean_name together.
+
+    Args:
+        name (str): WorkTime.name, e.g. "10.010.0023 Automation Engineer - Overhead  total amount: ...".
+
+    Returns:
+        tuple[str, str]: (phase code or "", description).
+
+    Example:
+        >>> parse_header("10.010.0023 Automation Engineer - Overhead  total amount: $110.67")
+        ('10.010.0023', 'Automation Engineer Overhead')
+    """
+    match: re.Match[str] | None = PHASE_CODE_PATTERN.search(string=name)
+    if match is None:
+        return "", clean_name(name=name)
+    return match.group(), clean_name(name=name[:match.start()] + name[match.end():])
+
+
+def export_name(name: str) -> str:
+    """
+    A WorkTime header without its running totals, stable while the export grows.
+
+    Args:
+        name (str): WorkTime.name.
+
+    Returns:
+        str: The part before "total amount:", the whole header when it has none.
+
+    Example:
+        >>> export_name("10.010.0023 Automation Engineer - Overhead  total amount: $110.67  total time: 02:40:00")
+        '10.010.0023 Automation Engineer - Overhead'
+    """
+    return name.split("total amount:", 1)[0].strip()
+
+
+class JobCatalog:
+    """
+    Phase code -> Job, loaded once from CATALOG_FILE.
+
+    Phase codes missing from the file fall back to the description of the
+    export header and the default equipment number.
+    """
+    __slots__ = ("jobs", "default_eqip_no")
+
+    def __init__(self, jobs: dict[str, Job] | None = None, default_eqip_no: str = DEFAULT_EQIP_NO) -> None:
+        self.jobs: dict[str, Job] = jobs or {}
+        self.default_eqip_no: str = default_eqip_no
+
+    @classmethod
+    def load(cls, json_file: str = CATALOG_FILE, missing_ok: bool = False) -> "JobCatalog":
+        """
+        Read a catalog file.
+
+        Args:
+            json_file (str, optional): Path of the catalog. Defaults to CATALOG_FILE.
+            missing_ok (bool, optional): Give an empty catalog when the file does not exist. Defaults to False.
+
+        Raises:
+            FileNotFoundError: When the file does not exist and missing_ok is False.
+            ValueError: When the file is not a catalog.
+
+        Returns:
+            JobCatalog: The catalog.
+        """
+        if not os.path.exists(json_file):
+            if missing_ok:
+                return cls()
+            raise FileNotFoundError(f"job catalog {json_file} does not exist")
+        with open(file=json_file, mode="r", encoding="utf-8") as f:
+            config = json.load(f)
+        if not isinstance(config, dict) or not isinstance(config.get("jobs", {}), dict):
+            raise ValueError(f"{json_file} is not a job catalog, expected {{\"jobs\": {{phase code: {{...}}}}}}")
+
+        default_eqip_no: str = str(config.get("default eqip. no.", DEFAULT_EQIP_NO))
+        jobs: dict[str, Job] = {}
+        for phase_code, entry in config.get("jobs", {}).items():
+            if not isinstance(entry, dict):
+                raise ValueError(f"{json_file}: job {phase_code!r} is not an object, expected {{\"description\": ...}}")
+            jobs[phase_code] = Job(
+                phase_code=phase_code,
+                description=str(entry.get("description", "")),
+                eqip_no=str(entry.get("eqip. no.", default_eqip_no)),
+            )
+        return cls(jobs=jobs, default_eqip_no=default_eqip_no)
+
+    def job(self, name: str) -> Job:
+        """
+        Catalog entry of an export header.
+
+        Args:
+            name (str): WorkTime.name.
+
+        Returns:
+            Job: The catalog job of the phase code, or one built from the header.
+        """
+        phase_code, description = parse_header(name=name)
+        known: Job | None = self.jobs.get(phase_code) if phase_code else None
+        if known is None:
+            return Job(phase_code=phase_code, description=description, eqip_no=self.default_eqip_no)
+        if not known.description:
+            return Job(phase_code=phase_code, description=description, eqip_no=known.eqip_no)
+        return known
+
+
+_catalog: JobCatalog | None = None
+
+
+def get_catalog() -> JobCatalog:
+    """
+    The catalog of this run, CATALOG_FILE is read on first use, when it exists.
+
+    Returns:
+        JobCatalog: The shared catalog.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = JobCatalog.load(missing_ok=True)
+    return _catalog
+
+
+def set_catalog(catalog: JobCatalog) -> None:
+    """
+    Replace the shared catalog, e.g. with the one of the parent process in a worker.
+
+    Args:
+        catalog (JobCatalog): The catalog to share.
+    """
+    global _catalog
+    _catalog = catalog
+
+
+def load_catalog(json_file: str) -> JobCatalog:
+    """
+    Replace the shared catalog with the one of another file.
+
+    Args:
+        json_file (str): Path of the catalog.
+
+    Raises:
+        FileNotFoundError: When the file does not exist.
+        ValueError: When the file is not a catalog.
+
+    Returns:
+        JobCatalog: The loaded catalog.
+    """
+    global _catalog
+    _catalog = JobCatalog.load(json_file=json_file)
+    return _catalog
@@ -0,0 +1,165 @@
+"""
+# @ Description: Built in markdown pipe tables, same output as pandas.DataFrame.to_markdown without importing pandas
+"""
+
+import importlib
+from typing import Any, Sequence
+
+# "builtin" renders here, "pandas" goes through DataFrame.to_markdown (pandas and tabulate needed)
+BACKENDS: tuple[str, ...] = ("builtin", "pandas")
+BACKEND = "builtin"
+
+MIN_PADDING = 2  # header cells get two spaces of room, like tabulate
+
+# cell type ranks, a column takes the most generic type of its cells (tabulate rules)
+_NONE = 0
+_BOOL = 1
+_INT = 2
+_FLOAT = 3
+_STR = 4
+
+
+def set_backend(backend: str) -> None:
+    """
+    Choose the markdown renderer.
+
+    Args:
+        backend (str): One of BACKENDS.
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+    global BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown markdown backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+    BACKEND = backend
+
+
+def _cell_type(value: Any) -> int:
+    if value is None:
+        return _NONE
+    if isinstance(value, str):
+        if value in ("True", "False"):
+            return _BOOL
+        try:
+            int(value)
+            return _INT
+        except ValueError:
+            pass
+        try:
+            float(value)
+            return _FLOAT
+        except ValueError:
+            return _STR
+    if type(value) is bool:
+        return _BOOL
+    if type(value) is int:
+        return _INT
+    if hasattr(value, "isoformat"):
+        return _STR
+    try:
+        float(value)
+        return _FLOAT
+    except (TypeError, ValueError):
+        return _STR
+
+
+def _after_point(text: str) -> int:
+    # digits after the decimal point of a number, -1 for ints and text
+    if _cell_type(value=text) != _FLOAT:
+        return -1
+    point: int = text.rfind(".")
+    point = text.lower().rfind("e") if point < 0 else point
+    return len(text) - point - 1 if point >= 0 else -1
+
+
+def _column(header: str, values: Sequence[Any], numparse: bool = True) -> tuple[str, list[str], bool]:
+    # -> (padded header, padded cells, right aligned)
+    column_type: int = max(
+        (_cell_type(value=value) if numparse or value is None else _STR for value in values), default=_BOOL
+    )
+    numeric: bool = column_type in (_INT, _FLOAT)
+
+    cells: list[str]
+    if column_type == _FLOAT:
+        cells = ["" if value is None else format(float(value), "g") for value in values]
+    else:
+        cells = ["" if value is None else f"{value}" for value in values]
+
+    if numeric:
+        # line up the decimal points
+        points: list[int] = [_after_point(text=cell) for cell in cells]
+        most: int = max(points, default=-1)
+        cells = [cell + " " * (most - point) for cell, point in zip(cells, points)]
+    else:
+        cells = [cell.strip() for cell in cells]
+
+    width: int = max([len(header) + MIN_PADDING] + [len(cell) for cell in cells])
+    if numeric:
+        return header.rjust(width), [cell.rjust(width) for cell in cells], True
+    return header.ljust(width), [cell.ljust(width) for cell in cells], False
+
+
+def pipe_table(
+    headers: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    index: Sequence[Any] | None = None,
+    disable_numparse: bool | Sequence[int] = False,
+) -> str:
+    """
+    Render rows as a markdown pipe table.
+
+    Gives the same text as pandas.DataFrame(data=rows, index=index, columns=headers).to_markdown()
+    for the cell types the sheets use: str, int, Decimal and None (left blank).
+
+    Cells that read as numbers are printed as numbers (a column of "0.50" prints
+    0.5), so columns of preformatted text, like amounts with two decimals, are
+    passed in disable_numparse to keep them as they are, as with tabulate.
+
+    Args:
+        headers (Sequence[str]): Column names.
+        rows (Sequence[Sequence[Any]]): Cell values, one sequence per row.
+        index (Sequence[Any] | None, optional): Row labels. Defaults to None, rows are numbered from 0.
+        disable_numparse (bool | Sequence[int], optional): True, or the numbers of the columns
+            (counted in headers) whose cells are printed as text. Defaults to False.
+
+    Returns:
+        str: The table, without a trailing newline.
+
+    Example:
+        >>> print(pipe_table(headers=["Sat"], rows=[["08:00 AM"]]))
+        |    | Sat      |
+        |---:|:---------|
+        |  0 | 08:00 AM |
+    """
+    if BACKEND == "pandas":
+        pandas = importlib.import_module("pandas")
+        if not isinstance(disable_numparse, bool):
+            # tabulate counts the index as column 0
+            disable_numparse = [number + 1 for number in disable_numparse]
+        return pandas.DataFrame(data=list(rows), index=index, columns=list(headers)).to_markdown(
+            disable_numparse=disable_numparse
+        )
+
+    if not rows:
+        # tabulate drops the index and the alignment colons of an empty frame
+        widths: list[int] = [len(header) + MIN_PADDING for header in headers]
+        return "\n".join([
+            "| " + " | ".join(header.ljust(width) for header, width in zip(headers, widths)) + " |",
+            "|" + "|".join("-" * (width + 2) for width in widths) + "|",
+        ])
+
+    labels: Sequence[Any] = range(len(rows)) if index is None else index
+    columns: list[tuple[str, list[str], bool]] = [_column(header="", values=list(labels))]
+    for number, header in enumerate(headers):
+        numparse: bool = not disable_numparse if isinstance(disable_numparse, bool) else number not in disable_numparse
+        columns.append(_column(header=header, values=[row[number] for row in rows], numparse=numparse))
+
+    lines: list[str] = ["| " + " | ".join(header for header, _, _ in columns) + " |"]
+    lines.append("|" + "|".join(
+        "-" * (len(header) + 1) + ":" if right else ":" + "-" * (len(header) + 1)
+        for header, _, right in columns
+    ) + "|")
+    for row in range(len(rows)):
+        lines.append("| " + " | ".join(cells[row] for _, cells, _ in columns) + " |")
+    return "\n".join(lines)
@@ -0,0 +1,162 @@
+"""
+# @ Description: Memory mapped reader that only decodes the blocks of a date range
+"""
+
+import csv
+import datetime
+import functools
+import io
+import mmap
+import os
+from typing import Iterator
+
+import workTime
+from parse_engine import iter_blocks, lookup_date
+from run_settings import process_pool
+
+# byte patterns of the lines that bound a block, both at the start of a line
+DATE_HEADER = b'\n"","","'  # "","","Mar 3, 2025"
+TOTAL_LINE = b'\n"Total:'  # "Total:     00:45:00               $31.13"
+
+
+def iter_block_spans(
+    mapped: mmap.mmap, position: int = 0, stop: int | None = None
+) -> Iterator[tuple[datetime.date, int, int]]:
+    """
+    Find the complete blocks of a mapped csv export by byte search, without decoding them.
+
+    Args:
+        mapped (mmap.mmap): The mapped export.
+        position (int, optional): Offset to start searching from, at or before a date header line break. Defaults to 0.
+        stop (int | None, optional): No date header is looked for at or past this offset. Defaults to None, the end.
+
+    Yields:
+        tuple[datetime.date, int, int]: (date, offset of the line break before the date header,
+            offset of the line break ending the "Total:" line) of every block, in file order.
+    """
+    size: int = len(mapped)
+    if stop is None:
+        stop = size
+    while True:
+        header_at: int = mapped.find(DATE_HEADER, position, stop)
+        if header_at < 0:
+            return
+        date_start: int = header_at + len(DATE_HEADER)
+        date_end: int = mapped.find(b'"', date_start)
+        if date_end < 0:
+            return
+        day: datetime.date | None = lookup_date(date_str=mapped[date_start:date_end].decode(encoding="utf-8"))
+        if day is None:
+            # not a date header after all, look further
+            position = date_end
+            continue
+        total_at: int = mapped.find(TOTAL_LINE, date_end)
+        if total_at < 0:
+            return  # unfinished block, process_csv_file drops it too
+        line_end: int = mapped.find(b"\n", total_at + 1)
+        if line_end < 0:
+            line_end = size
+        yield day, header_at, line_end
+        position = line_end
+
+
+def scan_csv_file(
+    csv_file: str,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+    start: int = 0,
+    stop: int | None = None,
+) -> workTime.WorkTime:
+    """
+    Read the blocks of a WorkTime csv export that fall between since and until.
+
+    The file is memory mapped and block boundaries are found with byte searches
+    for the date header and "Total:" lines. Blocks outside of the range are
+    skipped without being decoded or tokenized. Consecutive blocks inside the
+    range are decoded as one run and parsed by parse_engine.iter_blocks, so the
+    blocks returned are the same objects process_csv_file builds for them.
+
+    Args:
+        csv_file (str): Path to the csv export.
+        since (datetime.date, optional): First day to keep. Defaults to datetime.date.min.
+        until (datetime.date, optional): Last day to keep. Defaults to datetime.date.max.
+        start (int, optional): Byte offset to start looking for blocks, see file_index. Defaults to 0.
+        stop (int | None, optional): Byte offset where no further block starts. Defaults to None, the end.
+
+    Returns:
+        workTime.WorkTime: The job name and the work blocks of the range, in file order.
+    """
+    work_time: workTime.WorkTime = workTime.WorkTime()
+    with open(file=csv_file, mode="rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return work_time
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            work_time.name = read_header(mapped=mapped)
+
+            # [start, end) of the current run of consecutive blocks inside the range
+            run_start: int = -1
+            run_end: int = -1
+            # the search starts after the job header line, or at start when that is further in
+            position: int = max(start, mapped.find(b"\n"))
+            for day, header_at, line_end in iter_block_spans(mapped=mapped, position=position, stop=stop):
+                if since <= day <= until:
+                    if run_start < 0:
+                        run_start = header_at + 1
+                    run_end = line_end
+                elif run_start >= 0:
+                    _parse_run(work_time=work_time, mapped=mapped, start=run_start, end=run_end)
+                    run_start = -1
+
+            if run_start >= 0:
+                _parse_run(work_time=work_time, mapped=mapped, start=run_start, end=run_end)
+    return work_time
+
+
+def read_header(mapped: mmap.mmap) -> str:
+    """
+    The job header (first csv field of the first line) of a mapped export.
+
+    Args:
+        mapped (mmap.mmap): The mapped export.
+
+    Returns:
+        str: WorkTime.name, "" when the first line is empty.
+    """
+    header_end: int = mapped.find(b"\n")
+    if header_end < 0:
+        header_end = len(mapped)
+    for row in csv.reader(io.StringIO(mapped[:header_end].decode(encoding="utf-8"))):
+        return row[0]
+    return ""
+
+
+def _parse_run(work_time: workTime.WorkTime, mapped: mmap.mmap, start: int, end: int) -> None:
+    text: str = mapped[start:end].decode(encoding="utf-8")
+    work_time.work_blocks.extend(iter_blocks(rows=csv.reader(io.StringIO(text))))
+
+
+def scan_csv_files(
+    csv_files: list[str],
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+    workers: int = 1,
+) -> list[workTime.WorkTime]:
+    """
+    scan_csv_file every export, spreading the files across a process pool when workers > 1.
+
+    Args:
+        csv_files (list[str]): Paths of the csv exports.
+        since (datetime.date, optional): First day to keep. Defaults to datetime.date.min.
+        until (datetime.date, optional): Last day to keep. Defaults to datetime.date.max.
+        workers (int, optional): Number of worker processes, 0 uses one per cpu. Defaults to 1 (serial).
+
+    Returns:
+        list[workTime.WorkTime]: One WorkTime per file, in the same order as csv_files.
+    """
+    scan = functools.partial(scan_csv_file, since=since, until=until)
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(csv_files) <= 1:
+        return [scan(csv_file) for csv_file in csv_files]
+    with process_pool(max_workers=min(workers, len(csv_files))) as executor:
+        return list(executor.map(scan, csv_files))
@@ -0,0 +1,263 @@
+"""
+# @ Description: Cross job overtime, all jobs of a date are joined before the 8h / 10h / 40h limits are applied
+"""
+
+import datetime
+import decimal
+from collections import defaultdict
+from typing import Sequence
+
+import workTime
+from aggregate import DAY_COLUMNS, MAX_ST_QUARTERS, WEEKDAY_TO_COLUMN, build_line, quarters_to_hours, seconds_to_quarters
+from helper_functions import WEEK_DAY_NAMES, in_report_window, week_start
+from job_catalog import Job, get_catalog
+from md_table import pipe_table
+
+LONG_DAY_QUARTERS = 40  # past 10 hours a day, the 10hr+ part of the time table
+MAX_WEEK_ST_QUARTERS = 160  # 40 hours of standard time a week
+
+
+class DayHours:
+    """Combined quarter hours of one date across every job."""
+    __slots__ = ("day", "quarters", "st", "ot", "over_10")
+
+    def __init__(self, day: datetime.date) -> None:
+        self.day: datetime.date = day
+        self.quarters: int = 0
+        self.st: int = 0
+        self.ot: int = 0
+        self.over_10: int = 0  # quarters past LONG_DAY_QUARTERS, part of ot
+
+
+class OvertimeReport:
+    """
+    Result of combine_overtime.
+
+    lines: phase sheet lines, one per phase code, with the cross job ST/OT split.
+    over_10: quarters past 10 hours a day handed to each line, part of its OT.
+    days: combined hours per date, in date order.
+    weeks: week start (Saturday) -> (st, ot) quarters, in date order.
+    """
+    __slots__ = ("lines", "over_10", "days", "weeks")
+
+    def __init__(
+        self,
+        lines: list[dict[str, int | str | decimal.Decimal]],
+        over_10: list[int],
+        days: list[DayHours],
+        weeks: dict[datetime.date, tuple[int, int]],
+    ) -> None:
+        self.lines: list[dict[str, int | str | decimal.Decimal]] = lines
+        self.over_10: list[int] = over_10
+        self.days: list[DayHours] = days
+        self.weeks: dict[datetime.date, tuple[int, int]] = weeks
+
+
+def allocate_day(row_seconds: Sequence[int], week_st: int) -> list[tuple[int, int, int]]:
+    """
+    Split one date of combined work into standard time, over time and the 10hr+ tier.
+
+    The seconds of all rows are rounded to quarter hours once, as a running
+    total, so the rows always add up to the rounded day. The day is then laid
+    out in the order the rows were worked: the first 8 hours are standard
+    time while the 40 hour week lasts, the rest is over time and quarters
+    past 10 hours are also counted as 10hr+.
+
+    Args:
+        row_seconds (Sequence[int]): Worked seconds per row, in the order the rows were worked.
+        week_st (int): Standard time quarters already used in the week of the date.
+
+    Returns:
+        list[tuple[int, int, int]]: (st, ot, over_10) quarters per row; over_10 is part of ot.
+
+    Example:
+        >>> allocate_day(row_seconds=[6 * 3600, 6 * 3600], week_st=0)
+        [(24, 0, 0), (8, 16, 8)]
+    """
+    st_end: int = max(0, min(MAX_ST_QUARTERS, MAX_WEEK_ST_QUARTERS - week_st))
+    split: list[tuple[int, int, int]] = []
+    seconds: int = 0
+    start: int = 0
+    for row in row_seconds:
+        seconds += row
+        end: int = seconds_to_quarters(seconds=seconds)
+        st: int = max(0, min(end, st_end) - start)
+        over_10: int = max(0, end - max(start, LONG_DAY_QUARTERS))
+        split.append((st, end - start - st, over_10))
+        start = end
+    return split
+
+
+class OvertimeAggregator:
+    """
+    Cross job overtime fed one WorkBlock at a time, for the batch and the streaming pipeline.
+
+    Exports are hashed to their phase sheet row as they are added and blocks
+    are hashed by (date, row), keeping the worked seconds and the first punch,
+    so memory grows with the number of days and rows, not with the clock lines.
+    """
+    __slots__ = ("catalog", "rows", "jobs", "job_rows", "dates")
+
+    def __init__(self) -> None:
+        self.catalog = get_catalog()
+        self.rows: dict[str, int] = {}  # phase code (or header) -> row
+        self.jobs: list[Job] = []
+        self.job_rows: list[int] = []  # export -> row
+        # date -> row -> [first punch, seconds]
+        self.dates: defaultdict[datetime.date, dict[int, list[int]]] = defaultdict(dict)
+
+    def add_job(self, name: str) -> int:
+        """
+        Start a new export.
+
+        Args:
+            name (str): WorkTime.name of the export.
+
+        Returns:
+            int: The export number to pass to add_block.
+        """
+        job: Job = self.catalog.job(name=name)
+        key: str = job.phase_code or name
+        row: int | None = self.rows.get(key)
+        if row is None:
+            row = self.rows[key] = len(self.jobs)
+            self.jobs.append(job)
+        self.job_rows.append(row)
+        return len(self.job_rows) - 1
+
+    def add_block(self, job: int, block: workTime.WorkBlock) -> None:
+        if not in_report_window(day=block.day):
+            return
+        first_punch: int = block.clock_times[0].start if block.clock_times else 0
+        entry: list[int] | None = self.dates[block.day].get(self.job_rows[job])
+        if entry is None:
+            self.dates[block.day][self.job_rows[job]] = [first_punch, block.final_line.seconds]
+        else:
+            entry[0] = min(entry[0], first_punch)
+            entry[1] += block.final_line.seconds
+
+    def report(self) -> OvertimeReport:
+        """
+        Split standard and over time on the hours of all jobs together.
+
+        Per date the rows are taken in the order they were started (ties by
+        phase sheet row) and split by allocate_day: the day total is rounded to
+        quarter hours once, standard time is handed out until the 8 hour day or
+        the 40 hour Saturday to Friday week is used up and the rest of the day
+        is over time, so the over time and the quarters past 10 hours land on
+        the rows worked last.
+
+        As in aggregate.merge_lines, a day column holds the latest date of its
+        week day while the totals count every date.
+
+        Returns:
+            OvertimeReport: Phase sheet lines plus the daily and weekly totals.
+        """
+        rows: int = len(self.jobs)
+        day_st: list[list[int]] = [[0] * len(DAY_COLUMNS) for _ in range(rows)]
+        day_ot: list[list[int]] = [[0] * len(DAY_COLUMNS) for _ in range(rows)]
+        column_date: list[list[datetime.date | None]] = [[None] * len(DAY_COLUMNS) for _ in range(rows)]
+        total_st: list[int] = [0] * rows
+        total_ot: list[int] = [0] * rows
+        over_10: list[int] = [0] * rows
+        days: list[DayHours] = []
+        weeks: dict[datetime.date, tuple[int, int]] = {}
+
+        for day in sorted(self.dates):
+            week: datetime.date = week_start(day=day)
+            week_st, week_ot = weeks.get(week, (0, 0))
+            column: int = WEEKDAY_TO_COLUMN[day.weekday()]
+            hours: DayHours = DayHours(day=day)
+            worked: list[tuple[int, int, int]] = sorted(
+                (first, row, seconds) for row, (first, seconds) in self.dates[day].items()
+            )
+            split: list[tuple[int, int, int]] = allocate_day(
+                row_seconds=[seconds for _, _, seconds in worked], week_st=week_st
+            )
+            for (_, row, _), (st, ot, long) in zip(worked, split):
+                hours.quarters += st + ot
+                hours.st += st
+                hours.ot += ot
+                hours.over_10 += long
+                week_st += st
+                week_ot += ot
+                over_10[row] += long
+
+                if column_date[row][column] != day:
+                    # a later date of the same week day replaces the cell
+                    column_date[row][column] = day
+                    day_st[row][column] = 0
+                    day_ot[row][column] = 0
+                day_st[row][column] += st
+                day_ot[row][column] += ot
+                total_st[row] += st
+                total_ot[row] += ot
+            days.append(hours)
+            weeks[week] = (week_st, week_ot)
+
+        lines: list[dict[str, int | str | decimal.Decimal]] = [
+            build_line(job=job, day_st=day_st[row], day_ot=day_ot[row], total_st=total_st[row], total_ot=total_ot[row])
+            for row, job in enumerate(self.jobs)
+        ]
+        return OvertimeReport(lines=lines, over_10=over_10, days=days, weeks=weeks)
+
+    def lines(self) -> list[dict[str, int | str | decimal.Decimal]]:
+        return self.report().lines
+
+
+def combine_overtime(work_list: Sequence[workTime.WorkTime]) -> OvertimeReport:
+    """
+    Cross job standard and over time split of all jobs in one batch, see OvertimeAggregator.report.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+
+    Returns:
+        OvertimeReport: Phase sheet lines plus the daily and weekly totals.
+    """
+    aggregator: OvertimeAggregator = OvertimeAggregator()
+    for work in work_list:
+        job: int = aggregator.add_job(name=work.name)
+        for block in work.work_blocks:
+            aggregator.add_block(job=job, block=block)
+    return aggregator.report()
+
+
+def summary_markdown(report: OvertimeReport) -> str:
+    """
+    Daily, weekly and per phase code combined hours of a report as three markdown tables.
+
+    Args:
+        report (OvertimeReport): From combine_overtime.
+
+    Returns:
+        str: The daily, weekly and phase code tables, separated by blank lines.
+    """
+    daily: list[list[str | decimal.Decimal]] = [
+        [
+            WEEK_DAY_NAMES[hours.day.weekday()][:3],
+            quarters_to_hours(quarters=hours.quarters),
+            quarters_to_hours(quarters=hours.st),
+            quarters_to_hours(quarters=hours.ot),
+            quarters_to_hours(quarters=hours.over_10),
+        ]
+        for hours in report.days
+    ]
+    weekly: list[list[decimal.Decimal]] = [
+        [quarters_to_hours(quarters=st + ot), quarters_to_hours(quarters=st), quarters_to_hours(quarters=ot)]
+        for st, ot in report.weeks.values()
+    ]
+    phase_codes: list[list[str | decimal.Decimal]] = [
+        [line["TOT ST"], line["tot ot"], quarters_to_hours(quarters=long)] for line, long in zip(report.lines, report.over_10)
+    ]
+    return "\n\n".join([
+        pipe_table(
+            headers=["day", "hours", "ST", "OT", "10hr+"], rows=daily, index=[hours.day.isoformat() for hours in report.days]
+        ),
+        pipe_table(headers=["hours", "ST", "OT"], rows=weekly, index=[f"week of {week.isoformat()}" for week in report.weeks]),
+        pipe_table(
+            headers=["ST", "OT", "10hr+"],
+            rows=phase_codes,
+            index=[str(line["phase code"] or line["description"]) for line in report.lines],
+        ),
+    ])
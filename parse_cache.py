@@ -0,0 +1,146 @@
+"""
+# @ Description: On disk cache of parsed WorkTime csv exports
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+
+import workTime
+
+CACHE_FOLDER = r"envHidden/cache/parse"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+# eviction frees the folder down to this share of max_bytes, so it runs again only after many stores
+EVICT_TO = 0.75
+ENTRY_SUFFIX = ".pickle"
+# bumped whenever the pickled workTime layout changes, older entries are then never hit
+CACHE_VERSION = 2  # 2: integer seconds and cents
+
+
+class ParseCache:
+    """
+    Parsed WorkTimes stored as pickles, keyed by a fingerprint of the csv file.
+
+    The fingerprint hashes the path, size, mtime and content of the file, so an
+    entry is only reused when the export is byte for byte the one it was built
+    from. The size of the folder is counted once and then kept running, entries
+    are evicted least recently used first once it grows past max_bytes. load
+    and store may be called from several threads; files removed by another
+    thread or process in between are skipped.
+    """
+
+    def __init__(self, cache_folder: str = CACHE_FOLDER, max_bytes: int = MAX_CACHE_BYTES) -> None:
+        self.cache_folder: str = os.path.normpath(cache_folder)
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        # guards the counters and the size, entries themselves are written by atomic rename
+        self._lock: threading.Lock = threading.Lock()
+        self._size: int | None = None  # bytes of entries in the folder, counted on the first store
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+    def key(self, csv_file: str, content: bytes | None = None) -> str:
+        """
+        Fingerprint a csv export.
+
+        Args:
+            csv_file (str): Path to the csv export.
+            content (bytes | None, optional): The file content when it was already read. Defaults to None, read here.
+
+        Returns:
+            str: Hex digest of (CACHE_VERSION, path, size, mtime, content).
+        """
+        path: str = os.path.abspath(csv_file)
+        stat: os.stat_result = os.stat(path)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{CACHE_VERSION}\0{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode(encoding="utf-8"))
+        if content is None:
+            with open(file=path, mode="rb") as file:
+                content = file.read()
+        digest.update(content)
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_folder, key + ENTRY_SUFFIX)
+
+    def load(self, key: str) -> workTime.WorkTime | None:
+        """
+        Get a cached WorkTime, counting the hit or miss.
+
+        Args:
+            key (str): Fingerprint from key().
+
+        Returns:
+            workTime.WorkTime | None: The cached WorkTime, None when it is not cached.
+        """
+        entry: str = self.entry_path(key=key)
+        try:
+            with open(file=entry, mode="rb") as file:
+                work: workTime.WorkTime = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            # missing, cut short or pickled from classes that changed since
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(entry)  # mark as recently used for eviction
+        except FileNotFoundError:
+            pass  # evicted by another thread after it was read
+        with self._lock:
+            self.hits += 1
+        return work
+
+    def store(self, key: str, work: workTime.WorkTime) -> None:
+        """
+        Cache a parsed WorkTime and evict old entries when over the size limit.
+
+        Args:
+            key (str): Fingerprint from key().
+            work (workTime.WorkTime): The parsed WorkTime.
+        """
+        entry: str = self.entry_path(key=key)
+        temp: str = f"{entry}.{threading.get_ident()}.tmp"
+        with open(file=temp, mode="wb") as file:
+            pickle.dump(work, file, protocol=pickle.HIGHEST_PROTOCOL)
+            size: int = file.tell()
+        try:
+            replaced: int = os.path.getsize(entry)
+        except OSError:
+            replaced = 0
+        os.replace(temp, entry)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry_size for _, entry_size, _ in self._entries())
+            else:
+                self._size += size - replaced
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        # (mtime, size, path) of every entry, skipping the ones removed while scanning
+        entries: list[tuple[float, int, str]] = []
+        for entry in os.scandir(self.cache_folder):
+            if not entry.name.endswith(ENTRY_SUFFIX):
+                continue
+            try:
+                stat: os.stat_result = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the folder is down to EVICT_TO of max_bytes."""
+        entries: list[tuple[float, int, str]] = self._entries()
+        total: int = sum(size for _, size, _ in entries)
+        entries.sort()  # oldest first
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # evicted by another process
+            total -= size
+        self._size = total
@@ -0,0 +1,224 @@
+"""
+# @ Description: Table driven parser for WorkTime csv exports
+"""
+
+import datetime
+import decimal
+import re
+from typing import Iterable, Iterator
+
+import workTime
+
+# csv rows handled by the engine (see workTime.py for the full layout):
+# ["10.010.0023 Automation Engineer - Overhead  total amount: ..."]   -> header, always row 0
+# ["","","Mar 3, 2025"]                                               -> date header, opens a block
+# ["Start","End","Time","Amount","Note"]                              -> column names, skipped
+# ["8:00:00 AM","8:30:00 AM","00:30:00","$20.75",""]                  -> clock line
+# ["Total:     00:45:00               $31.13"]                        -> final line, closes the block
+
+DATE_PATTERN: re.Pattern[str] = re.compile(pattern=r"^[A-Z][a-z]+ \d{1,2}, \d{4}$")
+
+# "8:00:00 AM" -> 28800 seconds since midnight, filled by build_tables() and on lookup misses
+AM_PM_TABLE: dict[str, int] = {}
+# "04:00:00" -> 14400 seconds, filled by build_tables() and on lookup misses
+DURATION_TABLE: dict[str, int] = {}
+# "Mar 3, 2025" -> datetime.date(2025, 3, 3), None when the string is not a date
+DATE_MEMO: dict[str, datetime.date | None] = {}
+# "$249.00" -> 24900 cents
+MONEY_MEMO: dict[str, int] = {}
+
+
+def build_tables() -> None:
+    """
+    Precompute every whole minute "H:MM:00 AM/PM" clock string and "HH:MM:00" duration below 24 hours.
+
+    The tables are built once per process, the first time a file is parsed.
+    Strings outside of the tables (odd seconds, "08:00:00 AM", "30:45:10", ...)
+    are parsed the slow way the first time they are seen and memoized into the
+    same tables. Precomputing all 86,400 seconds of the day costs more than
+    parsing a typical week of exports, punches are almost always on the minute.
+    """
+    if AM_PM_TABLE:
+        return
+    for hour in range(24):
+        twelve: str = f"{hour % 12 or 12}:"
+        suffix: str = ":00 AM" if hour < 12 else ":00 PM"
+        padded: str = f"{hour:02d}:"
+        for minute in range(60):
+            AM_PM_TABLE[f"{twelve}{minute:02d}{suffix}"] = hour * 3600 + minute * 60
+            DURATION_TABLE[f"{padded}{minute:02d}:00"] = hour * 3600 + minute * 60
+
+
+def lookup_am_pm_time(time_str: str) -> int:
+    """
+    Table lookup version of helper_functions.parse_am_pm_time.
+
+    Args:
+        time_str (str): A time string in the format "%I:%M:%S %p" (e.g., "8:00:00 AM").
+
+    Returns:
+        int: Seconds since midnight.
+    """
+    parsed: int | None = AM_PM_TABLE.get(time_str)
+    if parsed is None:
+        parsed = workTime.time_to_seconds(time=datetime.datetime.strptime(time_str, "%I:%M:%S %p").time())
+        AM_PM_TABLE[time_str] = parsed
+    return parsed
+
+
+def lookup_duration(time_str: str) -> int:
+    """
+    Table lookup version of helper_functions.time_string_to_timedelta.
+
+    Args:
+        time_str (str): A time string in the format "HH:MM:SS", where hours can exceed 24.
+
+    Returns:
+        int: The duration in seconds.
+    """
+    parsed: int | None = DURATION_TABLE.get(time_str)
+    if parsed is None:
+        hours, minutes, seconds = map(int, time_str.split(':'))
+        parsed = hours * 3600 + minutes * 60 + seconds
+        DURATION_TABLE[time_str] = parsed
+    return parsed
+
+
+def lookup_date(date_str: str) -> datetime.date | None:
+    """
+    Memoized check and parse of a block date header such as "Mar 3, 2025".
+
+    Args:
+        date_str (str): The last cell of a row.
+
+    Returns:
+        datetime.date | None: The parsed date, or None when the string is not a date header.
+    """
+    try:
+        return DATE_MEMO[date_str]
+    except KeyError:
+        pass
+    parsed: datetime.date | None = None
+    if DATE_PATTERN.fullmatch(string=date_str):
+        parsed = datetime.datetime.strptime(date_str, "%b %d, %Y").date()
+    DATE_MEMO[date_str] = parsed
+    return parsed
+
+
+def lookup_money(money_str: str) -> int:
+    """
+    Memoized conversion of an amount cell such as "$249.00" to integer cents.
+
+    Args:
+        money_str (str): The amount cell including the leading "$".
+
+    Raises:
+        ValueError: When the amount has fractions of a cent.
+
+    Returns:
+        int: The amount in cents, e.g. 24900.
+    """
+    try:
+        return MONEY_MEMO[money_str]
+    except KeyError:
+        cents: int = workTime.money_to_cents(money=decimal.Decimal(value=money_str[1:]))
+        MONEY_MEMO[money_str] = cents
+        return cents
+
+
+def stream_rows(rows: Iterable[list[str]]) -> tuple[str, Iterator[workTime.WorkBlock]]:
+    """
+    Read the header row and return a generator of the WorkBlocks of a WorkTime csv export.
+
+    Each block is yielded as soon as its "Total:" line closes it, nothing else is kept.
+
+    Args:
+        rows (Iterable[list[str]]): Rows as produced by csv.reader.
+
+    Returns:
+        tuple[str, Iterator[workTime.WorkBlock]]: The header (WorkTime.name) and the blocks.
+    """
+    build_tables()
+    row_iter: Iterator[list[str]] = iter(rows)
+    name: str = str()
+    for row in row_iter:
+        # first row
+        name = row[0]
+        break
+    return name, iter_blocks(rows=row_iter)
+
+
+def iter_blocks(rows: Iterable[list[str]]) -> Iterator[workTime.WorkBlock]:
+    """
+    Yield the WorkBlocks of csv rows that follow the header row.
+
+    Rows before the first date header and between blocks are ignored, so any
+    slice of an export that starts at a line boundary can be parsed.
+
+    Args:
+        rows (Iterable[list[str]]): Rows as produced by csv.reader, without the header row.
+
+    Yields:
+        workTime.WorkBlock: Each block once its "Total:" line is read.
+    """
+    build_tables()
+    row_iter: Iterator[list[str]] = iter(rows)
+    work_block: workTime.WorkBlock = workTime.WorkBlock()
+    clock_times: list[workTime.ClockLine] = work_block.clock_times
+    in_block: bool = False
+
+    for row in row_iter:
+        if not in_block:
+            # ["","","Feb 5, 2025"] opens a block, anything else outside a block is ignored
+            if row:
+                day: datetime.date | None = lookup_date(date_str=row[-1])
+                if day is not None:
+                    in_block = True
+                    work_block = workTime.WorkBlock()
+                    work_block.day = day
+                    clock_times = work_block.clock_times
+            continue
+
+        first: str = row[0]
+        lead: str = first[:1]
+        if lead == "S" and first == "Start":
+            continue
+        if lead == "T" and first.startswith("Total:"):
+            # "Total:     08:00:00               $498.00"
+            final_line: workTime.FinalLine = work_block.final_line
+            final_line.line = first
+            split: list[str] = first.split()
+            final_line.seconds = lookup_duration(time_str=split[1])
+            final_line.cents = lookup_money(money_str=split[2])
+            in_block = False
+            yield work_block
+            continue
+
+        # ["8:00:00 AM","12:00:00 PM","04:00:00","$249.00","comment"]
+        line: workTime.ClockLine = workTime.ClockLine()
+        line.start = lookup_am_pm_time(time_str=row[0])
+        line.end = lookup_am_pm_time(time_str=row[1])
+        line.seconds = lookup_duration(time_str=row[2])
+        line.cents = lookup_money(money_str=row[3])
+        line.comment = row[4]
+        clock_times.append(line)
+
+
+def parse_rows(rows: Iterable[list[str]]) -> workTime.WorkTime:
+    """
+    Build a WorkTime from the rows of a WorkTime csv export.
+
+    Produces the same objects as the original strptime/regex based parser,
+    but classifies rows by their first cell and resolves every time, duration,
+    date and amount through the lookup tables above.
+
+    Args:
+        rows (Iterable[list[str]]): Rows as produced by csv.reader.
+
+    Returns:
+        workTime.WorkTime: The parsed work time.
+    """
+    work_time: workTime.WorkTime = workTime.WorkTime()
+    work_time.name, blocks = stream_rows(rows=rows)
+    work_time.work_blocks.extend(blocks)
+    return work_time
@@ -1,95 +1,201 @@
 import decimal
 import functools
-import os
+import operator
+from typing import Sequence
 
-import pandas
 import workTime
 
-from helper_functions import process_line
-
-
-def process_work_times(work_list:list[workTime.WorkTime]) -> str:
-    # Define the header
-    headers: list[str] = [
-        "description",
-        "eqip. no.",
-        "phase code",
-        "SAT ST",
-        "sat ot",
-        "SUN ST",
-        "sun ot",
-        "MON ST",
-        "mon ot",
-        "TUE ST",
-        "tue ot",
-        "WED ST",
-        "wed ot",
-        "THU ST",
-        "thu ot",
-        "FRI ST",
-        "fri ot",
-        "TOT ST",
-        "tot ot",
-    ]
-
-    # Define the index
-    index: list[str | int] = list(range(23)) + [
-        "PTO",
-        "Holiday",
-        "Jury",
-        "Bereavement",
-        "Sick",
-        "Total",
-    ]  # [0,...,22,"PTO",...,"Total"]
-
-    # Create an empty DataFrame with the specified header and index
-    phase_sheet: pandas.DataFrame = pandas.DataFrame(columns=headers, index=index)
-
-    # Set the values for 'description', 'eqip. no.' and 'phase code' for rows 'PTO' to 'Bereavement'
-    phase_sheet.loc["PTO":"Bereavement", ["eqip. no.", "phase code"]] = [
-        "56.1077",
-        "10.010.0023",
-    ]
-    phase_sheet.loc["PTO", "description"] = "PTO"
-    phase_sheet.loc["Holiday", "description"] = "Holiday"
-    phase_sheet.loc["Jury", "description"] = "Jury Duty"
-    phase_sheet.loc["Bereavement", "description"] = "Bereavement"
-    phase_sheet.loc["Sick", "description"] = "*Sick Reserve (Salaried)"
-    
-    
-    line_no = 0
-    for work in work_list:
-        line: dict[str, int | str | decimal.Decimal] = process_line(work=work)
-        if line["TOT ST"] or line["tot ot"]:
-            phase_sheet.loc[line_no] = line.copy()  # pyright: ignore
-            line_no += 1
-        
-    return run_phase_sheet(headers=headers,phase_sheet=phase_sheet)
-    
-
-def run_phase_sheet(headers: list[str], phase_sheet: pandas.DataFrame) -> str:
-    # sum line
-    total_line = pandas.Series(index=headers)
-    total_line["description"] = "TOTAL"
-
-    for idx, col_name in enumerate(total_line.index):
-        if idx < 3:
-            continue
-        values: list[decimal.Decimal] = phase_sheet[col_name].dropna().to_list()
-        total_line[col_name] = functools.reduce(lambda x, y: x + y, values)
-
-    # blank row
-    # phase_sheet.loc[len(phase_sheet)] = [None] * len(phase_sheet.columns)
-
-    # adding sum row
-    phase_sheet.loc["Total"] = total_line
-    phase_sheet.replace(to_replace=pandas.NA, value="", inplace=True)
-
-    md:str = phase_sheet.to_markdown()
-
-    md_file = r"./envHidden/export/phase_sheet.md"
-    md_file = os.path.normpath(md_file)
-    with open(file=md_file, mode="w", encoding="utf-8") as f:
-        f.write(md)
-        
-    return md
\ No newline at end of file
+from aggregate import LineAggregator, aggregate_lines
+from export import write_export
+from instrument import stage
+from job_catalog import get_catalog
+from md_table import pipe_table
+from overtime import OvertimeAggregator, OvertimeReport, combine_overtime, summary_markdown
+
+# job rows on one printed phase sheet
+PAGE_ROWS = 23
+
+# job:      8h standard time a day per export, the original phase sheet rule
+# combined: 8h a day / 40h a week across all jobs, see overtime.combine_overtime
+OVERTIME_RULES: tuple[str, ...] = ("job", "combined")
+OVERTIME_RULE = "job"
+
+HEADERS: list[str] = [
+    "description",
+    "eqip. no.",
+    "phase code",
+    "SAT ST",
+    "sat ot",
+    "SUN ST",
+    "sun ot",
+    "MON ST",
+    "mon ot",
+    "TUE ST",
+    "tue ot",
+    "WED ST",
+    "wed ot",
+    "THU ST",
+    "thu ot",
+    "FRI ST",
+    "fri ot",
+    "TOT ST",
+    "tot ot",
+]
+
+# fixed rows at the bottom of the form: index -> (description, phase code),
+# rows with a phase code get the default eqip. no. of the job catalog
+FIXED_ROWS: dict[str, tuple[str, str]] = {
+    "PTO": ("PTO", "10.010.0023"),
+    "Holiday": ("Holiday", "10.010.0023"),
+    "Jury": ("Jury Duty", "10.010.0023"),
+    "Bereavement": ("Bereavement", "10.010.0023"),
+    "Sick": ("*Sick Reserve (Salaried)", ""),
+}
+
+
+def set_overtime_rule(rule: str) -> None:
+    """
+    Choose how standard and over time are split on the phase sheet.
+
+    Args:
+        rule (str): One of OVERTIME_RULES.
+
+    Raises:
+        ValueError: Unknown rule.
+    """
+    global OVERTIME_RULE
+    if rule not in OVERTIME_RULES:
+        raise ValueError(f"unknown overtime rule {rule!r}, expected one of {', '.join(OVERTIME_RULES)}")
+    OVERTIME_RULE = rule
+
+
+def phase_lines(work_list: Sequence[workTime.WorkTime]) -> list[dict[str, int | str | decimal.Decimal]]:
+    """
+    The job lines of the phase sheet under the current OVERTIME_RULE, without rendering or writing them.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+
+    Returns:
+        list[dict[str, int | str | decimal.Decimal]]: One line per phase code, keyed by HEADERS.
+    """
+    if OVERTIME_RULE == "combined":
+        return combine_overtime(work_list=work_list).lines
+    return aggregate_lines(work_list=work_list)
+
+
+def line_aggregator() -> LineAggregator | OvertimeAggregator:
+    """
+    Empty aggregator of the current OVERTIME_RULE, for pipelines that hand over one block at a time.
+
+    Returns:
+        LineAggregator | OvertimeAggregator: Fill with add_job/add_block, then render with render_aggregator.
+    """
+    return OvertimeAggregator() if OVERTIME_RULE == "combined" else LineAggregator()
+
+
+def render_aggregator(
+    aggregator: LineAggregator | OvertimeAggregator, paginate: bool = False, export_suffix: str = ""
+) -> str:
+    """
+    Render the phase sheet of a filled line_aggregator, the combined rule also writes hours_summary.md.
+
+    Args:
+        aggregator (LineAggregator | OvertimeAggregator): From line_aggregator.
+        paginate (bool, optional): See process_work_times. Defaults to False.
+        export_suffix (str, optional): See process_work_times. Defaults to "".
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    if isinstance(aggregator, OvertimeAggregator):
+        report: OvertimeReport = aggregator.report()
+        write_export(file_name=f"hours_summary{export_suffix}.md", md=summary_markdown(report=report))
+        return render_phase_sheet(lines=report.lines, paginate=paginate, export_suffix=export_suffix)
+    return render_phase_sheet(lines=aggregator.lines(), paginate=paginate, export_suffix=export_suffix)
+
+
+def process_work_times(work_list: Sequence[workTime.WorkTime], paginate: bool = False, export_suffix: str = "") -> str:
+    """
+    Build the phase sheet of all jobs and write it to ./envHidden/export/phase_sheet.md if it changed.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+        paginate (bool, optional): Split the jobs into printed forms of PAGE_ROWS rows,
+            each with its own fixed rows and totals. Defaults to False, a single sheet
+            that grows past PAGE_ROWS rows when needed.
+        export_suffix (str, optional): Appended to the export file name, e.g. "_2025-03-01". Defaults to "".
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    if OVERTIME_RULE == "combined":
+        with stage("phase_sheet.overtime"):
+            report: OvertimeReport = combine_overtime(work_list=work_list)
+        write_export(file_name=f"hours_summary{export_suffix}.md", md=summary_markdown(report=report))
+        return render_phase_sheet(lines=report.lines, paginate=paginate, export_suffix=export_suffix)
+
+    with stage("phase_sheet.aggregate"):
+        lines: list[dict[str, int | str | decimal.Decimal]] = aggregate_lines(work_list=work_list)
+    return render_phase_sheet(lines=lines, paginate=paginate, export_suffix=export_suffix)
+
+
+def render_phase_sheet(
+    lines: list[dict[str, int | str | decimal.Decimal]], paginate: bool = False, export_suffix: str = ""
+) -> str:
+    """
+    Render already aggregated job lines and write ./envHidden/export/phase_sheet.md if it changed.
+
+    Args:
+        lines (list[dict[str, int | str | decimal.Decimal]]): Lines from aggregate_lines, jobs without hours are skipped.
+        paginate (bool, optional): See process_work_times. Defaults to False.
+        export_suffix (str, optional): See process_work_times. Defaults to "".
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    lines = [line for line in lines if line["TOT ST"] or line["tot ot"]]
+
+    with stage("phase_sheet.render"):
+        if not paginate:
+            md: str = build_phase_sheet(lines=lines, row_count=max(PAGE_ROWS, len(lines)))
+        else:
+            pages: list[str] = []
+            for first in range(0, max(len(lines), 1), PAGE_ROWS):
+                pages.append(build_phase_sheet(lines=lines[first:first + PAGE_ROWS], row_count=PAGE_ROWS, first_row=first))
+            md = "\n\n".join(pages)
+
+    write_export(file_name=f"phase_sheet{export_suffix}.md", md=md)
+    return md
+
+
+def build_phase_sheet(lines: list[dict[str, int | str | decimal.Decimal]], row_count: int, first_row: int = 0) -> str:
+    """
+    Render one phase sheet form, the frame is built in one pass from the collected rows.
+
+    Args:
+        lines (list[dict[str, int | str | decimal.Decimal]]): Job rows from aggregate_lines.
+        row_count (int): Number of job slots on the form, unused slots are left blank.
+        first_row (int, optional): Row number of the first job slot. Defaults to 0.
+
+    Returns:
+        str: The form as markdown.
+    """
+    blank: list[str] = [""] * len(HEADERS)
+    numbers: slice = slice(3, len(HEADERS))
+
+    records: list[list[str | decimal.Decimal]] = [[line[header] for header in HEADERS] for line in lines]  # pyright: ignore
+    records += [blank] * (row_count - len(lines))
+    default_eqip_no: str = get_catalog().default_eqip_no
+    for description, phase_code in FIXED_ROWS.values():
+        records.append([description, default_eqip_no if phase_code else "", phase_code] + blank[numbers])
+
+    # one columnar pass for the sum line
+    total_line: list[str | decimal.Decimal] = ["TOTAL", "", ""]
+    for column in zip(*(record[numbers] for record in records[:len(lines)])):
+        total_line.append(functools.reduce(operator.add, column))
+    total_line += blank[len(total_line):]
+    records.append(total_line)
+
+    index: list[str | int] = list(range(first_row, first_row + row_count)) + list(FIXED_ROWS) + ["Total"]
+    return pipe_table(headers=HEADERS, rows=records, index=index)
@@ -0,0 +1,71 @@
+"""
+# @ Description: Runs the phase sheet and time table renderers serially, in threads or in processes
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Sequence
+
+import instrument
+import workTime
+from columnar import ColumnarStore
+from phase_code_process import process_work_times
+from run_settings import process_pool
+from table_process import proc_table
+
+# serial:  one after the other in this thread, no pool to start
+# thread:  two threads, only overlaps the export writes, the renderers hold the GIL
+# process: two processes, the jobs are sent as a columnar.ColumnarStore
+BACKENDS: tuple[str, ...] = ("serial", "thread", "process")
+DEFAULT_BACKEND = "serial"  # fastest in testing/benchmark.py at every size measured so far
+
+
+def _phase_sheet_from_store(store: ColumnarStore, paginate: bool) -> str:
+    return process_work_times(store.work_times(), paginate)
+
+
+def _time_tables_from_store(store: ColumnarStore) -> None:
+    proc_table(store.work_times())
+
+
+def render_all(work_list: Sequence[workTime.WorkTime], paginate: bool = False, backend: str = DEFAULT_BACKEND) -> str:
+    """
+    Render the phase sheet and the time tables with the chosen backend.
+
+    The process backend packs the jobs into a ColumnarStore first: a few typed
+    arrays pickle and unpickle far faster than the object graph, the workers
+    render from its read-only views.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+        paginate (bool, optional): Split the phase sheet into 23 row pages. Defaults to False.
+        backend (str, optional): One of BACKENDS. Defaults to DEFAULT_BACKEND.
+
+    Raises:
+        ValueError: Unknown backend.
+
+    Returns:
+        str: The phase sheet markdown.
+    """
+    if backend == "serial":
+        phase_sheet: str = process_work_times(work_list, paginate)
+        proc_table(work_list)
+        return phase_sheet
+
+    futures: list[Future] = []
+    if backend == "thread":
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures.append(executor.submit(process_work_times, work_list, paginate))
+            futures.append(executor.submit(proc_table, work_list))
+    elif backend == "process":
+        with instrument.stage("pack columnar"):
+            store: ColumnarStore = ColumnarStore.from_work_times(work_list=work_list)
+        with process_pool(max_workers=2) as executor:
+            futures.append(executor.submit(_phase_sheet_from_store, store, paginate))
+            futures.append(executor.submit(_time_tables_from_store, store))
+    else:
+        raise ValueError(f"unknown render backend {backend!r}, expected one of {', '.join(BACKENDS)}")
+
+    # result() raises the renderer's exception, if any
+    phase_sheet = futures[0].result()
+    futures[1].result()
+    return phase_sheet
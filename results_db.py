@@ -0,0 +1,168 @@
+"""
+# @ Description: Writes punches, day totals and phase sheet rows of a run into a sqlite database for later queries
+"""
+
+import datetime
+import decimal
+import sqlite3
+from typing import Iterator, Mapping, Sequence
+
+import workTime
+from helper_functions import as_of
+from job_catalog import Job, export_name, get_catalog
+from phase_code_process import HEADERS, phase_lines
+
+RESULTS_DB = r"envHidden/export/results.sqlite"
+
+# dates are ISO text, times seconds since midnight, durations seconds, money cents, phase sheet hours REAL (exact quarters)
+# job is the export header without its totals (job_catalog.export_name), description the one shown on the sheet
+# phase_sheet.week is the Saturday of a --weeks sheet, "" for the sheet of a whole run
+PHASE_COLUMNS: tuple[str, ...] = tuple(header.lower().replace(" ", "_").replace(".", "") for header in HEADERS)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS punches (
+    phase_code TEXT NOT NULL, job TEXT NOT NULL, description TEXT NOT NULL, date TEXT NOT NULL,
+    punch_in INTEGER NOT NULL, punch_out INTEGER NOT NULL, seconds INTEGER NOT NULL, cents INTEGER NOT NULL,
+    comment TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS punches_date ON punches (date);
+CREATE INDEX IF NOT EXISTS punches_phase_code_date ON punches (phase_code, date);
+
+CREATE TABLE IF NOT EXISTS day_totals (
+    phase_code TEXT NOT NULL, job TEXT NOT NULL, description TEXT NOT NULL, date TEXT NOT NULL,
+    seconds INTEGER NOT NULL, cents INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS day_totals_date ON day_totals (date);
+CREATE INDEX IF NOT EXISTS day_totals_phase_code_date ON day_totals (phase_code, date);
+
+CREATE TABLE IF NOT EXISTS phase_sheet (
+    as_of TEXT NOT NULL, week TEXT NOT NULL DEFAULT '', row INTEGER NOT NULL,
+    {", ".join(f"{column} {'TEXT' if index < 3 else 'REAL'}" for index, column in enumerate(PHASE_COLUMNS))}
+);
+CREATE INDEX IF NOT EXISTS phase_sheet_as_of ON phase_sheet (as_of);
+CREATE INDEX IF NOT EXISTS phase_sheet_phase_code_as_of ON phase_sheet (phase_code, as_of);
+"""
+
+# created after the migration, databases written before the week column get it added first
+WEEK_INDEX = "CREATE INDEX IF NOT EXISTS phase_sheet_week ON phase_sheet (week)"
+
+
+def _blocks(work_list: Sequence[workTime.WorkTime]) -> Iterator[tuple[str, Job, workTime.WorkBlock]]:
+    catalog = get_catalog()
+    for work in work_list:
+        job: Job = catalog.job(name=work.name)
+        for block in work.work_blocks:
+            yield export_name(name=work.name), job, block
+
+
+def _cell(value: int | str | decimal.Decimal | None) -> int | str | float | None:
+    # quarter hours are exact as floats
+    return float(value) if isinstance(value, decimal.Decimal) else value
+
+
+def _migrate(connection: sqlite3.Connection) -> None:
+    columns: set[str] = {column[1] for column in connection.execute("PRAGMA table_info(phase_sheet)")}
+    if "week" not in columns:
+        connection.execute("ALTER TABLE phase_sheet ADD COLUMN week TEXT NOT NULL DEFAULT ''")
+    connection.execute(WEEK_INDEX)
+
+
+def write_results(
+    work_list: Sequence[workTime.WorkTime],
+    db_path: str = RESULTS_DB,
+    weeks: Mapping[datetime.date, Sequence[workTime.WorkTime]] | None = None,
+) -> int:
+    """
+    Store the punches, day totals and phase sheet rows of a run, replacing what an earlier run stored for them.
+
+    Everything is written with executemany in one transaction: the day totals
+    and punches of every (phase code, export, date) in work_list are replaced.
+    Without weeks the phase sheet of the whole run replaces the one stored for
+    the as-of date of the run; with weeks (a --weeks run) every week gets the
+    rows of its own sheet, replacing the ones stored for that week start.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+        db_path (str, optional): Path of the results database, created when missing. Defaults to RESULTS_DB.
+        weeks (Mapping[datetime.date, Sequence[workTime.WorkTime]] | None, optional): Week start -> the jobs
+            rendered for that week, see weeks.split_by_week. Defaults to None.
+
+    Returns:
+        int: Number of punches written.
+    """
+    days: list[tuple[str, str, str, str, int, int]] = []
+    punches: list[tuple[str, str, str, str, int, int, int, int, str]] = []
+    for name, job, block in _blocks(work_list=work_list):
+        day: str = block.day.isoformat()
+        days.append((job.phase_code, name, job.description, day, block.final_line.seconds, block.final_line.cents))
+        punches.extend(
+            (job.phase_code, name, job.description, day, line.start, line.end, line.seconds, line.cents, line.comment)
+            for line in block.clock_times
+        )
+    keys: list[tuple[str, str, str]] = list(dict.fromkeys((phase_code, name, day) for phase_code, name, _, day, _, _ in days))
+
+    run_date: str = as_of().isoformat()
+    sheets: dict[str, Sequence[workTime.WorkTime]] = (
+        {"": work_list} if weeks is None else {week.isoformat(): jobs for week, jobs in weeks.items()}
+    )
+    sheet: list[tuple] = [
+        (run_date, week, row, *(_cell(value=line.get(header)) for header in HEADERS))
+        for week, jobs in sheets.items()
+        for row, line in enumerate(phase_lines(work_list=jobs))
+    ]
+
+    connection: sqlite3.Connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript(SCHEMA)
+        _migrate(connection=connection)
+        with connection:  # one transaction, rolled back on error
+            connection.executemany("DELETE FROM punches WHERE phase_code = ? AND date = ? AND job = ?", (
+                (phase_code, day, job) for phase_code, job, day in keys
+            ))
+            connection.executemany("DELETE FROM day_totals WHERE phase_code = ? AND date = ? AND job = ?", (
+                (phase_code, day, job) for phase_code, job, day in keys
+            ))
+            if weeks is None:
+                connection.execute("DELETE FROM phase_sheet WHERE as_of = ? AND week = ''", (run_date,))
+            else:
+                connection.executemany("DELETE FROM phase_sheet WHERE week = ?", ((week,) for week in sheets))
+            connection.executemany("INSERT INTO punches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", punches)
+            connection.executemany("INSERT INTO day_totals VALUES (?, ?, ?, ?, ?, ?)", days)
+            connection.executemany(
+                f"INSERT INTO phase_sheet (as_of, week, row, {', '.join(PHASE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(HEADERS) + 3))})",
+                sheet,
+            )
+    finally:
+        connection.close()
+    return len(punches)
+
+
+def day_totals(
+    db_path: str = RESULTS_DB,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+    phase_code: str | None = None,
+) -> list[tuple[str, str, str, int, int]]:
+    """
+    Stored day totals of a date range, one indexed range scan.
+
+    Args:
+        db_path (str, optional): Path of the results database. Defaults to RESULTS_DB.
+        since (datetime.date, optional): First day. Defaults to no limit.
+        until (datetime.date, optional): Last day. Defaults to no limit.
+        phase_code (str | None, optional): Only this phase code. Defaults to None, every job.
+
+    Returns:
+        list[tuple[str, str, str, int, int]]: (phase code, export name, date, seconds, cents) in date order.
+    """
+    query: str = "SELECT phase_code, job, date, seconds, cents FROM day_totals WHERE date BETWEEN ? AND ?"
+    parameters: list[str] = [since.isoformat(), until.isoformat()]
+    if phase_code is not None:
+        query += " AND phase_code = ?"
+        parameters.append(phase_code)
+    connection: sqlite3.Connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return connection.execute(query + " ORDER BY date, phase_code, job", parameters).fetchall()
+    finally:
+        connection.close()
@@ -0,0 +1,348 @@
+"""
+# @ Description: Daily per export totals kept between runs, year to date / monthly / per job reports without parsing
+"""
+
+import datetime
+import json
+import os
+from collections import defaultdict
+from typing import Callable, Sequence
+
+import phase_code_process
+import workTime
+from aggregate import MAX_ST_QUARTERS, quarters_to_hours, seconds_to_quarters
+from helper_functions import week_start
+from job_catalog import Job, export_name, get_catalog
+from md_table import pipe_table
+from overtime import allocate_day
+from workTime import cents_to_money
+
+ROLLUP_FILE = r"envHidden/cache/rollups.json"
+# bumped whenever the layout changes, older files are then rebuilt
+ROLLUP_VERSION = 2
+
+# rollups.json:
+# {
+#     "version": 2,
+#     "files": {"/abs/path/export.csv": [size, mtime_ns], ...},
+#     "exports": {
+#         "10.010.0023 Automation Engineer - Overhead": {"2025-03-03": [seconds, cents, first punch], ...}
+#     }
+# }
+
+# [seconds, cents, first punch] of one export on one date
+DayTotals = list[int]
+# [st quarters, ot quarters, seconds, cents]
+Totals = list[int]
+
+
+def period_start(day: datetime.date) -> datetime.date:
+    """
+    The report bucket of a date: its pay week, cut at the first of the month.
+
+    A week running over the end of a month is kept as two buckets so monthly
+    and year to date sums are exact.
+
+    Args:
+        day (datetime.date): The date of a block.
+
+    Returns:
+        datetime.date: The Saturday starting the week, or the first of the month when that is later.
+
+    Example:
+        >>> period_start(datetime.date(2025, 3, 4))
+        datetime.date(2025, 3, 1)
+        >>> period_start(datetime.date(2025, 3, 8))
+        datetime.date(2025, 3, 8)
+    """
+    return max(week_start(day=day), day.replace(day=1))
+
+
+def rollup_work(work: workTime.WorkTime) -> dict[datetime.date, DayTotals]:
+    """
+    Raw totals of one export per date, not rounded yet.
+
+    Rounding and the ST/OT split need the other exports of a date (same
+    phase code, or every job with the combined overtime rule), so they are
+    left to RollupStore reports.
+
+    Args:
+        work (workTime.WorkTime): The parsed export, every block counts.
+
+    Returns:
+        dict[datetime.date, DayTotals]: date -> [seconds, cents, first punch], in date order.
+    """
+    days: dict[datetime.date, DayTotals] = {}
+    for block in work.work_blocks:
+        first_punch: int = block.clock_times[0].start if block.clock_times else 0
+        totals: DayTotals | None = days.get(block.day)
+        if totals is None:
+            days[block.day] = [block.final_line.seconds, block.final_line.cents, first_punch]
+        else:
+            totals[0] += block.final_line.seconds
+            totals[1] += block.final_line.cents
+            totals[2] = min(totals[2], first_punch)
+    return dict(sorted(days.items()))
+
+
+class RollupStore:
+    """
+    rollup_work of every csv export, kept in ROLLUP_FILE between runs.
+
+    An export file is only rolled up again when its size or mtime changed, so
+    a run after new days were exported only parses the exports that grew.
+    Totals are stored per export name (the header without its running totals)
+    and date: rolling up an export replaces the dates of its name from its
+    first to its last date, so a moved, renamed or re-exported file is never
+    counted twice, while dates of older exports that left the folder stay in
+    the reports. Reports round and split the stored seconds with the active
+    overtime rule and never touch the csv files.
+    """
+
+    def __init__(self, rollup_file: str = ROLLUP_FILE) -> None:
+        self.rollup_file: str = os.path.normpath(rollup_file)
+        self.files: dict[str, tuple[int, int]] = {}  # absolute path -> (size, mtime_ns)
+        self.exports: dict[str, dict[datetime.date, DayTotals]] = {}  # export name -> date -> totals
+        self.changed: bool = False
+        self.updated: int = 0
+
+    @classmethod
+    def load(cls, rollup_file: str = ROLLUP_FILE) -> "RollupStore":
+        """
+        Read the rollups, a missing, unreadable or outdated file gives an empty store.
+
+        Args:
+            rollup_file (str, optional): Path of the store. Defaults to ROLLUP_FILE.
+
+        Returns:
+            RollupStore: The store.
+        """
+        store: RollupStore = cls(rollup_file=rollup_file)
+        try:
+            with open(file=store.rollup_file, mode="r", encoding="utf-8") as f:
+                config = json.load(f)
+            if config.get("version") == ROLLUP_VERSION:
+                store.files = {path: (int(size), int(mtime_ns)) for path, (size, mtime_ns) in config["files"].items()}
+                store.exports = {
+                    name: {datetime.date.fromisoformat(day): [int(value) for value in totals] for day, totals in days.items()}
+                    for name, days in config["exports"].items()
+                }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            store.files = {}
+            store.exports = {}
+        return store
+
+    def save(self) -> None:
+        """Write the store when an export was added or rolled up again since it was loaded."""
+        if not self.changed:
+            return
+        exports: dict[str, dict[str, DayTotals]] = {
+            name: {day.isoformat(): totals for day, totals in days.items()} for name, days in self.exports.items()
+        }
+        os.makedirs(os.path.dirname(self.rollup_file) or ".", exist_ok=True)
+        temp: str = self.rollup_file + ".tmp"
+        with open(file=temp, mode="w", encoding="utf-8") as f:
+            json.dump({"version": ROLLUP_VERSION, "files": self.files, "exports": exports}, f)
+        os.replace(temp, self.rollup_file)
+        self.changed = False
+
+    def is_current(self, csv_file: str) -> bool:
+        stat: os.stat_result = os.stat(csv_file)
+        return self.files.get(os.path.abspath(csv_file)) == (stat.st_size, stat.st_mtime_ns)
+
+    def add(self, csv_file: str, work: workTime.WorkTime) -> None:
+        """
+        Roll up an export, replacing what was stored for its name over its dates.
+
+        Args:
+            csv_file (str): Path to the csv export work was parsed from.
+            work (workTime.WorkTime): The whole export, not a date range of it.
+        """
+        stat: os.stat_result = os.stat(csv_file)
+        self.files[os.path.abspath(csv_file)] = (stat.st_size, stat.st_mtime_ns)
+        days: dict[datetime.date, DayTotals] = rollup_work(work=work)
+        name: str = export_name(name=work.name)
+        stored: dict[datetime.date, DayTotals] = self.exports.get(name, {})
+        if days:
+            first: datetime.date = next(iter(days))
+            last: datetime.date = next(reversed(days))
+            stored = {day: totals for day, totals in stored.items() if not first <= day <= last}
+        self.exports[name] = dict(sorted({**stored, **days}.items()))
+        self.changed = True
+        self.updated += 1
+
+    def update(
+        self,
+        csv_files: Sequence[str],
+        work_list: Sequence[workTime.WorkTime] | None = None,
+        parse: Callable[[str], workTime.WorkTime] | None = None,
+    ) -> None:
+        """
+        Bring the store in line with a folder of exports.
+
+        Exports that are new or changed are rolled up from work_list when given
+        (already parsed, same order as csv_files), otherwise parsed with parse.
+        The totals of exports not in csv_files are kept, so history stays in the
+        reports after old exports are moved out of the folder; only their file
+        signatures are dropped.
+
+        Args:
+            csv_files (Sequence[str]): Paths of the csv exports.
+            work_list (Sequence[workTime.WorkTime] | None, optional): The parsed exports. Defaults to None.
+            parse (Callable[[str], workTime.WorkTime] | None, optional): Parser for the stale exports
+                when work_list is not given. Defaults to None.
+        """
+        for position, csv_file in enumerate(csv_files):
+            if self.is_current(csv_file=csv_file):
+                continue
+            if work_list is not None:
+                self.add(csv_file=csv_file, work=work_list[position])
+            elif parse is not None:
+                self.add(csv_file=csv_file, work=parse(csv_file))
+        gone: set[str] = self.files.keys() - {os.path.abspath(csv_file) for csv_file in csv_files}
+        for path in gone:
+            del self.files[path]
+        self.changed = self.changed or bool(gone)
+
+    def row_days(self) -> dict[str, tuple[Job, dict[datetime.date, Totals]]]:
+        """
+        Round and split the stored seconds per phase code and date with the active overtime rule.
+
+        The seconds of every export of a phase code are summed per date before
+        rounding, like aggregate.merge_lines. With the "combined" rule the
+        dates are split across all phase codes by overtime.allocate_day, in the
+        order they were worked, against the 40 hour week.
+
+        Returns:
+            dict[str, tuple[Job, dict[datetime.date, Totals]]]: Phase code (or export name) ->
+                (job, date -> [st, ot, seconds, cents]), in order of first appearance.
+        """
+        catalog = get_catalog()
+        merged: dict[str, tuple[Job, dict[datetime.date, DayTotals]]] = {}
+        for name, days in self.exports.items():
+            job: Job = catalog.job(name=name)
+            row: dict[datetime.date, DayTotals] = merged.setdefault(job.phase_code or name, (job, {}))[1]
+            for day, (seconds, cents, first_punch) in days.items():
+                totals: DayTotals | None = row.get(day)
+                if totals is None:
+                    row[day] = [seconds, cents, first_punch]
+                else:
+                    totals[0] += seconds
+                    totals[1] += cents
+                    totals[2] = min(totals[2], first_punch)
+
+        split: dict[str, tuple[Job, dict[datetime.date, Totals]]] = {key: (job, {}) for key, (job, _) in merged.items()}
+        if phase_code_process.OVERTIME_RULE == "combined":
+            dates: defaultdict[datetime.date, list[tuple[int, int, str]]] = defaultdict(list)
+            for number, (key, (_, row)) in enumerate(merged.items()):
+                for day, (_, _, first_punch) in row.items():
+                    dates[day].append((first_punch, number, key))
+            week_st: defaultdict[datetime.date, int] = defaultdict(int)
+            for day in sorted(dates):
+                worked: list[tuple[int, int, str]] = sorted(dates[day])
+                week: datetime.date = week_start(day=day)
+                shares: list[tuple[int, int, int]] = allocate_day(
+                    row_seconds=[merged[key][1][day][0] for _, _, key in worked], week_st=week_st[week]
+                )
+                for (_, _, key), (st, ot, _) in zip(worked, shares):
+                    seconds, cents, _ = merged[key][1][day]
+                    split[key][1][day] = [st, ot, seconds, cents]
+                    week_st[week] += st
+        else:
+            for key, (_, row) in merged.items():
+                for day, (seconds, cents, _) in row.items():
+                    q: int = seconds_to_quarters(seconds=seconds)
+                    st: int = min(q, MAX_ST_QUARTERS)
+                    split[key][1][day] = [st, q - st, seconds, cents]
+        return split
+
+    def totals(
+        self, since: datetime.date = datetime.date.min, until: datetime.date = datetime.date.max
+    ) -> dict[str, tuple[Job, Totals]]:
+        """
+        Sum the dates between since and until per phase code.
+
+        Args:
+            since (datetime.date, optional): First date to count. Defaults to no limit.
+            until (datetime.date, optional): Last date to count. Defaults to no limit.
+
+        Returns:
+            dict[str, tuple[Job, Totals]]: Phase code (or export name) -> (job, [st, ot, seconds, cents]),
+                in order of first appearance. Phase codes without dates in the range are left out.
+        """
+        rows: dict[str, tuple[Job, Totals]] = {}
+        for key, (job, days) in self.row_days().items():
+            for day, totals in days.items():
+                if not since <= day <= until:
+                    continue
+                row: Totals = rows.setdefault(key, (job, [0, 0, 0, 0]))[1]
+                for index, value in enumerate(totals):
+                    row[index] += value
+        return rows
+
+    def job_periods(self, phase_code: str) -> dict[datetime.date, Totals]:
+        """
+        Totals of one phase code per period_start bucket.
+
+        Args:
+            phase_code (str): Phase code, or the export name of an export without one.
+
+        Returns:
+            dict[datetime.date, Totals]: period_start -> [st, ot, seconds, cents], in date order.
+        """
+        periods: defaultdict[datetime.date, Totals] = defaultdict(lambda: [0, 0, 0, 0])
+        _, days = self.row_days().get(phase_code, (None, {}))
+        for day, totals in days.items():
+            period: Totals = periods[period_start(day=day)]
+            for index, value in enumerate(totals):
+                period[index] += value
+        return dict(sorted(periods.items()))
+
+
+TOTALS_HEADERS: list[str] = ["ST", "OT", "hours", "amount"]
+
+
+def _totals_row(totals: Totals) -> list[str]:
+    # two decimals everywhere, the tables pass disable_numparse so pipe_table keeps the text as is
+    st, ot, _, cents = totals
+    return [
+        f"{quarters_to_hours(quarters=st):,.2f}",
+        f"{quarters_to_hours(quarters=ot):,.2f}",
+        f"{quarters_to_hours(quarters=st + ot):,.2f}",
+        f"{cents_to_money(cents=cents):,.2f}",
+    ]
+
+
+def totals_markdown(rows: dict[str, tuple[Job, Totals]]) -> str:
+    """
+    Markdown table of RollupStore.totals, one row per phase code.
+
+    Args:
+        rows (dict[str, tuple[Job, Totals]]): From RollupStore.totals.
+
+    Returns:
+        str: The table.
+    """
+    return pipe_table(
+        headers=["description", "phase code"] + TOTALS_HEADERS,
+        rows=[[job.description, job.phase_code] + _totals_row(totals=totals) for job, totals in rows.values()],
+        disable_numparse=True,
+    )
+
+
+def periods_markdown(periods: dict[datetime.date, Totals]) -> str:
+    """
+    Markdown table of RollupStore.job_periods, one row per bucket.
+
+    Args:
+        periods (dict[datetime.date, Totals]): From RollupStore.job_periods.
+
+    Returns:
+        str: The table.
+    """
+    return pipe_table(
+        headers=TOTALS_HEADERS,
+        rows=[_totals_row(totals=totals) for totals in periods.values()],
+        index=[day.isoformat() for day in periods],
+        disable_numparse=True,
+    )
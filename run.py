@@ -6,17 +6,25 @@
 # @ Description: Processes data from WorkTime
 """
 
-import concurrent.futures
+import argparse
+import cProfile
+import datetime
 import os
-import copy
-
-import concurrent
-from concurrent.futures import ThreadPoolExecutor
 
+import helper_functions
+import instrument
+import job_catalog
+import md_table
+import phase_code_process
 import workTime
+from export import write_export
 from helper_functions import process_csv_file
-from table_process import proc_table
-from phase_code_process import process_work_times
+from ingest import ingest_csv_files, list_csv_files
+from parse_cache import ParseCache
+from render_backend import BACKENDS, DEFAULT_BACKEND, render_all
+
+# the other pipelines are imported in their branches, asyncio, sqlite3 and multiprocessing
+# would otherwise double the start up time of every run (see testing/import_budget.py)
 
 
 # pylint: disable=C0301
@@ -64,31 +72,319 @@ from phase_code_process import process_work_times
 # '''
 
 
-def process_time_card() -> None:
-    work_times: list[workTime.WorkTime] = list[workTime.WorkTime]()
+def process_time_card(
+    workers: int = 1,
+    paginate: bool = False,
+    use_cache: bool = True,
+    sqlite_db: str | None = None,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+    by_week: bool = False,
+    stream: bool = False,
+    scan: bool = False,
+    use_asyncio: bool = False,
+    render_backend: str = DEFAULT_BACKEND,
+    results_db: str | None = None,
+) -> None:
+    # main rejects --stream / --asyncio next to the flags these two pipelines cannot honour
+    if stream:
+        # blocks go straight into the aggregators, nothing is cached or kept
+        from stream import stream_time_card
+
+        with instrument.stage("list files"):
+            stream_files: list[str] = list_csv_files()
+        stream_time_card(csv_files=stream_files, paginate=paginate, since=since, until=until)
+        return
+    if use_asyncio:
+        # reads, parsing and the two renderers overlap instead of running one phase after the other
+        from async_pipeline import run_pipeline
+
+        with instrument.stage("list files"):
+            async_files: list[str] = list_csv_files()
+        async_cache: ParseCache | None = ParseCache() if use_cache else None
+        print(run_pipeline(
+            csv_files=async_files, workers=workers, cache=async_cache, paginate=paginate, since=since, until=until
+        ))
+        if async_cache is not None:
+            print(f"parse cache: {async_cache.hits} hits, {async_cache.misses} misses")
+        return
+
+    work_times: list[workTime.WorkTime]
+    if sqlite_db is not None:
+        # straight from the WorktimeTracker backup, no csv exports needed
+        from sqlite_ingest import TRACKER_DB, read_tracker_db
+
+        with instrument.stage("read sqlite"):
+            work_times = read_tracker_db(db_path=sqlite_db or TRACKER_DB, start=since, end=until)
+    else:
+        with instrument.stage("list files"):
+            csv_files: list[str] = list_csv_files()
+        instrument.count("files", len(csv_files))
+        if scan:
+            # only the blocks between since and until are decoded, the cache holds whole files so it is not used
+            from mmap_scan import scan_csv_files
+
+            with instrument.stage("scan"):
+                work_times = scan_csv_files(csv_files=csv_files, since=since, until=until, workers=workers)
+        else:
+            cache: ParseCache | None = ParseCache() if use_cache else None
+            in_range: bool = not by_week and (since != datetime.date.min or until != datetime.date.max)
+            if in_range:
+                # the sidecar index skips files outside the range and starts partial files at their first block in it
+                from file_index import FileIndex, read_range
+
+                file_index: FileIndex = FileIndex.load()
+                with instrument.stage("parse"):
+                    work_times = read_range(
+                        csv_files=csv_files, since=since, until=until, file_index=file_index, workers=workers, cache=cache
+                    )
+                file_index.save()
+                instrument.count("files indexed", file_index.scanned)
+            else:
+                with instrument.stage("parse"):
+                    work_times = ingest_csv_files(csv_files=csv_files, workers=workers, cache=cache)
+            if cache is not None:
+                print(f"parse cache: {cache.hits} hits, {cache.misses} misses")
+            if in_range:
+                # files parsed whole may still hold blocks outside the range, two bisects per job drop them
+                from timesheet_index import TimesheetIndex
+
+                with instrument.stage("index"):
+                    work_times = TimesheetIndex(work_list=work_times).work_times(start=since, end=until)
+
+    if instrument.ENABLED:
+        instrument.count("jobs", len(work_times))
+        instrument.count("blocks", sum(len(work.work_blocks) for work in work_times))
+        instrument.count("clock lines", sum(len(b.clock_times) for work in work_times for b in work.work_blocks))
+
+    # both renderers only read the model, share one frozen view instead of copying it per renderer
+    with instrument.stage("freeze"):
+        frozen_work_times: tuple[workTime.WorkTime, ...] = workTime.freeze(work_list=work_times)
+
+    if by_week:
+        from weeks import render_weeks
+
+        with instrument.stage("render weeks"):
+            weeks = render_weeks(work_list=frozen_work_times, since=since, until=until, workers=workers, paginate=paginate)
+        print(f"rendered {len(weeks)} weeks: {', '.join(week.isoformat() for week in weeks)}")
+    else:
+        with instrument.stage("render"):
+            print(render_all(work_list=frozen_work_times, paginate=paginate, backend=render_backend))
+
+    if results_db is not None:
+        from results_db import RESULTS_DB, write_results
+
+        results_db = results_db or RESULTS_DB
+        with instrument.stage("results db"):
+            week_jobs: dict[datetime.date, list[workTime.WorkTime]] | None = None
+            if by_week:
+                # one phase sheet per rendered week, like the *_YYYY-MM-DD.md exports
+                from weeks import split_by_week
+
+                week_jobs = split_by_week(work_list=frozen_work_times, since=since, until=until)
+            punches: int = write_results(work_list=frozen_work_times, db_path=results_db, weeks=week_jobs)
+        print(f"results db: {punches} punches written to {results_db}")
+
 
-    folder_path = r"envHidden/data/to_process"
-    csv_files: list[str] = []
-    for f in os.listdir(folder_path):
-        if f.endswith(".csv"):
-            path: str = os.path.normpath(os.path.join(folder_path, f))
-            path: str = os.path.abspath(path)
-            csv_files.append(path)
-    for csv_file in csv_files:
-        work: workTime.WorkTime = process_csv_file(csv_file)
-        work_times.append(work)
+def process_rollups(
+    year: int | None = None, month: datetime.date | None = None, phase_code: str | None = None, use_cache: bool = True
+) -> None:
+    """
+    Print and export reports from the weekly rollups, only new or changed exports are parsed.
 
-    futures: list[concurrent.futures.Future] = []
-    with ThreadPoolExecutor() as executor:
-        futures.append(executor.submit(process_work_times, copy.deepcopy(work_times)))
-        futures.append(executor.submit(proc_table, copy.deepcopy(work_times)))
+    Args:
+        year (int | None, optional): Year to date totals per phase code of this year. Defaults to None.
+        month (datetime.date | None, optional): Totals per phase code of the month of this date. Defaults to None.
+        phase_code (str | None, optional): Weekly totals of this phase code. Defaults to None.
+        use_cache (bool, optional): Use the parse cache for the exports that changed. Defaults to True.
+    """
+    from rollups import RollupStore, periods_markdown, totals_markdown
 
-    for future in futures:
-        print(future.result())
+    cache: ParseCache | None = ParseCache() if use_cache else None
+    with instrument.stage("rollups"):
+        rollup_store: RollupStore = RollupStore.load()
+        rollup_store.update(csv_files=list_csv_files(), parse=lambda csv_file: process_csv_file(csv_file, cache))
+        rollup_store.save()
+    print(f"rollups: {rollup_store.updated} exports updated, {len(rollup_store.exports)} total")
+
+    if year is not None:
+        first: datetime.date = datetime.date(year=year, month=1, day=1)
+        last: datetime.date = min(helper_functions.as_of(), datetime.date(year=year, month=12, day=31))
+        md: str = totals_markdown(rows=rollup_store.totals(since=first, until=last))
+        write_export(file_name=f"ytd_{year}.md", md=md)
+        print(md)
+    if month is not None:
+        first = month.replace(day=1)
+        last = (first + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+        md = totals_markdown(rows=rollup_store.totals(since=first, until=last))
+        write_export(file_name=f"month_{first:%Y-%m}.md", md=md)
+        print(md)
+    if phase_code is not None:
+        md = periods_markdown(periods=rollup_store.job_periods(phase_code=phase_code))
+        write_export(file_name=f"job_{phase_code}.md", md=md)
+        print(md)
+
+
+def reject_ignored_flags(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """
+    Stop with a usage error when a flag would be ignored by the pipeline the other flags pick.
+
+    --stream and --asyncio only read the csv exports whole and render the
+    one phase sheet and time tables; --render only applies to the batch
+    renderer.
+
+    Args:
+        parser (argparse.ArgumentParser): The run.py parser, parser.error exits.
+        args (argparse.Namespace): Its parsed arguments.
+    """
+    other_flags: dict[str, bool] = {
+        "--sqlite": args.sqlite is not None,
+        "--weeks": args.weeks,
+        "--results-db": args.results_db is not None,
+        "--mmap": args.mmap,
+        "--asyncio": args.asyncio,
+    }
+    for flag, used in (("--stream", args.stream), ("--asyncio", args.asyncio)):
+        if not used:
+            continue
+        for other, other_used in other_flags.items():
+            if other_used and other != flag:
+                parser.error(f"{flag} cannot be combined with {other}")
+
+    if args.render != DEFAULT_BACKEND:
+        modes: dict[str, bool] = {
+            "--stream": args.stream,
+            "--asyncio": args.asyncio,
+            "--weeks": args.weeks,
+            "--watch": args.watch is not None,
+            "--ytd/--month/--job-weeks": args.ytd is not None or args.month is not None or args.job_weeks is not None,
+        }
+        for mode, used in modes.items():
+            if used:
+                parser.error(f"--render only applies to the batch phase sheet and time tables, not to {mode}")
+
+
+def parse_month(month: str) -> datetime.date:
+    return datetime.date.fromisoformat(f"{month}-01")
 
 
 def main() -> None:
-    process_time_card()
+    parser = argparse.ArgumentParser(description="Builds the phase sheet and time tables from the WorkTime exports.")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="processes used to parse the csv exports and render --weeks, 0 for one per cpu (default: 1)")
+    parser.add_argument("--paginate", action="store_true",
+                        help="split the phase sheet into printed forms of 23 job rows")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="parse every csv export again instead of using envHidden/cache/parse")
+    # "" stands for the default path, filled in where the sqlite modules are imported
+    parser.add_argument("--sqlite", nargs="?", const="", default=None, metavar="DB",
+                        help="read punches from the WorktimeTracker backup instead of the csv exports"
+                             " (default: envHidden/data/WorktimeTrackerBak/WorktimeTracker.sqlite)")
+    parser.add_argument("--results-db", nargs="?", const="", default=None, metavar="DB",
+                        help="also store punches, day totals and phase sheet rows in a sqlite database"
+                             " (default: envHidden/export/results.sqlite)")
+    parser.add_argument("--since", type=datetime.date.fromisoformat, default=datetime.date.min, metavar="YYYY-MM-DD",
+                        help="first day to read from the sqlite backup or the csv exports, or render with --weeks")
+    parser.add_argument("--until", type=datetime.date.fromisoformat, default=datetime.date.max, metavar="YYYY-MM-DD",
+                        help="last day to read from the sqlite backup or --mmap, or render with --weeks")
+    parser.add_argument("--as-of", type=datetime.date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="date the run treats as today for the DAYS_AGO report window (default: today, read once)")
+    parser.add_argument("--ytd", nargs="?", type=int, const=0, default=None, metavar="YEAR",
+                        help="year to date hours and amount per phase code from the weekly rollups (default: as-of year)")
+    parser.add_argument("--month", type=parse_month, default=None, metavar="YYYY-MM",
+                        help="hours and amount per phase code of a month from the weekly rollups")
+    parser.add_argument("--job-weeks", default=None, metavar="PHASE_CODE",
+                        help="weekly hours and amount of one phase code from the weekly rollups")
+    parser.add_argument("--watch", nargs="?", type=float, const=1.0, default=None, metavar="SECONDS",
+                        help="keep running and re-render when a csv export is added or changed (poll interval, default: 1)")
+    parser.add_argument("--weeks", action="store_true",
+                        help="render one phase sheet and time table per pay week (Sat-Fri) into *_YYYY-MM-DD.md exports")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory map the csv exports and only decode the blocks between --since and --until (no cache)")
+    parser.add_argument("--asyncio", action="store_true",
+                        help="overlap reading, parsing (-w processes) and rendering/writing of the exports with asyncio"
+                             " (not with --sqlite, --weeks, --results-db or --mmap)")
+    parser.add_argument("--render", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"how the phase sheet and time tables are rendered side by side, batch runs only (default: {DEFAULT_BACKEND})")
+    parser.add_argument("--stream", action="store_true",
+                        help="aggregate the csv exports block by block without keeping them in memory"
+                             " (no cache; not with --sqlite, --weeks, --results-db, --mmap or --asyncio)")
+    parser.add_argument("--catalog", default=None, metavar="JSON",
+                        help=f"job catalog with the description and eqip. no. of each phase code (default: {job_catalog.CATALOG_FILE} if it exists)")
+    parser.add_argument("--overtime", choices=phase_code_process.OVERTIME_RULES, default=phase_code_process.OVERTIME_RULE,
+                        help="job: 8h standard time a day per export; combined: 8h a day and 40h a week across all jobs,"
+                             " also writes hours_summary.md (default: %(default)s)")
+    parser.add_argument("--pandas", action="store_true",
+                        help="render the markdown with pandas.DataFrame.to_markdown instead of the built in renderer (needs pandas and tabulate)")
+    parser.add_argument("--profile", nargs="?", const="profile", default=None, metavar="PREFIX",
+                        help="print stage timings and write PREFIX.prof (cProfile) and PREFIX.json (default: profile)")
+    args: argparse.Namespace = parser.parse_args()
+    reject_ignored_flags(parser=parser, args=args)
+
+    # every date filter of the run compares against the same day, even across midnight
+    helper_functions.set_as_of(day=args.as_of or datetime.date.today())
+
+    if args.pandas:
+        md_table.set_backend(backend="pandas")
+    phase_code_process.set_overtime_rule(rule=args.overtime)
+    if args.catalog is not None:
+        try:
+            job_catalog.load_catalog(json_file=args.catalog)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    if args.sqlite is not None:
+        from sqlite_ingest import TRACKER_DB
+
+        args.sqlite = args.sqlite or TRACKER_DB
+        if not os.path.isfile(args.sqlite):
+            parser.error(f"--sqlite: no WorktimeTracker backup at {args.sqlite}")
+
+    if args.ytd is not None or args.month is not None or args.job_weeks is not None:
+        year: int | None = args.ytd
+        if year == 0:
+            year = helper_functions.as_of().year
+        process_rollups(
+            year=year,
+            month=args.month,
+            phase_code=args.job_weeks,
+            use_cache=not args.no_cache,
+        )
+        return
+
+    if args.watch is not None:
+        from watch import FolderWatcher
+
+        FolderWatcher(paginate=args.paginate, as_of=args.as_of).run(interval=args.watch)
+        return
+
+    profiler: cProfile.Profile | None = None
+    if args.profile is not None:
+        instrument.enable()
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    process_time_card(
+        workers=args.workers,
+        paginate=args.paginate,
+        use_cache=not args.no_cache,
+        sqlite_db=args.sqlite,
+        since=args.since,
+        until=args.until,
+        by_week=args.weeks,
+        stream=args.stream,
+        scan=args.mmap,
+        use_asyncio=args.asyncio,
+        render_backend=args.render,
+        results_db=args.results_db,
+    )
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(f"{args.profile}.prof")
+        instrument.write_summary(json_file=f"{args.profile}.json")
+        print()
+        instrument.print_summary()
+        print(f"wrote {args.profile}.prof and {args.profile}.json")
     return
 
 
@@ -0,0 +1,85 @@
+"""
+# @ Description: Snapshot of the run wide settings, re-applied in every worker process of a pool
+"""
+
+import datetime
+from concurrent.futures import Executor
+from typing import Any
+
+import helper_functions
+import job_catalog
+import md_table
+import phase_code_process
+
+
+class RunSettings:
+    """
+    The module globals run.py sets from its flags, the ones renderers and parsers read.
+
+    A worker started with "spawn" (Windows, macOS) imports the modules fresh and
+    would see their defaults, so pools get a snapshot to apply first.
+    """
+    __slots__ = ("overtime_rule", "catalog", "md_backend", "as_of", "days_ago")
+
+    def __init__(
+        self,
+        overtime_rule: str,
+        catalog: job_catalog.JobCatalog,
+        md_backend: str,
+        as_of: datetime.date,
+        days_ago: bool,
+    ) -> None:
+        self.overtime_rule: str = overtime_rule
+        self.catalog: job_catalog.JobCatalog = catalog
+        self.md_backend: str = md_backend
+        self.as_of: datetime.date = as_of
+        self.days_ago: bool = days_ago
+
+
+def snapshot_settings() -> RunSettings:
+    """
+    Take the settings of this process.
+
+    Returns:
+        RunSettings: The current settings, as_of resolved so workers agree on the date even past midnight.
+    """
+    return RunSettings(
+        overtime_rule=phase_code_process.OVERTIME_RULE,
+        catalog=job_catalog.get_catalog(),
+        md_backend=md_table.BACKEND,
+        as_of=helper_functions.as_of(),
+        days_ago=helper_functions.DAYS_AGO,
+    )
+
+
+def apply_settings(settings: RunSettings) -> None:
+    """
+    Make settings the ones of this process, the initializer of process_pool.
+
+    Args:
+        settings (RunSettings): From snapshot_settings.
+    """
+    phase_code_process.set_overtime_rule(rule=settings.overtime_rule)
+    job_catalog.set_catalog(catalog=settings.catalog)
+    md_table.set_backend(backend=settings.md_backend)
+    helper_functions.set_as_of(day=settings.as_of)
+    helper_functions.DAYS_AGO = settings.days_ago
+
+
+def process_pool(max_workers: int | None = None, mp_context: Any = None) -> Executor:
+    """
+    A ProcessPoolExecutor whose workers run with the settings of this process.
+
+    Args:
+        max_workers (int | None, optional): Worker processes. Defaults to None, one per cpu.
+        mp_context (Any, optional): multiprocessing context, e.g. get_context("spawn"). Defaults to None, the platform default.
+
+    Returns:
+        Executor: The pool, use it as a context manager.
+    """
+    # imported here, multiprocessing is most of the start up time of run.py otherwise
+    from concurrent.futures import ProcessPoolExecutor
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context, initializer=apply_settings, initargs=(snapshot_settings(),)
+    )
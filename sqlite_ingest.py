@@ -0,0 +1,183 @@
+"""
+# @ Description: Reads punches straight from a WorktimeTracker sqlite backup
+"""
+
+import datetime
+import decimal
+import sqlite3
+
+import workTime
+
+TRACKER_DB = r"envHidden/data/WorktimeTrackerBak/WorktimeTracker.sqlite"
+
+# WorktimeTracker is a Core Data app, timestamps are seconds since 2001-01-01 UTC
+CORE_DATA_EPOCH = datetime.datetime(2001, 1, 1, tzinfo=datetime.timezone.utc)
+FETCH_SIZE = 1024
+
+
+class TrackerSchema:
+    """
+    Table and column names of the punches in the backup.
+
+    The defaults follow the Core Data naming of the WorktimeTracker backup,
+    pass a different schema if the app names them differently.
+    """
+
+    def __init__(
+        self,
+        job_table: str = "ZJOB",
+        job_id: str = "Z_PK",
+        job_name: str = "ZNAME",
+        punch_table: str = "ZWORKTIME",
+        punch_job: str = "ZJOB",
+        punch_start: str = "ZSTART",
+        punch_end: str = "ZEND",
+        punch_amount: str = "ZAMOUNT",
+        punch_note: str = "ZNOTE",
+    ) -> None:
+        self.job_table: str = job_table
+        self.job_id: str = job_id
+        self.job_name: str = job_name
+        self.punch_table: str = punch_table
+        self.punch_job: str = punch_job
+        self.punch_start: str = punch_start
+        self.punch_end: str = punch_end
+        self.punch_amount: str = punch_amount
+        self.punch_note: str = punch_note
+
+    def punch_query(self) -> str:
+        # one range scan on the start column, rows come back grouped by job key and in time order
+        return (
+            f"SELECT p.{self.punch_job}, j.{self.job_name}, "
+            f"p.{self.punch_start}, p.{self.punch_end}, p.{self.punch_amount}, p.{self.punch_note} "
+            f"FROM {self.punch_table} AS p JOIN {self.job_table} AS j ON j.{self.job_id} = p.{self.punch_job} "
+            f"WHERE p.{self.punch_start} >= ? AND p.{self.punch_start} < ? "
+            f"ORDER BY p.{self.punch_job}, p.{self.punch_start}"
+        )
+
+
+def to_core_data(day: datetime.date) -> float:
+    """
+    Core Data timestamp of local midnight of a date.
+
+    Args:
+        day (datetime.date): The date.
+
+    Returns:
+        float: Seconds since 2001-01-01 UTC.
+    """
+    midnight: datetime.datetime = datetime.datetime.combine(day, datetime.time()).astimezone()
+    return (midnight - CORE_DATA_EPOCH).total_seconds()
+
+
+def from_core_data(timestamp: float) -> datetime.datetime:
+    """
+    Convert a Core Data timestamp to a naive local datetime, the way the csv export shows it.
+
+    Args:
+        timestamp (float): Seconds since 2001-01-01 UTC.
+
+    Returns:
+        datetime.datetime: Local wall clock time.
+    """
+    # the export only has whole seconds
+    return (CORE_DATA_EPOCH + datetime.timedelta(seconds=round(timestamp))).astimezone().replace(tzinfo=None)
+
+
+def format_duration(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def close_block(work: workTime.WorkTime, block: workTime.WorkBlock, seconds: int, cents: int) -> None:
+    # "Total:     08:00:00               $498.00"
+    block.final_line.line = f"Total:     {format_duration(seconds=seconds)}               ${workTime.cents_to_money(cents=cents)}"
+    block.final_line.seconds = seconds
+    block.final_line.cents = cents
+    work.work_blocks.append(block)
+
+
+def read_tracker_db(
+    db_path: str = TRACKER_DB,
+    start: datetime.date = datetime.date.min,
+    end: datetime.date = datetime.date.max,
+    schema: TrackerSchema | None = None,
+) -> list[workTime.WorkTime]:
+    """
+    Load the punches of a date range from the WorktimeTracker backup into the workTime model.
+
+    Produces one WorkTime per job, like one csv export per job would.
+
+    Args:
+        db_path (str, optional): Path to the sqlite backup. Defaults to TRACKER_DB.
+        start (datetime.date, optional): First day to load. Defaults to no lower limit.
+        end (datetime.date, optional): Last day to load, inclusive. Defaults to no upper limit.
+        schema (TrackerSchema | None, optional): Table and column names. Defaults to TrackerSchema().
+
+    Returns:
+        list[workTime.WorkTime]: The jobs with punches in the range.
+    """
+    if schema is None:
+        schema = TrackerSchema()
+    low: float = to_core_data(day=start) if start > datetime.date.min else float("-inf")
+    high: float = to_core_data(day=end + datetime.timedelta(days=1)) if end < datetime.date.max else float("inf")
+
+    work_times: list[workTime.WorkTime] = []
+    work: workTime.WorkTime | None = None
+    block: workTime.WorkBlock = workTime.WorkBlock()
+    block_seconds: int = 0
+    block_cents: int = 0
+    job_seconds: int = 0
+    job_cents: int = 0
+    job_id: int | None = None
+    job_name: str = ""
+
+    def close_job() -> None:
+        if work is None:
+            return
+        close_block(work=work, block=block, seconds=block_seconds, cents=block_cents)
+        # same header as the csv export
+        work.name = f"{job_name}  total amount: ${workTime.cents_to_money(cents=job_cents)}  total time: {format_duration(seconds=job_seconds)}"
+        work_times.append(work)
+
+    # read only, the backup must never be touched
+    connection: sqlite3.Connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor: sqlite3.Cursor = connection.execute(schema.punch_query(), (low, high))
+        while rows := cursor.fetchmany(FETCH_SIZE):
+            for punch_job, name, start_stamp, end_stamp, amount, note in rows:
+                punch_in: datetime.datetime = from_core_data(timestamp=start_stamp)
+                punch_out: datetime.datetime = from_core_data(timestamp=end_stamp)
+
+                # split on the key, two jobs may share a name
+                if work is None or punch_job != job_id:
+                    close_job()
+                    work = workTime.WorkTime()
+                    job_id = punch_job
+                    job_name = name
+                    job_seconds, job_cents = 0, 0
+                    block = workTime.WorkBlock()
+                    block.day = punch_in.date()
+                    block_seconds, block_cents = 0, 0
+                elif punch_in.date() != block.day:
+                    close_block(work=work, block=block, seconds=block_seconds, cents=block_cents)
+                    block = workTime.WorkBlock()
+                    block.day = punch_in.date()
+                    block_seconds, block_cents = 0, 0
+
+                line: workTime.ClockLine = workTime.ClockLine()
+                line.start = workTime.time_to_seconds(time=punch_in.time())
+                line.end = workTime.time_to_seconds(time=punch_out.time())
+                seconds: int = round((punch_out - punch_in).total_seconds())
+                line.seconds = seconds
+                line.cents = workTime.money_to_cents(money=decimal.Decimal(value=f"{amount or 0:.2f}"))
+                line.comment = note or ""
+                block.clock_times.append(line)
+
+                block_seconds += seconds
+                block_cents += line.cents
+                job_seconds += seconds
+                job_cents += line.cents
+        close_job()
+    finally:
+        connection.close()
+    return work_times
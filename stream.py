@@ -0,0 +1,51 @@
+"""
+# @ Description: Streaming pipeline, blocks go from the csv exports straight into the aggregators
+"""
+
+import datetime
+
+import instrument
+from helper_functions import stream_csv_file
+from intervals import TimelineAggregator
+from phase_code_process import line_aggregator, render_aggregator
+from table_process import render_time_tables
+
+
+def stream_time_card(
+    csv_files: list[str],
+    paginate: bool = False,
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+) -> None:
+    """
+    Build the phase sheet and time tables without keeping the parsed exports in memory.
+
+    Each WorkBlock is handed to both aggregators as soon as its "Total:" line is
+    read and then dropped, so memory stays at about one block plus the running
+    totals, whatever the length of the history in the exports.
+
+    Args:
+        csv_files (list[str]): Paths of the csv exports, one job each.
+        paginate (bool, optional): Split the phase sheet into 23 row pages. Defaults to False.
+        since (datetime.date, optional): Skip blocks before this day. Defaults to no limit.
+        until (datetime.date, optional): Skip blocks after this day. Defaults to no limit.
+    """
+    # job or combined overtime rule, see phase_code_process.OVERTIME_RULE
+    lines = line_aggregator()
+    timelines = TimelineAggregator()
+    with instrument.stage("stream"):
+        for csv_file in csv_files:
+            name, blocks = stream_csv_file(csv_file=csv_file)
+            job: int = lines.add_job(name=name)
+            block_count: int = 0
+            for block in blocks:
+                if not since <= block.day <= until:
+                    continue
+                lines.add_block(job=job, block=block)
+                timelines.add_block(block=block)
+                block_count += 1
+            instrument.count("blocks", block_count)
+    instrument.count("jobs", len(csv_files))
+
+    render_aggregator(aggregator=lines, paginate=paginate)
+    render_time_tables(days=timelines.days())
@@ -1,154 +1,91 @@
 
 import datetime
-import os
-from collections import defaultdict
-
-import pandas
+from typing import Sequence
 
 import workTime
-from helper_functions import get_week_day, is_minutes_apart, time_to_12_string, days_ago, DAYS_AGO
-
-
-def proc_table(work_list: list[workTime.WorkTime]) -> None:
-    
-    # TODO:
-    # [ ] refactor this
-    # [ ] line up all the punches for the day
-    # [ ]   if the start of one punch is 30m+ the end of another punch, assume it is lunch.
-    #           else ignore the previous punch
-    # [ ] implement sudo code:
-    #       punch_list
-    #       punch_index = 2
-    #       cur_punch = punch_list[0] # first punch
-    #       next_punch = punch_list[1] # second punch
-    #       punch_in = cur_punch.start
-    #       lunch_in
-    #       lunch_out
-    #       punch_out
-    #       lunch_ot_in
-    #       lunch_ot_out
-    #       punch_ot_out
-    #       for next_punch != punch_list[-1] # next punch is not last punch
-    #           if diff(cur_punch.last, next_punch.start) > 30:
-    #               # assume this is lunch
-    #               lunch_out = cur_punch.last
-    #               lunch_in = next_punch.start
-    #               break
-    #           else:
-    #               cur_punch = next_punch
-    #               next_punch = punch_list[punch_index]
-    #               punch_index += 1
-    #       # figure out the OT stuff
-    #       
-    #   [ ] if total work > 10hrs calculate OT lunches and OT time
-    #       [ ] make OT calculations
-    
-    header: list[str] = [
-        "Sat",
-        "Sun",
-        "Mon",
-        "Tue",
-        "Wed",
-        "Thu",
-        "Fri",
-    ]
-
-    index: list[str] = [
-        "Time In",
-        "AM Rest Break ( yes)",
-        "Lunch Out",
-        "Lunch In",
-        "PM Rest Break (yes)",
-        "Time Out",
-        " ... ",
-        "2nd Lunch Out",
-        "2nd Lunch In",
-        "2nd PM Rest Break (yes)",
-        "Time Out (10hr)",
-    ]
-
-    # only punch ins
-    punch_idxs: list[str] = [i for i in index if (not "Break" in i) and (not "..." in i)]  # time in
-    breaks_idxs: list[str] = [i for i in index if ("Break" in i)]  # rest breaks
-
-    table_df = pandas.DataFrame(columns=header, index=index)
-    # table_df.rename_axis(mapper="Day", axis="columns", inplace=True)
-
-    dyn_df = pandas.DataFrame(columns=header)
-
-    # loading times
-    punches: defaultdict[str, list[datetime.time]] = defaultdict(list[datetime.time])
-    for wt in work_list:
-        for block in wt.work_blocks:
-            if DAYS_AGO:
-                if block.day > days_ago(7):
-                    continue
-            day: str = get_week_day(date_obj=block.day)
-            short_day: str = day[:3]
-            for clock in block.clock_times:
-                punches[short_day].append(clock.start_time)
-                punches[short_day].append(clock.end_time)
-                
-    for day in punches:
-        t = punches[day]
-        t = set(t)
-        t = list(t)
-        t.sort()
-        t = list(map(time_to_12_string,t))
-        print(f"{day} : {t}")
-
-    # process times into dataframe
-    for day, time_list in punches.items():
-        if not time_list:
-            continue
-        time_list.sort()
-
-        time_slot: dict[datetime.time, int] = {}
-        for t in time_list:
-            # get t, if no t, t = 0, t = t + 1
-            time_slot[t] = time_slot.get(t, 0) + 1
-
-        dyn_list: list[str] = list(map(time_to_12_string, time_slot))
-        if len(dyn_df) < len(dyn_list):
-            dyn_df.reindex(range(len(dyn_list)))
-        dyn_df[day] = dyn_list + [None] * (len(dyn_df) - len(dyn_list))
-
-        dyn_list: list[str] = []
-        for t, i in time_slot.items():
-            if i > 1:
-                pass
-            else:
-                dyn_list.append(time_to_12_string(t))
-
-        # updating the day's breaks
-        break_list: list[str] = ["yes"] * (len(dyn_list)//2)  # number of breaks is punches // 2
-        break_packed_list: list[str | None] = break_list + [None] * (len(breaks_idxs) - len(break_list))
-        breaks_series = pandas.Series(break_packed_list, index=breaks_idxs)
-        table_df[day].update(breaks_series)
-
-        # updating the day's punch in time
-        dyn_packed_list: list[str | None] = dyn_list + [None] * (len(punch_idxs) - len(dyn_list))
-        dyn_series = pandas.Series(dyn_packed_list, index=punch_idxs)
-        table_df[day].update(dyn_series)
-
-    table_df.replace(pandas.NA, None, inplace=True)
-    table_df.loc[" ... "] = " ... "
-    dyn_df.replace(pandas.NA, None, inplace=True)
-
-    md: str = table_df.to_markdown()
+from export import write_export
+from helper_functions import WEEK_DAY_NAMES
+from instrument import stage
+from intervals import DayTimeline, collect_days, seconds_to_12_string
+from md_table import pipe_table
+
+HEADER: list[str] = [
+    "Sat",
+    "Sun",
+    "Mon",
+    "Tue",
+    "Wed",
+    "Thu",
+    "Fri",
+]
+
+INDEX: list[str] = [
+    "Time In",
+    "AM Rest Break ( yes)",
+    "Lunch Out",
+    "Lunch In",
+    "PM Rest Break (yes)",
+    "Time Out",
+    " ... ",
+    "2nd Lunch Out",
+    "2nd Lunch In",
+    "2nd PM Rest Break (yes)",
+    "Time Out (10hr)",
+]
+
+
+def proc_table(work_list: Sequence[workTime.WorkTime], export_suffix: str = "") -> None:
+    # only reads work_list, run.py shares one frozen view between the renderers
+    with stage("time_table.collect"):
+        days: dict[datetime.date, DayTimeline] = collect_days(work_list=work_list)
+    render_time_tables(days=days, export_suffix=export_suffix)
+
+
+def render_time_tables(days: dict[datetime.date, DayTimeline], export_suffix: str = "") -> None:
+    """
+    Fill the time table and the dynamic (every punch) table and write them to ./envHidden/export.
+
+    Punches of all jobs are lined up per date: the first 30 min gap is lunch,
+    past 10 worked hours the 2nd lunch and "Time Out (10hr)" are used, see
+    intervals.DayTimeline.form. When the dates span several weeks the latest
+    date of each week day fills its column.
+
+    Args:
+        days (dict[datetime.date, DayTimeline]): Date -> timeline, in date order.
+        export_suffix (str, optional): Appended to the export file names. Defaults to "".
+    """
+    with stage("time_table.render"):
+        # week day column -> the day's timeline, later dates overwrite earlier ones
+        columns: dict[str, DayTimeline] = {}
+        for day, timeline in days.items():
+            # named from WEEK_DAY_NAMES, %a follows the locale and would miss the HEADER columns
+            columns[WEEK_DAY_NAMES[day.weekday()][:3]] = timeline
+
+        for short_day, timeline in columns.items():
+            print(f"{short_day} : {list(map(seconds_to_12_string, timeline.punches))}")
+
+        table: dict[str, dict[str, str]] = {day: timeline.form() for day, timeline in columns.items()}
+        records: list[list[str | None]] = [[table.get(day, {}).get(row) for day in HEADER] for row in INDEX]
+        records[INDEX.index(" ... ")] = [" ... "] * len(HEADER)
+
+        # every distinct punch of the day, one column per week day
+        punch_lists: dict[str, list[str]] = {
+            day: list(map(seconds_to_12_string, timeline.punches)) for day, timeline in columns.items()
+        }
+        rows: int = max((len(punches) for punches in punch_lists.values()), default=0)
+        dyn_records: list[list[str | None]] = [
+            [punch_lists[day][row] if row < len(punch_lists.get(day, ())) else None for day in HEADER]
+            for row in range(rows)
+        ]
+
+    md: str = pipe_table(headers=HEADER, rows=records, index=INDEX)
     print(md)
     print()
 
-    md_file = r"./envHidden/export/time_table.md"
-    md_file: str = os.path.normpath(md_file)
-    with open(file=md_file, mode="w", encoding="utf-8") as f:
-        f.write(md)
+    write_export(file_name=f"time_table{export_suffix}.md", md=md)
 
-    md: str = dyn_df.to_markdown()
+    md = pipe_table(headers=HEADER, rows=dyn_records)
     print(md)
     print()
 
-    md_file = r"./envHidden/export/dyn_time_table.md"
-    md_file: str = os.path.normpath(md_file)
-    with open(file=md_file, mode="w", encoding="utf-8") as f:
-        f.write(md)
+    write_export(file_name=f"dyn_time_table{export_suffix}.md", md=md)
@@ -0,0 +1,192 @@
+"""
+# @ Description: Times the parse, aggregate and render stages on synthetic exports
+
+The render_serial / render_thread / render_process rows compare the render_backend
+backends on the same input, the fastest one depends on the size of the run.
+
+usage:
+    python testing/benchmark.py                               # default sizes, writes benchmark.json
+    python testing/benchmark.py --sizes 4x1x2,64x13x4 -o new.json --compare old.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+# For files
+PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+
+import export  # noqa: E402
+import workTime  # noqa: E402
+from aggregate import process_line  # noqa: E402
+from helper_functions import process_csv_file  # noqa: E402
+from phase_code_process import process_work_times  # noqa: E402
+from render_backend import BACKENDS, render_all  # noqa: E402
+from table_process import proc_table  # noqa: E402
+from synthetic import generate  # noqa: E402
+
+DEFAULT_SIZES = "4x1x2,32x4x3,128x13x4"  # jobs x weeks x punches per day
+
+
+def parse_size(size: str) -> tuple[int, int, int]:
+    jobs, weeks, punches = (int(part) for part in size.split("x"))
+    return jobs, weeks, punches
+
+
+def fresh_exports() -> None:
+    """Empty the export folder and the write memo, so every run writes its exports instead of skipping them."""
+    export.forget_written()
+    with os.scandir(export.EXPORT_FOLDER) as entries:
+        for entry in entries:
+            if entry.is_file():
+                os.remove(entry.path)
+
+
+def measure(stage: Callable[[], Any], repeat: int, setup: Callable[[], Any] = fresh_exports) -> tuple[float, int, str]:
+    """
+    Best wall time of a stage over a few runs, then its peak traced memory in one extra run.
+
+    Args:
+        stage (Callable[[], Any]): The stage to run.
+        repeat (int): Timed runs.
+        setup (Callable[[], Any], optional): Run before every run, not timed. Defaults to fresh_exports.
+
+    Returns:
+        tuple[float, int, str]: (seconds, peak bytes, error message or "").
+    """
+    best: float = float("inf")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):  # the renderers print their tables
+            for _ in range(repeat):
+                setup()
+                start: float = time.perf_counter()
+                stage()
+                best = min(best, time.perf_counter() - start)
+
+            setup()
+            tracemalloc.start()
+            stage()
+            peak: int = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        return 0.0, 0, repr(e)
+    return best, peak, ""
+
+
+def bench_size(jobs: int, weeks: int, punches: int, repeat: int, work_folder: str) -> list[dict[str, Any]]:
+    data_folder: str = os.path.join(work_folder, f"data_{jobs}x{weeks}x{punches}")
+    paths: list[str] = generate(folder_path=data_folder, jobs=jobs, weeks=weeks, punches_per_day=punches)
+
+    work_times: list[workTime.WorkTime] = [process_csv_file(path) for path in paths]
+    blocks: int = sum(len(work.work_blocks) for work in work_times)
+    lines: int = sum(len(block.clock_times) for work in work_times for block in work.work_blocks)
+    frozen: tuple[workTime.WorkTime, ...] = workTime.freeze(work_list=[process_csv_file(path) for path in paths])
+
+    # stage name -> (callable, items processed, item unit)
+    stages: dict[str, tuple[Callable[[], Any], int, str]] = {
+        "process_csv_file": (lambda: [process_csv_file(path) for path in paths], lines, "clock lines"),
+        "process_line": (lambda: [process_line(work=work) for work in work_times], blocks, "blocks"),
+        "process_work_times": (lambda: process_work_times(frozen), blocks, "blocks"),
+        "proc_table": (lambda: proc_table(frozen), lines, "clock lines"),
+    }
+    for backend in BACKENDS:
+        stages[f"render_{backend}"] = (
+            lambda backend=backend: render_all(work_list=frozen, backend=backend), lines, "clock lines"
+        )
+
+    results: list[dict[str, Any]] = []
+    for name, (stage, items, unit) in stages.items():
+        seconds, peak, error = measure(stage=stage, repeat=repeat)
+        result: dict[str, Any] = {
+            "size": {"jobs": jobs, "weeks": weeks, "punches_per_day": punches},
+            "stage": name,
+            "seconds": seconds,
+            "items": items,
+            "unit": unit,
+            "items_per_second": items / seconds if seconds else None,
+            "peak_bytes": peak,
+        }
+        if error:
+            result["error"] = error
+        results.append(result)
+        rate: str = f"{items / seconds:12,.0f} {unit}/s" if seconds else f"{'failed':>12} {error}"
+        print(f"{jobs:>5}x{weeks:<3}x{punches:<2} {name:<20} {seconds * 1000:9.2f} ms {rate} {peak / 1024:10,.0f} KiB peak")
+    return results
+
+
+def git_version() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=PROJECT_PATH, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_file: str, results: list[dict[str, Any]]) -> None:
+    with open(file=old_file, mode="r", encoding="utf-8") as f:
+        old: dict[str, Any] = json.load(f)
+    old_seconds: dict[tuple[str, str], float] = {
+        (json.dumps(r["size"], sort_keys=True), r["stage"]): r["seconds"] for r in old["results"]
+    }
+    print(f"\ncompared to {old_file} ({old.get('version', 'unknown')}), ratio > 1 is slower:")
+    for r in results:
+        before: float | None = old_seconds.get((json.dumps(r["size"], sort_keys=True), r["stage"]))
+        if before and r["seconds"]:
+            size: str = "x".join(str(v) for v in r["size"].values())
+            print(f"{size:<12} {r['stage']:<20} {r['seconds'] / before:6.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the time sheet stages on synthetic exports.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma separated JOBSxWEEKSxPUNCHES (default: {DEFAULT_SIZES})")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage, the best is kept (default: 3)")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="json results file (default: benchmark.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results file to compare against")
+    args: argparse.Namespace = parser.parse_args()
+
+    output: str = os.path.abspath(args.output)
+    compare_file: str | None = os.path.abspath(args.compare) if args.compare else None
+    results: list[dict[str, Any]] = []
+    cwd: str = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_folder:
+        # the renderers write to ./envHidden/export
+        os.makedirs(os.path.join(work_folder, "envHidden", "export"))
+        os.chdir(work_folder)
+        try:
+            for size in args.sizes.split(","):
+                jobs, weeks, punches = parse_size(size=size)
+                results.extend(bench_size(jobs=jobs, weeks=weeks, punches=punches, repeat=args.repeat, work_folder=work_folder))
+        finally:
+            os.chdir(cwd)
+
+    report: dict[str, Any] = {
+        "version": git_version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(file=output, mode="w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}")
+
+    if compare_file:
+        compare(old_file=compare_file, results=results)
+
+
+if __name__ == "__main__":
+    main()
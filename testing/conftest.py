@@ -0,0 +1,13 @@
+"""
+# @ Description: pytest setup for the checks under testing/, the scratch and benchmark scripts are not collected
+"""
+
+import os
+import sys
+
+PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+
+# scripts that run on import
+collect_ignore: list[str] = ["epoc.py", "sqlite_test.py", "benchmark.py", "import_budget.py"]
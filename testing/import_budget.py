@@ -0,0 +1,74 @@
+"""
+# @ Description: Fails when importing run.py gets slower than the budget or pulls in pandas again
+
+usage:
+    python testing/import_budget.py                  # default 90 ms budget
+    python testing/import_budget.py --budget-ms 150 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_BUDGET_MS = 90.0
+# only md_table's "pandas" backend may import these, and only when it is chosen
+FORBIDDEN_MODULES: tuple[str, ...] = ("pandas", "numpy", "tabulate")
+# only imported in the branches of run.py that use them (--asyncio, --sqlite/--results-db, --mmap, process pools)
+LAZY_MODULES: tuple[str, ...] = ("asyncio", "sqlite3", "mmap", "concurrent.futures.process")
+
+
+def import_times(module: str = "run") -> dict[str, int]:
+    """
+    Import a project module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str, optional): Module to import. Defaults to "run".
+
+    Returns:
+        dict[str, int]: Imported module -> cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_PATH, capture_output=True, text=True, check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # "import time:       768 |      10336 |   stream"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Checks the start up import time of run.py.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"largest allowed import time of run.py (default: {DEFAULT_BUDGET_MS:g})")
+    parser.add_argument("--repeat", type=int, default=3, help="fresh interpreters, the best is kept (default: 3)")
+    args: argparse.Namespace = parser.parse_args()
+
+    runs: list[dict[str, int]] = [import_times() for _ in range(args.repeat)]
+    best: dict[str, int] = min(runs, key=lambda times: times.get("run", 0))
+    total_ms: float = best.get("run", 0) / 1000
+
+    slowest: list[tuple[str, int]] = sorted(best.items(), key=lambda item: item[1], reverse=True)[1:11]
+    for name, micro_seconds in slowest:
+        print(f"{name:<40} {micro_seconds / 1000:8.1f} ms")
+    print(f"{'run':<40} {total_ms:8.1f} ms (budget {args.budget_ms:g} ms)")
+
+    failures: list[str] = [f"imports {name}" for name in FORBIDDEN_MODULES + LAZY_MODULES if name in best]
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.1f} ms, over the {args.budget_ms:g} ms budget")
+    if failures:
+        print("FAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
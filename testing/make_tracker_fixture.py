@@ -0,0 +1,120 @@
+"""
+# @ Description: Builds a small synthetic WorktimeTracker sqlite database for sqlite_ingest
+"""
+
+import csv
+import datetime
+import os
+import random
+import sqlite3
+import sys
+from collections import defaultdict
+
+# For files
+PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_PATH not in sys.path:
+    sys.path.append(PROJECT_PATH)
+
+from sqlite_ingest import format_duration, from_core_data, to_core_data  # noqa: E402
+from synthetic import format_clock, format_money  # noqa: E402
+
+JOBS: list[str] = [
+    "10.010.0023 Automation Engineer - Overhead",
+    "20.120.0101 Panel Build Shop",
+    "30.300.1234 Site Commissioning",
+]
+RATE = 41.50
+
+
+# (job, start, end, amount, note), one per ZWORKTIME row
+Punch = tuple[int, float, float, float, str]
+
+
+def make_fixture(db_path: str, first_day: datetime.date, days: int = 14, seed: int = 1) -> list[Punch]:
+    random.seed(seed)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(
+        """
+        CREATE TABLE ZJOB (Z_PK INTEGER PRIMARY KEY, ZNAME VARCHAR);
+        CREATE TABLE ZWORKTIME (Z_PK INTEGER PRIMARY KEY, ZJOB INTEGER, ZSTART TIMESTAMP, ZEND TIMESTAMP,
+                                ZAMOUNT FLOAT, ZNOTE VARCHAR);
+        CREATE INDEX ZWORKTIME_ZSTART_INDEX ON ZWORKTIME (ZSTART);
+        """
+    )
+    connection.executemany("INSERT INTO ZJOB (Z_PK, ZNAME) VALUES (?, ?)", list(enumerate(JOBS, start=1)))
+
+    punches: list[Punch] = []
+    for offset in range(days):
+        day: datetime.date = first_day + datetime.timedelta(days=offset)
+        if day.weekday() == 6:
+            continue
+        clock: float = to_core_data(day=day) + 7 * 3600  # 7:00 AM
+        for job in random.sample(range(1, len(JOBS) + 1), k=2):
+            minutes: int = random.choice([30, 60, 105, 120, 240])
+            end: float = clock + minutes * 60
+            punches.append((job, clock, end, round(minutes / 60 * RATE, 2), random.choice(["", "note"])))
+            clock = end + random.choice([0, 30 * 60])
+    connection.executemany("INSERT INTO ZWORKTIME (ZJOB, ZSTART, ZEND, ZAMOUNT, ZNOTE) VALUES (?, ?, ?, ?, ?)", punches)
+    connection.commit()
+    connection.close()
+    return punches
+
+
+def write_exports(folder_path: str, punches: list[Punch]) -> list[str]:
+    """
+    Write the punches of a fixture as WorkTime csv exports, one per job, like the app would export them.
+
+    Args:
+        folder_path (str): Output folder, created if missing.
+        punches (list[Punch]): From make_fixture.
+
+    Returns:
+        list[str]: Paths of the written exports, in job order.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    # job -> local date -> clock lines
+    jobs: defaultdict[int, defaultdict[datetime.date, list[tuple[datetime.datetime, datetime.datetime, int, str]]]] = (
+        defaultdict(lambda: defaultdict(list))
+    )
+    for job, start, end, amount, note in sorted(punches):
+        punch_in: datetime.datetime = from_core_data(timestamp=start)
+        punch_out: datetime.datetime = from_core_data(timestamp=end)
+        jobs[job][punch_in.date()].append((punch_in, punch_out, round(amount * 100), note))
+
+    paths: list[str] = []
+    for job in sorted(jobs):
+        rows: list[list[str]] = []
+        total_seconds: int = 0
+        total_cents: int = 0
+        for day, lines in sorted(jobs[job].items()):
+            rows.append(["", "", f"{day:%b} {day.day}, {day.year}"])
+            rows.append(["Start", "End", "Time", "Amount", "Note"])
+            day_seconds: int = 0
+            day_cents: int = 0
+            for punch_in, punch_out, cents, note in lines:
+                seconds: int = round((punch_out - punch_in).total_seconds())
+                rows.append([format_clock(punch_in), format_clock(punch_out), format_duration(seconds=seconds), format_money(cents), note])
+                day_seconds += seconds
+                day_cents += cents
+            rows.append([f"Total:     {format_duration(seconds=day_seconds)}               {format_money(day_cents)}"])
+            rows.append([])
+            total_seconds += day_seconds
+            total_cents += day_cents
+
+        path: str = os.path.join(folder_path, f"job_{job:04d}.csv")
+        with open(file=path, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file, quoting=csv.QUOTE_ALL)
+            writer.writerow([f"{JOBS[job - 1]}  total amount: {format_money(total_cents)}  total time: {format_duration(seconds=total_seconds)}"])
+            # the blank rows go through the writer too, so every line ends in \r\n
+            writer.writerow([])
+            writer.writerows(rows)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    path: str = sys.argv[1] if len(sys.argv) > 1 else "envHidden/data/WorktimeTrackerBak/fixture.sqlite"
+    make_fixture(db_path=path, first_day=datetime.date(2025, 3, 1))
+    print(f"wrote {path}")
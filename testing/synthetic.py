@@ -0,0 +1,144 @@
+"""
+# @ Description: Generates realistic WorkTime csv exports for benchmarks
+"""
+
+import csv
+import datetime
+import os
+import random
+
+# csv data example (see workTime.py):
+# "10.010.0023 Automation Engineer - Overhead  total amount: $110.67  total time: 02:40:00"
+#
+# "","","Mar 3, 2025"
+# "Start","End","Time","Amount","Note"
+# "8:00:00 AM","8:30:00 AM","00:30:00","$20.75",""
+# "12:45:00 PM","1:00:00 PM","00:15:00","$10.38",""
+# "Total:     00:45:00               $31.13"
+
+JOB_NAMES: list[str] = [
+    "Automation Engineer - Overhead",
+    "Panel Build Shop",
+    "Site Commissioning",
+    "PLC Programming",
+    "Travel Drive Time",
+    "Customer Training",
+    "Estimating and Quoting",
+    "Drawing Review",
+]
+NOTES: list[str] = ["", "", "", "meeting", "on site", "follow up, call back"]
+RATE_CENTS = 4150  # $41.50 an hour
+
+
+def format_duration(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_clock(moment: datetime.datetime) -> str:
+    # "8:00:00 AM", no leading zero on the hour like the real export
+    return f"{moment.hour % 12 or 12}:{moment.minute:02d}:{moment.second:02d} {'AM' if moment.hour < 12 else 'PM'}"
+
+
+def format_money(cents: int) -> str:
+    return f"${cents // 100}.{cents % 100:02d}"
+
+
+def phase_code(job: int) -> str:
+    return f"{10 + job % 90:02d}.{job * 7 % 1000:03d}.{job:04d}"
+
+
+def write_job_csv(
+    path: str,
+    job: int,
+    first_day: datetime.date,
+    weeks: int,
+    punches_per_day: int,
+    rng: random.Random,
+) -> int:
+    """
+    Write one job export.
+
+    Args:
+        path (str): Output csv file.
+        job (int): Job number, decides the phase code and the name.
+        first_day (datetime.date): First day of the export.
+        weeks (int): Number of weeks covered.
+        punches_per_day (int): Clock lines per worked day.
+        rng (random.Random): Random source, seeded by the caller.
+
+    Returns:
+        int: Number of clock lines written.
+    """
+    rows: list[list[str]] = []
+    total_seconds: int = 0
+    total_cents: int = 0
+    lines: int = 0
+    for offset in range(weeks * 7):
+        day: datetime.date = first_day + datetime.timedelta(days=offset)
+        if day.weekday() == 6 or rng.random() < 0.2:
+            continue
+        clock = datetime.datetime.combine(day, datetime.time(hour=6 + rng.randrange(3), minute=rng.choice([0, 15, 30, 45])))
+        block: list[list[str]] = []
+        day_seconds: int = 0
+        day_cents: int = 0
+        for _ in range(punches_per_day):
+            seconds: int = rng.choice([15, 30, 45, 60, 90, 120]) * 60 + rng.choice([0, 0, 0, 0, 420])
+            end: datetime.datetime = clock + datetime.timedelta(seconds=seconds)
+            if end.date() != day:
+                break
+            cents: int = round(seconds * RATE_CENTS / 3600)
+            block.append([format_clock(clock), format_clock(end), format_duration(seconds), format_money(cents), rng.choice(NOTES)])
+            day_seconds += seconds
+            day_cents += cents
+            clock = end + datetime.timedelta(minutes=rng.choice([0, 0, 0, 30]))
+        if not block:
+            continue
+        rows.append(["", "", f"{day:%b} {day.day}, {day.year}"])
+        rows.append(["Start", "End", "Time", "Amount", "Note"])
+        rows.extend(block)
+        rows.append([f"Total:     {format_duration(day_seconds)}               {format_money(day_cents)}"])
+        rows.append([])
+        total_seconds += day_seconds
+        total_cents += day_cents
+        lines += len(block)
+
+    name: str = f"{phase_code(job)} {JOB_NAMES[job % len(JOB_NAMES)]}"
+    with open(file=path, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, quoting=csv.QUOTE_ALL)
+        writer.writerow([f"{name}  total amount: {format_money(total_cents)}  total time: {format_duration(total_seconds)}"])
+        # the blank rows go through the writer too, so every line ends in \r\n
+        writer.writerow([])
+        writer.writerows(rows)
+    return lines
+
+
+def generate(
+    folder_path: str,
+    jobs: int = 4,
+    weeks: int = 1,
+    punches_per_day: int = 2,
+    first_day: datetime.date = datetime.date(2025, 3, 1),
+    seed: int = 0,
+) -> list[str]:
+    """
+    Write a folder of synthetic job exports.
+
+    Args:
+        folder_path (str): Output folder, created if missing.
+        jobs (int, optional): Number of job exports. Defaults to 4.
+        weeks (int, optional): Weeks covered by every export. Defaults to 1.
+        punches_per_day (int, optional): Clock lines per worked day. Defaults to 2.
+        first_day (datetime.date, optional): First day, a Saturday. Defaults to 2025-03-01.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        list[str]: Paths of the written exports, sorted.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    rng = random.Random(seed)
+    paths: list[str] = []
+    for job in range(jobs):
+        path: str = os.path.join(folder_path, f"job_{job:04d}.csv")
+        write_job_csv(path=path, job=job, first_day=first_day, weeks=weeks, punches_per_day=punches_per_day, rng=rng)
+        paths.append(path)
+    return paths
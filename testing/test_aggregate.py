@@ -0,0 +1,92 @@
+"""
+# @ Description: Phase sheet rounding and the 8h ST/OT split of aggregate.aggregate_lines
+"""
+
+import datetime
+import decimal
+
+import workTime
+from aggregate import aggregate_lines, seconds_to_quarters
+
+MONDAY = datetime.date(2025, 3, 3)
+
+
+def make_work(name: str, days: dict[datetime.date, list[tuple[int, int]]]) -> workTime.WorkTime:
+    """
+    A WorkTime with one block per date.
+
+    Args:
+        name (str): Export header.
+        days (dict[datetime.date, list[tuple[int, int]]]): Date -> clock lines as (start, end) seconds since midnight.
+
+    Returns:
+        workTime.WorkTime: The export.
+    """
+    work: workTime.WorkTime = workTime.WorkTime()
+    work.name = name
+    for day, punches in days.items():
+        block: workTime.WorkBlock = workTime.WorkBlock()
+        block.day = day
+        for start, end in punches:
+            line: workTime.ClockLine = workTime.ClockLine()
+            line.start, line.end, line.seconds = start, end, end - start
+            block.clock_times.append(line)
+            block.final_line.seconds += end - start
+        work.work_blocks.append(block)
+    return work
+
+
+def hours(value: str) -> decimal.Decimal:
+    return decimal.Decimal(value=value)
+
+
+def test_quarter_rounding_tie_rounds_down() -> None:
+    assert seconds_to_quarters(seconds=450) == 0
+    assert seconds_to_quarters(seconds=451) == 1
+    assert seconds_to_quarters(seconds=1350) == 1
+    assert seconds_to_quarters(seconds=1351) == 2
+
+
+def test_single_export_caps_st_at_8_hours() -> None:
+    work = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * 3600, 16 * 3600)]})
+
+    line = aggregate_lines(work_list=[work])[0]
+
+    assert (line["MON ST"], line["mon ot"]) == (hours("8"), hours("2"))
+    assert (line["TOT ST"], line["tot ot"]) == (hours("8"), hours("2"))
+
+
+def test_same_phase_code_is_capped_once_per_day() -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * 3600, 12 * 3600)]})
+    second = make_work(name="10.010.0023 Overhead office", days={MONDAY: [(12 * 3600, 18 * 3600)]})
+
+    lines = aggregate_lines(work_list=[first, second])
+
+    assert len(lines) == 1
+    assert (lines[0]["MON ST"], lines[0]["mon ot"]) == (hours("8"), hours("4"))
+    assert (lines[0]["TOT ST"], lines[0]["tot ot"]) == (hours("8"), hours("4"))
+
+
+def test_different_phase_codes_keep_their_own_rows() -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * 3600, 12 * 3600)]})
+    second = make_work(name="20.120.0101 Panel Build", days={MONDAY: [(12 * 3600, 18 * 3600)]})
+
+    lines = aggregate_lines(work_list=[first, second])
+
+    assert [(line["phase code"], line["MON ST"], line["mon ot"]) for line in lines] == [
+        ("10.010.0023", hours("6"), hours("0")),
+        ("20.120.0101", hours("6"), hours("0")),
+    ]
+
+
+def test_later_date_fills_the_day_column_and_totals_count_every_date() -> None:
+    next_monday: datetime.date = MONDAY + datetime.timedelta(days=7)
+    work = make_work(
+        name="10.010.0023 Overhead",
+        days={next_monday: [(8 * 3600, 10 * 3600)], MONDAY: [(8 * 3600, 11 * 3600)]},
+    )
+
+    line = aggregate_lines(work_list=[work])[0]
+
+    assert line["MON ST"] == hours("2")
+    assert line["TOT ST"] == hours("5")
@@ -0,0 +1,47 @@
+"""
+# @ Description: write_export skips unchanged exports but rewrites files deleted or edited on disk
+"""
+
+import os
+
+import pytest
+
+import export
+
+
+@pytest.fixture
+def export_folder(tmp_path, monkeypatch) -> str:
+    monkeypatch.setattr(export, "EXPORT_FOLDER", str(tmp_path))
+    monkeypatch.setattr(export, "_last_content", {})
+    monkeypatch.setattr(export, "changed_exports", [])
+    return str(tmp_path)
+
+
+def read(folder: str) -> str:
+    with open(file=os.path.join(folder, "phase_sheet.md"), mode="r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_unchanged_export_is_not_written_again(export_folder) -> None:
+    assert export.write_export(file_name="phase_sheet.md", md="| a |")
+    assert not export.write_export(file_name="phase_sheet.md", md="| a |")
+    assert export.clear_changed() == ["phase_sheet.md"]
+
+
+def test_deleted_export_is_written_again(export_folder) -> None:
+    export.write_export(file_name="phase_sheet.md", md="| a |")
+    os.remove(os.path.join(export_folder, "phase_sheet.md"))
+
+    assert export.write_export(file_name="phase_sheet.md", md="| a |")
+    assert read(folder=export_folder) == "| a |"
+
+
+def test_edited_export_is_written_again(export_folder) -> None:
+    export.write_export(file_name="phase_sheet.md", md="| a |")
+    md_file: str = os.path.join(export_folder, "phase_sheet.md")
+    with open(file=md_file, mode="w", encoding="utf-8") as f:
+        f.write("| edited by hand |")
+    os.utime(md_file, ns=(0, 0))
+
+    assert export.write_export(file_name="phase_sheet.md", md="| a |")
+    assert read(folder=export_folder) == "| a |"
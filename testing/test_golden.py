@@ -0,0 +1,101 @@
+"""
+# @ Description: The three exports of run.py on the golden csv exports, in every read/render mode, match testing/golden/export
+
+The golden exports were written by the parser and renderers as they are now;
+the phase sheet rows were checked against the original pandas implementation.
+Regenerate them only for an intended output change:
+    python testing/test_golden.py --update
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+GOLDEN_FOLDER = os.path.join(PROJECT_PATH, "testing", "golden")
+EXPORTS: tuple[str, ...] = ("phase_sheet.md", "time_table.md", "dyn_time_table.md")
+
+MODES: dict[str, list[str]] = {
+    "plain": [],
+    "no cache": ["--no-cache"],
+    "workers": ["-w", "2"],
+    "stream": ["--stream"],
+    "mmap": ["--mmap"],
+    "asyncio": ["--asyncio"],
+    "render thread": ["--render", "thread"],
+    "render process": ["--render", "process"],
+}
+
+# pipelines that would drop one of the flags, or a missing input, stop with a usage error
+REJECTED: dict[str, list[str]] = {
+    "stream weeks": ["--stream", "--weeks"],
+    "stream results db": ["--stream", "--results-db"],
+    "stream mmap": ["--stream", "--mmap"],
+    "asyncio sqlite": ["--asyncio", "--sqlite"],
+    "asyncio mmap": ["--asyncio", "--mmap"],
+    "stream asyncio": ["--stream", "--asyncio"],
+    "render stream": ["--render", "thread", "--stream"],
+    "render weeks": ["--render", "process", "--weeks"],
+    "missing sqlite backup": ["--sqlite", "missing.sqlite"],
+}
+
+
+def run_exports(work_folder: str, arguments: list[str]) -> dict[str, str]:
+    """
+    Run run.py on the golden csv exports in a scratch folder.
+
+    Args:
+        work_folder (str): Empty folder used as the working directory.
+        arguments (list[str]): Extra run.py arguments.
+
+    Returns:
+        dict[str, str]: Export file name -> markdown.
+    """
+    shutil.copytree(os.path.join(GOLDEN_FOLDER, "to_process"), os.path.join(work_folder, "envHidden", "data", "to_process"))
+    os.makedirs(os.path.join(work_folder, "envHidden", "export"))
+    subprocess.run(
+        [sys.executable, os.path.join(PROJECT_PATH, "run.py"), *arguments],
+        cwd=work_folder, capture_output=True, text=True, check=True,
+    )
+    exports: dict[str, str] = {}
+    for name in EXPORTS:
+        with open(file=os.path.join(work_folder, "envHidden", "export", name), mode="r", encoding="utf-8") as f:
+            exports[name] = f.read()
+    return exports
+
+
+def golden_exports() -> dict[str, str]:
+    exports: dict[str, str] = {}
+    for name in EXPORTS:
+        with open(file=os.path.join(GOLDEN_FOLDER, "export", name), mode="r", encoding="utf-8") as f:
+            exports[name] = f.read()
+    return exports
+
+
+@pytest.mark.parametrize("mode", list(MODES))
+def test_exports_match_golden(mode: str, tmp_path) -> None:
+    assert run_exports(work_folder=str(tmp_path), arguments=MODES[mode]) == golden_exports()
+
+
+@pytest.mark.parametrize("mode", list(REJECTED))
+def test_ignored_flags_are_rejected(mode: str, tmp_path) -> None:
+    result = subprocess.run(
+        [sys.executable, os.path.join(PROJECT_PATH, "run.py"), *REJECTED[mode]],
+        cwd=tmp_path, capture_output=True, text=True,
+    )
+
+    assert result.returncode == 2
+    assert "run.py: error: " in result.stderr
+
+
+if __name__ == "__main__" and "--update" in sys.argv:
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name, md in run_exports(work_folder=folder, arguments=["--no-cache"]).items():
+            with open(file=os.path.join(GOLDEN_FOLDER, "export", name), mode="w", encoding="utf-8") as f:
+                f.write(md)
+    print(f"updated {os.path.join(GOLDEN_FOLDER, 'export')}")
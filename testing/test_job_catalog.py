@@ -0,0 +1,30 @@
+"""
+# @ Description: JobCatalog.load reads jobs.json and names the entry it can not use
+"""
+
+import json
+
+import pytest
+
+from job_catalog import JobCatalog
+
+
+def test_load_reads_the_jobs(tmp_path) -> None:
+    catalog_file = tmp_path / "jobs.json"
+    catalog_file.write_text(
+        json.dumps({"default eqip. no.": "1.1", "jobs": {"10.010.0023": {"description": "Overhead"}}}), encoding="utf-8"
+    )
+
+    catalog = JobCatalog.load(json_file=str(catalog_file))
+
+    job = catalog.job(name="10.010.0023 Automation Engineer - Overhead")
+    assert (job.phase_code, job.description, job.eqip_no) == ("10.010.0023", "Overhead", "1.1")
+
+
+@pytest.mark.parametrize("entry", ["Overhead", ["Overhead"], None])
+def test_load_rejects_an_entry_that_is_not_an_object(tmp_path, entry) -> None:
+    catalog_file = tmp_path / "jobs.json"
+    catalog_file.write_text(json.dumps({"jobs": {"10.010.0023": entry}}), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="'10.010.0023'"):
+        JobCatalog.load(json_file=str(catalog_file))
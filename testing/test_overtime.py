@@ -0,0 +1,119 @@
+"""
+# @ Description: Cross job ST/OT allocation of overtime.combine_overtime and the --overtime combined pipelines
+"""
+
+import datetime
+
+import export
+import phase_code_process
+from overtime import combine_overtime, summary_markdown
+from stream import stream_time_card
+from test_aggregate import MONDAY, hours, make_work
+
+SATURDAY = datetime.date(2025, 3, 1)
+HOUR = 3600
+
+
+def test_second_job_of_the_day_gets_the_overtime() -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 12 * HOUR)]})
+    second = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(12 * HOUR, 18 * HOUR)]})
+
+    report = combine_overtime(work_list=[second, first])
+    by_code = {line["phase code"]: line for line in report.lines}
+
+    assert (by_code["10.010.0023"]["MON ST"], by_code["10.010.0023"]["mon ot"]) == (hours("6"), hours("0"))
+    assert (by_code["11.007.0001"]["MON ST"], by_code["11.007.0001"]["mon ot"]) == (hours("2"), hours("4"))
+    (day,) = report.days
+    assert (day.quarters, day.st, day.ot, day.over_10) == (48, 32, 16, 8)
+
+
+def test_same_start_is_split_in_row_order() -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 11 * HOUR)]})
+    second = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(6 * HOUR, 11 * HOUR)]})
+
+    lines = combine_overtime(work_list=[first, second]).lines
+
+    assert (lines[0]["MON ST"], lines[0]["mon ot"]) == (hours("5"), hours("0"))
+    assert (lines[1]["MON ST"], lines[1]["mon ot"]) == (hours("3"), hours("2"))
+
+
+def test_same_phase_code_is_rounded_once_per_date() -> None:
+    # 7m30s twice rounds to 0 + 0 per export, 15m merged
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 6 * HOUR + 450)]})
+    second = make_work(name="10.010.0023 Overhead - shop", days={MONDAY: [(7 * HOUR, 7 * HOUR + 450)]})
+
+    (line,) = combine_overtime(work_list=[first, second]).lines
+
+    assert line["MON ST"] == hours("0.25")
+
+
+def test_day_total_is_rounded_once_across_phase_codes() -> None:
+    # 7m30s per phase code rounds to 0 + 0 per row, the 15m day to one quarter
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 6 * HOUR + 450)]})
+    second = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(7 * HOUR, 7 * HOUR + 450)]})
+
+    report = combine_overtime(work_list=[first, second])
+
+    assert [line["MON ST"] for line in report.lines] == [hours("0"), hours("0.25")]
+    assert report.days[0].quarters == 1
+
+
+def test_past_10_hours_goes_to_the_rows_worked_last() -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(5 * HOUR, 14 * HOUR)]})
+    second = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(14 * HOUR, 17 * HOUR)]})
+
+    report = combine_overtime(work_list=[first, second])
+
+    # 9h then 3h: 8 ST + 1 OT, then 1 OT up to 10 hours and 2 OT past it
+    assert [(line["TOT ST"], line["tot ot"]) for line in report.lines] == [(hours("8"), hours("1")), (hours("0"), hours("3"))]
+    assert report.over_10 == [0, 8]
+    assert "| 11.007.0001 |    0 |    3 |       2 |" in summary_markdown(report=report)
+
+
+def test_week_caps_st_at_40_hours_from_saturday() -> None:
+    days = {SATURDAY + datetime.timedelta(days=offset): [(6 * HOUR, 15 * HOUR)] for offset in range(6)}
+    work = make_work(name="10.010.0023 Overhead", days=days)
+
+    report = combine_overtime(work_list=[work])
+    (line,) = report.lines
+
+    # 8 ST a day, 6 days: the 6th day (Thursday) only has 0 ST left after 40 hours
+    assert (line["THU ST"], line["thu ot"]) == (hours("0"), hours("9"))
+    assert (line["TOT ST"], line["tot ot"]) == (hours("40"), hours("14"))
+    assert report.weeks == {SATURDAY: (160, 56)}
+
+
+def test_next_week_starts_a_new_40_hours() -> None:
+    work = make_work(
+        name="10.010.0023 Overhead",
+        days={SATURDAY + datetime.timedelta(days=offset): [(6 * HOUR, 14 * HOUR)] for offset in (2, 3, 4, 5, 6, 7)},
+    )
+
+    report = combine_overtime(work_list=[work])
+
+    assert report.weeks == {SATURDAY: (160, 0), SATURDAY + datetime.timedelta(days=7): (32, 0)}
+
+
+def test_stream_uses_the_combined_rule(tmp_path, monkeypatch) -> None:
+    to_process = tmp_path / "to_process"
+    to_process.mkdir()
+    exports = {"10.010.0023": ("6:00:00 AM", "12:00:00 PM"), "11.007.0001": ("12:00:00 PM", "6:00:00 PM")}
+    for code, (punch_in, punch_out) in exports.items():
+        (to_process / f"{code}.csv").write_text(
+            f'"{code} Job  total amount: $0.00  total time: 06:00:00"\n\n'
+            '"","","Mar 3, 2025"\n'
+            '"Start","End","Time","Amount","Note"\n'
+            f'"{punch_in}","{punch_out}","06:00:00","$0.00",""\n'
+            '"Total:     06:00:00               $0.00"\n',
+            encoding="utf-8",
+        )
+    (tmp_path / "export").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(export, "EXPORT_FOLDER", str(tmp_path / "export"))
+    monkeypatch.setattr(phase_code_process, "OVERTIME_RULE", "combined")
+
+    stream_time_card(csv_files=sorted(str(path) for path in to_process.iterdir()))
+
+    summary = (tmp_path / "export" / "hours_summary.md").read_text(encoding="utf-8")
+    (monday,) = [line for line in summary.splitlines() if "2025-03-03" in line]
+    assert [cell.strip() for cell in monday.strip("|").split("|")] == ["2025-03-03", "Mon", "12", "8", "4", "2"]
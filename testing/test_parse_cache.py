@@ -0,0 +1,75 @@
+"""
+# @ Description: ParseCache keeps a running folder size, evicts past the limit and treats bad entries as misses
+"""
+
+import os
+import pickle
+
+import parse_cache
+from parse_cache import ParseCache
+from test_aggregate import MONDAY, make_work
+
+HOUR = 3600
+
+
+def test_folder_is_only_scanned_when_over_the_limit(tmp_path, monkeypatch) -> None:
+    work = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    entry_size: int = len(pickle.dumps(work, protocol=pickle.HIGHEST_PROTOCOL))
+    cache = ParseCache(cache_folder=str(tmp_path), max_bytes=10 * entry_size)
+    scans: list[int] = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        scans.append(1)
+        return scandir(path)
+
+    monkeypatch.setattr(parse_cache.os, "scandir", counting_scandir)
+    for number in range(11):
+        cache.store(key=f"{number:040x}", work=work)
+
+    # the first store counts the folder, the 11th goes over and evicts down to 3/4
+    assert len(scans) == 2
+    assert len(os.listdir(tmp_path)) == 7
+    assert cache.load(key=f"{0:040x}") is None
+    assert cache.load(key=f"{10:040x}") is not None
+
+
+def test_entries_removed_by_another_process_are_skipped(tmp_path, monkeypatch) -> None:
+    work = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    cache = ParseCache(cache_folder=str(tmp_path))
+    cache.store(key="a" * 40, work=work)
+    cache.store(key="b" * 40, work=work)
+    gone: str = cache.entry_path(key="c" * 40)
+    with open(file=gone, mode="wb") as f:
+        f.write(b"")
+    listed: list[os.DirEntry[str]] = list(os.scandir(tmp_path))
+    os.remove(gone)
+    remove = os.remove
+
+    def racing_remove(path: str) -> None:
+        remove(path)  # another process evicts first
+        remove(path)
+
+    monkeypatch.setattr(parse_cache.os, "scandir", lambda path: iter(listed))
+    monkeypatch.setattr(parse_cache.os, "remove", racing_remove)
+    cache.max_bytes = 1
+    cache.evict()
+
+    assert os.listdir(tmp_path) == []
+    assert cache._size == 0
+
+
+def test_unreadable_entries_are_misses(tmp_path) -> None:
+    cache = ParseCache(cache_folder=str(tmp_path))
+    # a class that no longer exists, a value error and a cut short pickle
+    payloads: list[bytes] = [
+        b"cworkTime\nNoSuchClass\n.",
+        b"\x80\x05\x95\x00\x00\x00\x00\x00\x00\x00\x00\xff.",
+        pickle.dumps(list(range(10)))[:5],
+    ]
+    for number, payload in enumerate(payloads):
+        with open(file=cache.entry_path(key=str(number)), mode="wb") as f:
+            f.write(payload)
+
+    assert [cache.load(key=str(number)) for number in range(len(payloads))] == [None, None, None]
+    assert (cache.hits, cache.misses) == (0, 3)
@@ -0,0 +1,99 @@
+"""
+# @ Description: Results database rows of a run and how a later run replaces them
+"""
+
+import datetime
+import sqlite3
+
+from results_db import PHASE_COLUMNS, day_totals, write_results
+from test_aggregate import MONDAY, make_work
+from weeks import split_by_week
+
+HOUR = 3600
+
+
+def rows(db_path: str, query: str) -> list[tuple]:
+    connection = sqlite3.connect(db_path)
+    try:
+        return connection.execute(query).fetchall()
+    finally:
+        connection.close()
+
+
+def header(total: str) -> str:
+    return f"10.010.0023 Automation Engineer - Overhead  total amount: $0.00  total time: {total}"
+
+
+def test_job_is_the_export_and_description_its_own_column(tmp_path) -> None:
+    db_path = str(tmp_path / "results.sqlite")
+    work = make_work(name=header(total="02:00:00"), days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+
+    write_results(work_list=[work], db_path=db_path)
+
+    assert rows(db_path=db_path, query="SELECT job, description FROM day_totals") == [
+        ("10.010.0023 Automation Engineer - Overhead", "Automation Engineer Overhead")
+    ]
+    assert rows(db_path=db_path, query="SELECT DISTINCT job, description FROM punches") == [
+        ("10.010.0023 Automation Engineer - Overhead", "Automation Engineer Overhead")
+    ]
+
+
+def test_a_grown_export_replaces_its_earlier_rows(tmp_path) -> None:
+    db_path = str(tmp_path / "results.sqlite")
+    before = make_work(name=header(total="02:00:00"), days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    after = make_work(name=header(total="03:00:00"), days={MONDAY: [(6 * HOUR, 9 * HOUR)]})
+
+    write_results(work_list=[before], db_path=db_path)
+    write_results(work_list=[after], db_path=db_path)
+
+    assert [total[1:4] for total in day_totals(db_path=db_path)] == [
+        ("10.010.0023 Automation Engineer - Overhead", "2025-03-03", 3 * HOUR)
+    ]
+
+
+def test_exports_sharing_a_phase_code_do_not_replace_each_other(tmp_path) -> None:
+    db_path = str(tmp_path / "results.sqlite")
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    second = make_work(name="10.010.0023 Overhead - shop", days={MONDAY: [(9 * HOUR, 10 * HOUR)]})
+
+    write_results(work_list=[first], db_path=db_path)
+    write_results(work_list=[second], db_path=db_path)
+    # a later run over the same export replaces its own rows only
+    write_results(work_list=[first], db_path=db_path)
+
+    assert sorted(total[1:4] for total in day_totals(db_path=db_path)) == [
+        ("10.010.0023 Overhead", "2025-03-03", 2 * HOUR),
+        ("10.010.0023 Overhead - shop", "2025-03-03", HOUR),
+    ]
+
+
+def test_weeks_get_a_phase_sheet_each(tmp_path) -> None:
+    db_path = str(tmp_path / "results.sqlite")
+    next_monday = MONDAY + datetime.timedelta(days=7)
+    work = make_work(
+        name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)], next_monday: [(6 * HOUR, 9 * HOUR)]}
+    )
+
+    write_results(work_list=[work], db_path=db_path, weeks=split_by_week(work_list=[work]))
+    # the week is the key, writing it again replaces its rows
+    write_results(work_list=[work], db_path=db_path, weeks=split_by_week(work_list=[work]))
+
+    query = "SELECT week, row, phase_code, mon_st, tot_st FROM phase_sheet ORDER BY week"
+    assert rows(db_path=db_path, query=query) == [
+        ("2025-03-01", 0, "10.010.0023", 2.0, 2.0),
+        ("2025-03-08", 0, "10.010.0023", 3.0, 3.0),
+    ]
+
+
+def test_a_database_without_the_week_column_is_migrated(tmp_path) -> None:
+    db_path = str(tmp_path / "results.sqlite")
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        f"CREATE TABLE phase_sheet (as_of TEXT NOT NULL, row INTEGER NOT NULL, {', '.join(PHASE_COLUMNS)})"
+    )
+    connection.close()
+    work = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+
+    write_results(work_list=[work], db_path=db_path)
+
+    assert rows(db_path=db_path, query="SELECT week, phase_code, tot_st FROM phase_sheet") == [("", "10.010.0023", 2.0)]
@@ -0,0 +1,110 @@
+"""
+# @ Description: Weekly rollups kept between runs and their markdown reports
+"""
+
+import datetime
+
+import phase_code_process
+import workTime
+from job_catalog import get_catalog
+from rollups import RollupStore, periods_markdown, totals_markdown
+from test_aggregate import MONDAY, make_work
+
+HOUR = 3600
+
+
+def write_export(path, work: workTime.WorkTime) -> str:
+    # is_current only looks at size and mtime, the content is never read
+    path.write_text(work.name, encoding="utf-8")
+    return str(path)
+
+
+def test_update_keeps_exports_that_left_the_folder(tmp_path) -> None:
+    old = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    new = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(8 * HOUR, 9 * HOUR)]})
+    old_csv = write_export(path=tmp_path / "old.csv", work=old)
+    new_csv = write_export(path=tmp_path / "new.csv", work=new)
+    store = RollupStore(rollup_file=str(tmp_path / "rollups.json"))
+    store.update(csv_files=[old_csv], work_list=[old])
+
+    store.update(csv_files=[new_csv], work_list=[new])
+    store.save()
+    reloaded = RollupStore.load(rollup_file=str(tmp_path / "rollups.json"))
+
+    assert sorted(reloaded.totals()) == ["10.010.0023", "11.007.0001"]
+    assert reloaded.updated == 0
+
+
+def test_update_only_rolls_up_changed_exports(tmp_path) -> None:
+    work = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    csv_file = write_export(path=tmp_path / "job.csv", work=work)
+    store = RollupStore(rollup_file=str(tmp_path / "rollups.json"))
+    store.update(csv_files=[csv_file], work_list=[work])
+
+    def parse(csv_file: str) -> workTime.WorkTime:
+        raise AssertionError(f"{csv_file} parsed again")
+
+    store.update(csv_files=[csv_file], parse=parse)
+
+    assert store.updated == 1
+
+
+def test_same_phase_code_is_rounded_once_per_date(tmp_path) -> None:
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 12 * HOUR)]})
+    second = make_work(name="10.010.0023 Overhead - shop", days={MONDAY: [(12 * HOUR, 18 * HOUR)]})
+    store = RollupStore(rollup_file=str(tmp_path / "rollups.json"))
+    store.update(
+        csv_files=[write_export(path=tmp_path / "a.csv", work=first), write_export(path=tmp_path / "b.csv", work=second)],
+        work_list=[first, second],
+    )
+
+    ((_, totals),) = store.totals().values()
+
+    assert totals[:2] == [32, 16]
+
+
+def test_combined_rule_splits_across_phase_codes(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(phase_code_process, "OVERTIME_RULE", "combined")
+    first = make_work(name="10.010.0023 Overhead", days={MONDAY: [(6 * HOUR, 12 * HOUR)]})
+    second = make_work(name="11.007.0001 Panel Build", days={MONDAY: [(12 * HOUR, 18 * HOUR)]})
+    store = RollupStore(rollup_file=str(tmp_path / "rollups.json"))
+    store.update(
+        csv_files=[write_export(path=tmp_path / "b.csv", work=second), write_export(path=tmp_path / "a.csv", work=first)],
+        work_list=[second, first],
+    )
+
+    rows = store.totals()
+
+    assert rows["10.010.0023"][1][:2] == [24, 0]
+    assert rows["11.007.0001"][1][:2] == [8, 16]
+
+
+def test_moved_and_re_exported_files_count_once(tmp_path) -> None:
+    name = "10.010.0023 Overhead"
+    week = make_work(name=f"{name}  total amount: $1.00", days={MONDAY: [(6 * HOUR, 8 * HOUR)]})
+    grown = make_work(
+        name=f"{name}  total amount: $2.00",
+        days={MONDAY: [(6 * HOUR, 8 * HOUR)], MONDAY + datetime.timedelta(days=1): [(6 * HOUR, 9 * HOUR)]},
+    )
+    store = RollupStore(rollup_file=str(tmp_path / "rollups.json"))
+    store.update(csv_files=[write_export(path=tmp_path / "job.csv", work=week)], work_list=[week])
+    (tmp_path / "old").mkdir()
+    moved = str((tmp_path / "job.csv").rename(tmp_path / "old" / "job.csv"))
+    store.update(csv_files=[moved], work_list=[week])
+
+    store.update(csv_files=[moved, write_export(path=tmp_path / "job-new.csv", work=grown)], work_list=[week, grown])
+
+    ((_, totals),) = store.totals().values()
+    assert totals[:3] == [20, 0, 5 * HOUR]
+    assert sorted(store.files) == sorted([moved, str(tmp_path / "job-new.csv")])
+
+
+def test_markdown_prints_every_cell_with_two_decimals() -> None:
+    job = get_catalog().job(name="10.010.0023 Overhead")
+    md = totals_markdown(rows={"10.010.0023": (job, [4 * 1000, 2, 0, 12345678])})
+    (row,) = md.splitlines()[2:]
+
+    assert [cell.strip() for cell in row.strip("|").split("|")][3:] == ["1,000.00", "0.50", "1,000.50", "123,456.78"]
+    assert "| 2025-03-01 | 0.00 | 0.00 | 0.00    | 123,456.78 |" in periods_markdown(
+        periods={datetime.date(2025, 3, 1): [0, 0, 0, 12345678]}
+    )
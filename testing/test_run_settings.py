@@ -0,0 +1,36 @@
+"""
+# @ Description: Worker processes of run_settings.process_pool see the settings of the parent
+"""
+
+import datetime
+import json
+import multiprocessing
+
+import helper_functions
+import job_catalog
+import md_table
+import phase_code_process
+from run_settings import RunSettings, process_pool, snapshot_settings
+
+
+def test_spawned_workers_get_the_parent_settings(tmp_path, monkeypatch) -> None:
+    catalog_file = tmp_path / "job_catalog.json"
+    catalog_file.write_text(
+        json.dumps({"default eqip. no.": "99.0001", "jobs": {"10.010.0023": {"description": "Catalog Overhead"}}}),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(phase_code_process, "OVERTIME_RULE", "combined")
+    monkeypatch.setattr(md_table, "BACKEND", "pandas")
+    monkeypatch.setattr(helper_functions, "AS_OF", datetime.date(2025, 3, 7))
+    monkeypatch.setattr(helper_functions, "DAYS_AGO", True)
+    monkeypatch.setattr(job_catalog, "_catalog", job_catalog.JobCatalog.load(json_file=str(catalog_file)))
+
+    # spawn starts from fresh imports, like the default on Windows and macOS
+    with process_pool(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        worker: RunSettings = executor.submit(snapshot_settings).result()
+
+    assert (worker.overtime_rule, worker.md_backend, worker.as_of, worker.days_ago) == (
+        "combined", "pandas", datetime.date(2025, 3, 7), True
+    )
+    job = worker.catalog.job(name="10.010.0023 Automation Engineer - Overhead  total amount: $0.00")
+    assert (job.description, job.eqip_no) == ("Catalog Overhead", "99.0001")
@@ -0,0 +1,103 @@
+"""
+# @ Description: sqlite_ingest.read_tracker_db turns the punches of a WorktimeTracker backup into WorkTimes
+"""
+
+import datetime
+import sqlite3
+
+import workTime
+from make_tracker_fixture import make_fixture
+from sqlite_ingest import read_tracker_db, to_core_data
+
+MONDAY = datetime.date(2025, 3, 3)
+HOUR = 3600
+
+
+def write_tracker_db(db_path: str, jobs: list[tuple[int, str]], punches: list[tuple]) -> None:
+    # punches: (job key, day, start seconds, end seconds, amount, note)
+    connection = sqlite3.connect(db_path)
+    connection.executescript(
+        """
+        CREATE TABLE ZJOB (Z_PK INTEGER PRIMARY KEY, ZNAME VARCHAR);
+        CREATE TABLE ZWORKTIME (Z_PK INTEGER PRIMARY KEY, ZJOB INTEGER, ZSTART TIMESTAMP, ZEND TIMESTAMP,
+                                ZAMOUNT FLOAT, ZNOTE VARCHAR);
+        """
+    )
+    connection.executemany("INSERT INTO ZJOB (Z_PK, ZNAME) VALUES (?, ?)", jobs)
+    connection.executemany(
+        "INSERT INTO ZWORKTIME (ZJOB, ZSTART, ZEND, ZAMOUNT, ZNOTE) VALUES (?, ?, ?, ?, ?)",
+        [(job, to_core_data(day=day) + start, to_core_data(day=day) + end, amount, note)
+         for job, day, start, end, amount, note in punches],
+    )
+    connection.commit()
+    connection.close()
+
+
+def flatten(work: workTime.WorkTime) -> tuple:
+    return (
+        work.name,
+        [
+            (
+                block.day,
+                [(line.start, line.end, line.seconds, line.cents, line.comment) for line in block.clock_times],
+                block.final_line.seconds,
+                block.final_line.cents,
+            )
+            for block in work.work_blocks
+        ],
+    )
+
+
+def test_tracker_db_punches(tmp_path) -> None:
+    db_path: str = str(tmp_path / "tracker.sqlite")
+    tuesday: datetime.date = MONDAY + datetime.timedelta(days=1)
+    write_tracker_db(
+        db_path=db_path,
+        jobs=[(1, "10.010.0023 Overhead"), (2, "20.120.0101 Panel Build"), (3, "10.010.0023 Overhead")],
+        punches=[
+            (1, MONDAY, 8 * HOUR, 8 * HOUR + 1800, 20.75, None),
+            (2, MONDAY, 9 * HOUR, 11 * HOUR, 83.0, "note"),
+            (1, MONDAY, 12 * HOUR + 2700, 13 * HOUR, 10.38, "call"),
+            (1, tuesday, 8 * HOUR, 9 * HOUR + 900, 51.88, ""),
+            (3, tuesday, 7 * HOUR, 8 * HOUR, 41.5, ""),
+        ],
+    )
+
+    work_times: list[workTime.WorkTime] = read_tracker_db(db_path=db_path)
+
+    # the two jobs named alike stay apart
+    assert [flatten(work) for work in work_times] == [
+        (
+            "10.010.0023 Overhead  total amount: $83.01  total time: 02:00:00",
+            [
+                (
+                    MONDAY,
+                    [(8 * HOUR, 8 * HOUR + 1800, 1800, 2075, ""), (12 * HOUR + 2700, 13 * HOUR, 900, 1038, "call")],
+                    2700,
+                    3113,
+                ),
+                (tuesday, [(8 * HOUR, 9 * HOUR + 900, 4500, 5188, "")], 4500, 5188),
+            ],
+        ),
+        (
+            "20.120.0101 Panel Build  total amount: $83.00  total time: 02:00:00",
+            [(MONDAY, [(9 * HOUR, 11 * HOUR, 7200, 8300, "note")], 7200, 8300)],
+        ),
+        (
+            "10.010.0023 Overhead  total amount: $41.50  total time: 01:00:00",
+            [(tuesday, [(7 * HOUR, 8 * HOUR, 3600, 4150, "")], 3600, 4150)],
+        ),
+    ]
+    assert work_times[0].work_blocks[0].final_line.line == "Total:     00:45:00               $31.13"
+
+
+def test_tracker_db_date_range(tmp_path) -> None:
+    db_path: str = str(tmp_path / "fixture.sqlite")
+    make_fixture(db_path=db_path, first_day=datetime.date(2025, 3, 1))
+    since: datetime.date = datetime.date(2025, 3, 4)
+    until: datetime.date = datetime.date(2025, 3, 6)
+
+    work_times: list[workTime.WorkTime] = read_tracker_db(db_path=db_path, start=since, end=until)
+
+    days: set[datetime.date] = {block.day for work in work_times for block in work.work_blocks}
+    assert days and all(since <= day <= until for day in days)
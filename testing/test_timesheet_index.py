@@ -0,0 +1,79 @@
+"""
+# @ Description: TimesheetIndex range queries checked against a scan of every block
+"""
+
+import datetime
+import random
+
+import pytest
+
+import workTime
+from helper_functions import week_start
+from test_aggregate import make_work
+from timesheet_index import TimesheetIndex
+
+FIRST_DAY = datetime.date(2025, 2, 22)  # a Saturday
+
+
+def random_work_list(seed: int) -> list[workTime.WorkTime]:
+    rng = random.Random(seed)
+    work_list: list[workTime.WorkTime] = []
+    for job in range(6):
+        days = {
+            FIRST_DAY + datetime.timedelta(days=offset): [(8 * 3600, 8 * 3600 + rng.randrange(900, 36000, 60))]
+            for offset in rng.sample(range(40), k=rng.randrange(0, 15))
+        }
+        # blocks out of date order, like an export edited by hand
+        shuffled = dict(rng.sample(list(days.items()), k=len(days)))
+        work_list.append(make_work(name=f"10.010.{job:04d} Job {job}", days=shuffled))
+    return work_list
+
+
+def ranges(seed: int) -> list[tuple[datetime.date, datetime.date]]:
+    rng = random.Random(seed)
+    pairs = [(FIRST_DAY + datetime.timedelta(days=a), FIRST_DAY + datetime.timedelta(days=b))
+             for a, b in (sorted(rng.sample(range(-5, 45), k=2)) for _ in range(30))]
+    return pairs + [(datetime.date.min, datetime.date.max), (FIRST_DAY, FIRST_DAY)]
+
+
+def scan(work_list, start, end) -> list[tuple[int, workTime.WorkBlock]]:
+    return [
+        (job, block) for job, work in enumerate(work_list) for block in work.work_blocks if start <= block.day <= end
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_range_queries_match_a_scan(seed: int) -> None:
+    work_list = random_work_list(seed=seed)
+    index = TimesheetIndex(work_list=work_list)
+    every_day = [block.day for work in work_list for block in work.work_blocks]
+
+    assert index.first_day() == min(every_day, default=None)
+    assert index.last_day() == max(every_day, default=None)
+    for start, end in ranges(seed=seed):
+        blocks = scan(work_list=work_list, start=start, end=end)
+
+        assert index.jobs_active(start=start, end=end) == sorted({job for job, _ in blocks})
+        expected_seconds: dict[datetime.date, int] = {}
+        for _, block in sorted(blocks, key=lambda item: item[1].day):
+            expected_seconds[block.day] = expected_seconds.get(block.day, 0) + block.final_line.seconds
+        assert index.seconds_per_day(start=start, end=end) == expected_seconds
+        assert sorted(map(id, (block for _, block in index.blocks_between(start=start, end=end)))) == sorted(
+            map(id, (block for _, block in blocks))
+        )
+        # every week overlapping the range that holds a block, also one before start
+        whole_weeks = scan(work_list=work_list, start=week_start(day=max(start, FIRST_DAY)), end=end)
+        assert index.weeks(start=start, end=end) == sorted({week_start(day=block.day) for _, block in whole_weeks})
+        for job in range(len(work_list)):
+            assert {id(block) for block in index.job_blocks_between(job=job, start=start, end=end)} == {
+                id(block) for owner, block in blocks if owner == job
+            }
+
+
+def test_empty_index() -> None:
+    index = TimesheetIndex(work_list=[make_work(name="10.010.0023 Overhead", days={})])
+
+    assert (index.first_day(), index.last_day()) == (None, None)
+    assert index.jobs_active(start=datetime.date.min, end=datetime.date.max) == []
+    assert index.seconds_per_day(start=datetime.date.min, end=datetime.date.max) == {}
+    assert index.weeks(start=datetime.date.min, end=datetime.date.max) == []
@@ -0,0 +1,89 @@
+"""
+# @ Description: FolderWatcher refreshes, malformed exports and the moving report window
+"""
+
+import datetime
+import os
+import shutil
+
+import pytest
+
+import export
+import helper_functions
+from watch import FolderWatcher
+
+GOLDEN_FOLDER = os.path.join(os.path.dirname(__file__), "golden")
+EXPORTS: tuple[str, ...] = ("phase_sheet.md", "time_table.md", "dyn_time_table.md")
+MALFORMED: str = (
+    '"10.010.0099 Broken Export Job  total amount: $0.00  total time: 01:00:00"\n\n'
+    '"","","Mar 3, 2025"\n'
+    '"Start","End","Time","Amount","Note"\n'
+    '"8:00:00 XM","9:00:00 AM","01:00:00","$0.00",""\n'
+    '"Total:     01:00:00               $0.00"\n'
+)
+
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch) -> tuple[str, str]:
+    to_process: str = str(tmp_path / "to_process")
+    shutil.copytree(os.path.join(GOLDEN_FOLDER, "to_process"), to_process)
+    (tmp_path / "export").mkdir()
+    monkeypatch.setattr(export, "EXPORT_FOLDER", str(tmp_path / "export"))
+    monkeypatch.setattr(helper_functions, "AS_OF", None)
+    return to_process, str(tmp_path / "export")
+
+
+def read_exports(export_folder: str) -> dict[str, str]:
+    exports: dict[str, str] = {}
+    for name in EXPORTS:
+        with open(file=os.path.join(export_folder, name), mode="r", encoding="utf-8") as f:
+            exports[name] = f.read()
+    return exports
+
+
+def refresh(watcher: FolderWatcher) -> list[str]:
+    changed: list[str] = watcher.poll()
+    if watcher.refresh_as_of() or changed:
+        watcher.render()
+    return changed
+
+
+def test_matches_the_batch_run(folders) -> None:
+    to_process, export_folder = folders
+    refresh(watcher=FolderWatcher(folder_path=to_process))
+
+    assert read_exports(export_folder=export_folder) == read_exports(export_folder=os.path.join(GOLDEN_FOLDER, "export"))
+
+
+def test_malformed_export_is_skipped_and_the_others_update(folders, capsys) -> None:
+    to_process, export_folder = folders
+    watcher = FolderWatcher(folder_path=to_process)
+    refresh(watcher=watcher)
+    with open(file=os.path.join(to_process, "broken.csv"), mode="w", encoding="utf-8") as f:
+        f.write(MALFORMED)
+    os.remove(os.path.join(to_process, "job_0004.csv"))
+
+    assert len(refresh(watcher=watcher)) == 2
+    assert "skipped broken.csv" in capsys.readouterr().out
+    phase_sheet: str = read_exports(export_folder=export_folder)["phase_sheet.md"]
+    assert "Broken" not in phase_sheet
+    assert len(watcher.work_times) == 4
+    # not parsed again until it changes
+    assert refresh(watcher=watcher) == []
+    assert "skipped" not in capsys.readouterr().out
+
+
+def test_report_window_moves_with_the_as_of_date(folders, monkeypatch) -> None:
+    to_process, export_folder = folders
+    monkeypatch.setattr(helper_functions, "DAYS_AGO", True)
+    watcher = FolderWatcher(folder_path=to_process, as_of=datetime.date(2025, 3, 7))
+    refresh(watcher=watcher)
+    first_week: dict[str, str] = read_exports(export_folder=export_folder)
+
+    watcher.as_of = datetime.date(2025, 3, 14)
+    assert refresh(watcher=watcher) == []
+    moved: dict[str, str] = read_exports(export_folder=export_folder)
+    refresh(watcher=FolderWatcher(folder_path=to_process, as_of=datetime.date(2025, 3, 14)))
+
+    assert moved != first_week
+    assert moved == read_exports(export_folder=export_folder)
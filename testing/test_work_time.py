@@ -0,0 +1,47 @@
+"""
+# @ Description: The datetime / Decimal properties of the workTime lines read and write the integer slots
+"""
+
+import datetime
+import decimal
+
+import pytest
+
+import workTime
+
+
+def test_clock_line_properties_write_the_slots() -> None:
+    line = workTime.ClockLine()
+
+    line.start_time = datetime.time(8, 0)
+    line.end_time = datetime.time(12, 45, 30)
+    line.total_time = datetime.timedelta(hours=4, minutes=45, seconds=30)
+    line.money = decimal.Decimal("197.38")
+
+    assert (line.start, line.end, line.seconds, line.cents) == (8 * 3600, 12 * 3600 + 45 * 60 + 30, 17130, 19738)
+    assert (line.start_time, line.end_time) == (datetime.time(8, 0), datetime.time(12, 45, 30))
+    assert line.money == decimal.Decimal("197.38")
+
+
+def test_final_line_properties_write_the_slots() -> None:
+    line = workTime.FinalLine()
+
+    line.total_time = datetime.timedelta(minutes=45)
+    line.total_money = decimal.Decimal("31.13")
+
+    assert (line.seconds, line.cents) == (2700, 3113)
+    with pytest.raises(ValueError):
+        line.total_money = decimal.Decimal("0.005")
+
+
+def test_frozen_lines_reject_property_writes() -> None:
+    work = workTime.WorkTime()
+    block = workTime.WorkBlock()
+    block.clock_times.append(workTime.ClockLine())
+    work.work_blocks.append(block)
+    (frozen,) = workTime.freeze(work_list=[work])
+
+    with pytest.raises(workTime.FrozenError):
+        frozen.work_blocks[0].clock_times[0].start_time = datetime.time(8, 0)
+    with pytest.raises(workTime.FrozenError):
+        frozen.work_blocks[0].final_line.total_money = decimal.Decimal("1.00")
@@ -0,0 +1,165 @@
+"""
+# @ Description: Date index over the parsed blocks, range queries by bisect instead of scanning every block
+"""
+
+import bisect
+import datetime
+from typing import Sequence
+
+import workTime
+from helper_functions import week_start
+
+
+class TimesheetIndex:
+    """
+    Every block of a run sorted by date, overall and per job, built once after ingestion.
+
+    Range queries bisect the sorted dates and only touch the k blocks (or days)
+    they return, O(log n + k). Jobs are numbered by their position in the
+    work_list the index was built from.
+    """
+    __slots__ = ("names", "days", "jobs", "blocks", "job_days", "job_blocks", "dates", "date_seconds")
+
+    def __init__(self, work_list: Sequence[workTime.WorkTime]) -> None:
+        self.names: list[str] = [work.name for work in work_list]
+
+        # one sort of (day, job, position) keeps the file order of blocks on the same day and job
+        order: list[tuple[datetime.date, int, int]] = sorted(
+            (block.day, job, position)
+            for job, work in enumerate(work_list)
+            for position, block in enumerate(work.work_blocks)
+        )
+        self.days: list[datetime.date] = [day for day, _, _ in order]
+        self.jobs: list[int] = [job for _, job, _ in order]
+        self.blocks: list[workTime.WorkBlock] = [work_list[job].work_blocks[position] for _, job, position in order]
+
+        self.job_days: list[list[datetime.date]] = [[] for _ in work_list]
+        self.job_blocks: list[list[workTime.WorkBlock]] = [[] for _ in work_list]
+        # distinct dates and the worked seconds of each, all jobs together
+        self.dates: list[datetime.date] = []
+        self.date_seconds: list[int] = []
+        for day, job, block in zip(self.days, self.jobs, self.blocks):
+            self.job_days[job].append(day)
+            self.job_blocks[job].append(block)
+            if not self.dates or self.dates[-1] != day:
+                self.dates.append(day)
+                self.date_seconds.append(0)
+            self.date_seconds[-1] += block.final_line.seconds
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def _span(self, days: list[datetime.date], start: datetime.date, end: datetime.date) -> slice:
+        return slice(bisect.bisect_left(days, start), bisect.bisect_right(days, end))
+
+    def first_day(self) -> datetime.date | None:
+        return self.days[0] if self.days else None
+
+    def last_day(self) -> datetime.date | None:
+        return self.days[-1] if self.days else None
+
+    def blocks_between(self, start: datetime.date, end: datetime.date) -> list[tuple[int, workTime.WorkBlock]]:
+        """
+        Blocks dated start to end, both included.
+
+        Args:
+            start (datetime.date): First day.
+            end (datetime.date): Last day.
+
+        Returns:
+            list[tuple[int, workTime.WorkBlock]]: (job, block) in date order.
+        """
+        span: slice = self._span(days=self.days, start=start, end=end)
+        return list(zip(self.jobs[span], self.blocks[span]))
+
+    def week(self, day: datetime.date) -> list[tuple[int, workTime.WorkBlock]]:
+        """
+        Blocks of the Saturday to Friday pay week holding day.
+
+        Args:
+            day (datetime.date): Any date of the week.
+
+        Returns:
+            list[tuple[int, workTime.WorkBlock]]: (job, block) in date order.
+        """
+        first: datetime.date = week_start(day=day)
+        return self.blocks_between(start=first, end=first + datetime.timedelta(days=6))
+
+    def weeks(self, start: datetime.date, end: datetime.date) -> list[datetime.date]:
+        """
+        Pay weeks overlapping start to end that hold blocks, one bisect per week.
+
+        Args:
+            start (datetime.date): First day.
+            end (datetime.date): Last day.
+
+        Returns:
+            list[datetime.date]: Week starts (Saturday), in date order.
+        """
+        first: datetime.date | None = self.first_day()
+        if first is None:
+            return []
+        # the week holding start may have blocks before start
+        position: int = bisect.bisect_left(self.days, week_start(day=max(start, first)))
+        stop: int = bisect.bisect_right(self.days, end)
+        weeks: list[datetime.date] = []
+        while position < stop:
+            week: datetime.date = week_start(day=self.days[position])
+            weeks.append(week)
+            position = bisect.bisect_left(self.days, week + datetime.timedelta(days=7), lo=position)
+        return weeks
+
+    def job_blocks_between(self, job: int, start: datetime.date, end: datetime.date) -> list[workTime.WorkBlock]:
+        span: slice = self._span(days=self.job_days[job], start=start, end=end)
+        return self.job_blocks[job][span]
+
+    def jobs_active(self, start: datetime.date, end: datetime.date) -> list[int]:
+        """
+        Jobs with at least one block between start and end.
+
+        Args:
+            start (datetime.date): First day.
+            end (datetime.date): Last day.
+
+        Returns:
+            list[int]: Job numbers, in order.
+        """
+        span: slice = self._span(days=self.days, start=start, end=end)
+        return sorted(set(self.jobs[span]))
+
+    def seconds_per_day(self, start: datetime.date, end: datetime.date) -> dict[datetime.date, int]:
+        """
+        Worked seconds of every date with blocks between start and end, all jobs together.
+
+        Args:
+            start (datetime.date): First day.
+            end (datetime.date): Last day.
+
+        Returns:
+            dict[datetime.date, int]: Date -> seconds from the "Total:" lines, in date order.
+        """
+        span: slice = self._span(days=self.dates, start=start, end=end)
+        return dict(zip(self.dates[span], self.date_seconds[span]))
+
+    def work_times(self, start: datetime.date, end: datetime.date) -> list[workTime.WorkTime]:
+        """
+        The jobs cut down to the blocks between start and end, for the renderers.
+
+        Jobs without blocks in the range are kept with no blocks, so job order
+        and phase sheet rows stay the same as for the whole run. The blocks
+        are shared with the indexed WorkTimes, not copied.
+
+        Args:
+            start (datetime.date): First day.
+            end (datetime.date): Last day.
+
+        Returns:
+            list[workTime.WorkTime]: One WorkTime per indexed job.
+        """
+        work_list: list[workTime.WorkTime] = []
+        for job, name in enumerate(self.names):
+            work: workTime.WorkTime = workTime.WorkTime()
+            work.name = name
+            work.work_blocks = self.job_blocks_between(job=job, start=start, end=end)
+            work_list.append(work)
+        return work_list
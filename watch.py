@@ -0,0 +1,167 @@
+"""
+# @ Description: Watches the to_process folder and re-renders the exports when an export csv changes
+"""
+
+import datetime
+import os
+import time
+from collections import defaultdict
+
+import export
+import helper_functions
+import phase_code_process
+import workTime
+from aggregate import export_day_seconds, merge_lines
+from helper_functions import in_report_window, process_csv_file
+from ingest import TO_PROCESS_FOLDER
+from intervals import DayTimeline, add_block
+from phase_code_process import process_work_times, render_phase_sheet
+from table_process import render_time_tables
+
+
+class FolderWatcher:
+    """
+    Keeps the parsed jobs, their worked seconds and punch intervals per date in memory, keyed by csv path.
+
+    Each poll only stats the folder; files are re-parsed and re-aggregated
+    only when their size or mtime changed, and only the time table dates they
+    touch are rebuilt. The report window is applied at render time, so it
+    moves with the date while the watcher runs. export.write_export skips
+    exports whose markdown came out the same, unless the file was deleted or
+    edited on disk since.
+    """
+
+    def __init__(
+        self, folder_path: str = TO_PROCESS_FOLDER, paginate: bool = False, as_of: datetime.date | None = None
+    ) -> None:
+        self.folder_path: str = folder_path
+        self.paginate: bool = paginate
+        self.as_of: datetime.date | None = as_of  # None follows today
+        self.signatures: dict[str, tuple[int, int]] = {}  # path -> (size, mtime_ns)
+        self.work_times: dict[str, workTime.WorkTime] = {}
+        self.day_seconds: dict[str, dict[datetime.date, int]] = {}
+        self.day_intervals: dict[str, dict[datetime.date, list[tuple[int, int]]]] = {}
+        self.timelines: dict[datetime.date, DayTimeline] = {}
+        self.dirty_days: set[datetime.date] = set()
+        self.rendered_as_of: datetime.date | None = None
+
+    def scan(self) -> dict[str, tuple[int, int]]:
+        signatures: dict[str, tuple[int, int]] = {}
+        with os.scandir(self.folder_path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".csv") and entry.is_file():
+                    stat: os.stat_result = entry.stat()
+                    signatures[os.path.abspath(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+        return signatures
+
+    def forget(self, path: str) -> None:
+        self.dirty_days.update(self.day_intervals.pop(path, {}))
+        self.work_times.pop(path, None)
+        self.day_seconds.pop(path, None)
+
+    def poll(self) -> list[str]:
+        """
+        Re-parse the csv files that were added or changed and forget the removed ones.
+
+        A file that fails to parse is reported and left out until it changes
+        again, the other files are still updated.
+
+        Returns:
+            list[str]: Paths that were added, changed or removed since the last poll.
+        """
+        signatures: dict[str, tuple[int, int]] = self.scan()
+        changed: list[str] = [path for path, sig in signatures.items() if self.signatures.get(path) != sig]
+        removed: list[str] = [path for path in self.signatures if path not in signatures]
+        for path in changed:
+            self.forget(path=path)
+            try:
+                work: workTime.WorkTime = process_csv_file(path)
+            except Exception as e:  # a half written or malformed export should not stop the others
+                print(f"skipped {os.path.basename(path)}: {e!r}")
+                continue
+            intervals: defaultdict[datetime.date, list[tuple[int, int]]] = defaultdict(list)
+            for block in work.work_blocks:
+                add_block(days=intervals, block=block)
+            self.work_times[path] = work
+            self.day_seconds[path] = export_day_seconds(work=work)
+            self.day_intervals[path] = dict(intervals)
+            self.dirty_days.update(intervals)
+        for path in removed:
+            self.forget(path=path)
+        self.signatures = signatures
+        return sorted(changed + removed)
+
+    def refresh_as_of(self) -> bool:
+        """
+        Move the report window to today, unless the watcher was given a fixed as-of date.
+
+        Returns:
+            bool: True when the as-of date differs from the one of the last render.
+        """
+        helper_functions.set_as_of(day=self.as_of or datetime.date.today())
+        return helper_functions.as_of() != self.rendered_as_of
+
+    def time_table_days(self) -> dict[datetime.date, DayTimeline]:
+        # only the dates touched since the last render are merged and sorted again
+        for day in self.dirty_days:
+            intervals: list[tuple[int, int]] = [
+                interval for days in self.day_intervals.values() for interval in days.get(day, ())
+            ]
+            if intervals:
+                self.timelines[day] = DayTimeline(intervals=intervals)
+            else:
+                self.timelines.pop(day, None)
+        self.dirty_days.clear()
+        return {day: self.timelines[day] for day in sorted(self.timelines) if in_report_window(day=day)}
+
+    def render(self) -> list[str]:
+        """
+        Re-render the exports from the in-memory state.
+
+        Returns:
+            list[str]: File names of the exports that actually changed on disk.
+        """
+        paths: list[str] = sorted(self.work_times)
+        export.clear_changed()
+        if phase_code_process.OVERTIME_RULE == "combined":
+            # the split depends on every job's punches of a date, nothing per file to reuse
+            process_work_times([self.work_times[path] for path in paths], self.paginate)
+        else:
+            # exports sharing a phase code are merged into one row at render time
+            lines = merge_lines(
+                names=[self.work_times[path].name for path in paths],
+                day_seconds=[
+                    {day: seconds for day, seconds in self.day_seconds[path].items() if in_report_window(day=day)}
+                    for path in paths
+                ],
+            )
+            render_phase_sheet(lines=lines, paginate=self.paginate)
+        render_time_tables(days=self.time_table_days())
+        self.rendered_as_of = helper_functions.as_of()
+        return export.clear_changed()
+
+    def run(self, interval: float = 1.0) -> None:
+        """
+        Poll forever, stop with Ctrl+C.
+
+        Args:
+            interval (float, optional): Seconds between polls. Defaults to 1.0.
+        """
+        print(f"watching {self.folder_path}, Ctrl+C to stop")
+        try:
+            while True:
+                start: float = time.perf_counter()
+                try:
+                    changed: list[str] = self.poll()
+                    moved: bool = self.refresh_as_of()
+                    if changed or moved:
+                        written: list[str] = self.render()
+                        took: float = (time.perf_counter() - start) * 1000
+                        names: str = ", ".join(os.path.basename(path) for path in changed)
+                        names = names or f"as of {helper_functions.as_of()}"
+                        print(f"{names} -> updated {', '.join(written) or 'nothing'} in {took:.0f} ms")
+                except Exception as e:  # a half written export should not stop the watcher
+                    print(f"refresh failed: {e!r}")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
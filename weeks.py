@@ -0,0 +1,91 @@
+"""
+# @ Description: Splits the parsed jobs into Saturday to Friday pay weeks and renders every week
+"""
+
+import datetime
+from typing import Sequence
+
+import workTime
+from phase_code_process import process_work_times
+from run_settings import process_pool
+from table_process import proc_table
+from timesheet_index import TimesheetIndex
+
+
+def split_by_week(
+    work_list: Sequence[workTime.WorkTime],
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+) -> dict[datetime.date, list[workTime.WorkTime]]:
+    """
+    Group the blocks of every job by pay week, reading each week off a TimesheetIndex.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs, only read.
+        since (datetime.date, optional): Skip weeks ending before this day. Defaults to no limit.
+        until (datetime.date, optional): Skip weeks starting after this day. Defaults to no limit.
+
+    Returns:
+        dict[datetime.date, list[workTime.WorkTime]]: Week start (Saturday) -> one WorkTime per job
+            with blocks in that week, sharing the original block objects. Weeks are in date order,
+            jobs keep the order of work_list and their blocks are in date order.
+    """
+    index: TimesheetIndex = TimesheetIndex(work_list=work_list)
+    weeks: dict[datetime.date, list[workTime.WorkTime]] = {}
+    for week in index.weeks(start=since, end=until):
+        jobs: dict[int, workTime.WorkTime] = {}
+        for job, block in index.week(day=week):
+            week_work: workTime.WorkTime | None = jobs.get(job)
+            if week_work is None:
+                week_work = workTime.WorkTime()
+                week_work.name = index.names[job]
+                jobs[job] = week_work
+            week_work.work_blocks.append(block)
+        weeks[week] = [jobs[job] for job in sorted(jobs)]
+    return weeks
+
+
+def render_week(week: datetime.date, work_list: list[workTime.WorkTime], paginate: bool = False) -> datetime.date:
+    """
+    Render the phase sheet and time tables of one week into files suffixed with the week start.
+
+    Args:
+        week (datetime.date): Saturday starting the week.
+        work_list (list[workTime.WorkTime]): The jobs of that week.
+        paginate (bool, optional): See process_work_times. Defaults to False.
+
+    Returns:
+        datetime.date: The week, for reporting.
+    """
+    export_suffix: str = f"_{week.isoformat()}"
+    process_work_times(work_list, paginate, export_suffix)
+    proc_table(work_list, export_suffix)
+    return week
+
+
+def render_weeks(
+    work_list: Sequence[workTime.WorkTime],
+    since: datetime.date = datetime.date.min,
+    until: datetime.date = datetime.date.max,
+    workers: int = 0,
+    paginate: bool = False,
+) -> list[datetime.date]:
+    """
+    Backfill every pay week of the parsed jobs, one process per week.
+
+    Args:
+        work_list (Sequence[workTime.WorkTime]): The parsed jobs.
+        since (datetime.date, optional): Skip weeks ending before this day. Defaults to no limit.
+        until (datetime.date, optional): Skip weeks starting after this day. Defaults to no limit.
+        workers (int, optional): Worker processes, 0 uses one per cpu, 1 renders in this process. Defaults to 0.
+        paginate (bool, optional): See process_work_times. Defaults to False.
+
+    Returns:
+        list[datetime.date]: The rendered weeks.
+    """
+    weeks: dict[datetime.date, list[workTime.WorkTime]] = split_by_week(work_list=work_list, since=since, until=until)
+    if workers == 1 or len(weeks) <= 1:
+        return [render_week(week, jobs, paginate) for week, jobs in weeks.items()]
+
+    with process_pool(max_workers=workers or None) as executor:
+        return list(executor.map(render_week, weeks, weeks.values(), [paginate] * len(weeks)))
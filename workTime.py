@@ -8,6 +8,7 @@
 
 import datetime
 import decimal
+from typing import Any, Iterable
 
 # csv data example:                                                                         | Class relation:                       |
 # ----------------------------------------------------------------------------------------- | ------------------------------------- |
@@ -27,11 +28,65 @@ import decimal
 # ...                                                                                       | ...
 
 
+# Times are kept as integer seconds and amounts as integer cents, the datetime /
+# Decimal attributes (start_time, total_time, money, ...) are built on access only
+# and converted back into the integer slots when assigned.
+
+
+def time_to_seconds(time: datetime.time) -> int:
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+def seconds_to_time(seconds: int) -> datetime.time:
+    return datetime.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def money_to_cents(money: decimal.Decimal) -> int:
+    """
+    Convert an amount to integer cents.
+
+    Args:
+        money (decimal.Decimal): The amount, e.g. Decimal("249.00").
+
+    Raises:
+        ValueError: When the amount has fractions of a cent.
+
+    Returns:
+        int: The amount in cents, e.g. 24900.
+    """
+    cents: decimal.Decimal = money.scaleb(2)
+    if cents != cents.to_integral_value():
+        raise ValueError(f"{money} can not be stored in whole cents")
+    return int(cents)
+
+
+def cents_to_money(cents: int) -> decimal.Decimal:
+    return decimal.Decimal(value=cents).scaleb(-2)
+
+
 class FinalLine:
+    __slots__ = ("line", "seconds", "cents")
+
     def __init__(self) -> None:
         self.line: str = str()
-        self.total_time: datetime.timedelta = datetime.timedelta()
-        self.total_money: decimal.Decimal = decimal.Decimal(0)
+        self.seconds: int = 0
+        self.cents: int = 0
+
+    @property
+    def total_time(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.seconds)
+
+    @total_time.setter
+    def total_time(self, value: datetime.timedelta) -> None:
+        self.seconds = int(value.total_seconds())
+
+    @property
+    def total_money(self) -> decimal.Decimal:
+        return cents_to_money(cents=self.cents)
+
+    @total_money.setter
+    def total_money(self, value: decimal.Decimal) -> None:
+        self.cents = money_to_cents(money=value)
 
     def __str__(self) -> str:
         return str(self.line)
@@ -41,13 +96,47 @@ class FinalLine:
 
 
 class ClockLine:
+    __slots__ = ("start", "end", "seconds", "cents", "comment")
+
     def __init__(self) -> None:
-        self.start_time: datetime.time = datetime.time()
-        self.end_time: datetime.time = datetime.time()
-        self.total_time: datetime.timedelta = datetime.timedelta()
-        self.money: decimal.Decimal = decimal.Decimal(0)
+        self.start: int = 0  # seconds since midnight
+        self.end: int = 0  # seconds since midnight
+        self.seconds: int = 0
+        self.cents: int = 0
         self.comment: str = str()
 
+    @property
+    def start_time(self) -> datetime.time:
+        return seconds_to_time(seconds=self.start)
+
+    @start_time.setter
+    def start_time(self, value: datetime.time) -> None:
+        self.start = time_to_seconds(time=value)
+
+    @property
+    def end_time(self) -> datetime.time:
+        return seconds_to_time(seconds=self.end)
+
+    @end_time.setter
+    def end_time(self, value: datetime.time) -> None:
+        self.end = time_to_seconds(time=value)
+
+    @property
+    def total_time(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.seconds)
+
+    @total_time.setter
+    def total_time(self, value: datetime.timedelta) -> None:
+        self.seconds = int(value.total_seconds())
+
+    @property
+    def money(self) -> decimal.Decimal:
+        return cents_to_money(cents=self.cents)
+
+    @money.setter
+    def money(self, value: decimal.Decimal) -> None:
+        self.cents = money_to_cents(money=value)
+
     def __str__(self)->str:
         class_str:str = str(self.start_time) + " " + str(self.end_time) + " " + str(self.total_time)
         return class_str
@@ -57,6 +146,8 @@ class ClockLine:
 
 
 class WorkBlock:
+    __slots__ = ("day", "clock_times", "final_line")
+
     def __init__(self) -> None:
         self.day: datetime.date = datetime.date(year=2000, month=1, day=1)
         self.clock_times: list[ClockLine] = []
@@ -74,6 +165,8 @@ class WorkBlock:
 
 
 class WorkTime:
+    __slots__ = ("name", "work_blocks")
+
     def __init__(self) -> None:
         self.name: str = str()
         self.work_blocks: list[WorkBlock] = list[WorkBlock]()
@@ -85,4 +178,70 @@ class WorkTime:
         return work
 
     def __repr__(self) -> str:
-        return str(self)
\ No newline at end of file
+        return str(self)
+
+
+class FrozenError(AttributeError):
+    pass
+
+
+class _Frozen:
+    """Mixin that rejects attribute writes, see freeze()."""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenError(f"{type(self).__name__} is read-only, can not set '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenError(f"{type(self).__name__} is read-only, can not delete '{name}'")
+
+    def __setstate__(self, state: tuple[None, dict[str, Any]]) -> None:
+        # pickle/deepcopy restore __slots__ through setattr, bypass the guard
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
+
+class FrozenFinalLine(_Frozen, FinalLine):
+    __slots__ = ()
+
+
+class FrozenClockLine(_Frozen, ClockLine):
+    __slots__ = ()
+
+
+class FrozenWorkBlock(_Frozen, WorkBlock):
+    __slots__ = ()
+
+
+class FrozenWorkTime(_Frozen, WorkTime):
+    __slots__ = ()
+
+
+def freeze(work_list: Iterable[WorkTime]) -> tuple[WorkTime, ...]:
+    """
+    Turn parsed WorkTimes into a read-only view that several consumers can share without copying.
+
+    The objects are frozen in place: lists become tuples and every object is
+    switched to its Frozen* subclass, which raises FrozenError on attribute writes.
+    Nothing is copied, so this is O(number of clock lines) with no extra memory
+    for times, durations or amounts.
+
+    Args:
+        work_list (Iterable[WorkTime]): The parsed work times. They must not be modified afterwards.
+
+    Returns:
+        tuple[WorkTime, ...]: The same work times, now read-only.
+    """
+    frozen: list[WorkTime] = []
+    for work in work_list:
+        if not isinstance(work, _Frozen):
+            for block in work.work_blocks:
+                for clock in block.clock_times:
+                    clock.__class__ = FrozenClockLine
+                block.final_line.__class__ = FrozenFinalLine
+                block.clock_times = tuple(block.clock_times)  # type: ignore[assignment]
+                block.__class__ = FrozenWorkBlock
+            work.work_blocks = tuple(work.work_blocks)  # type: ignore[assignment]
+            work.__class__ = FrozenWorkTime
+        frozen.append(work)
+    return tuple(frozen)